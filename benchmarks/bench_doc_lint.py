@@ -0,0 +1,61 @@
+"""Scaling benchmark for ``econ_doc_lint``.
+
+Generates synthetic specs with a growing number of BEGIN/END blocks (each
+carrying one ``@ECON`` cross-reference) and times a full lint run. With the
+indexed cross-ref resolution the time per block stays flat as the spec grows.
+
+Usage::
+
+    python benchmarks/bench_doc_lint.py [--blocks 50000] [--steps 4]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from generators import write_spec
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+LINT_PATH = SCRIPTS / "econ_doc_lint.py"
+_spec = importlib.util.spec_from_file_location("econ_doc_lint", LINT_PATH)
+lint_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(lint_module)
+
+
+def time_lint(path: Path) -> float:
+    argv = sys.argv
+    sys.argv = ["econ_doc_lint.py", str(path)]
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            lint_module.main()
+        return time.perf_counter() - start
+    finally:
+        sys.argv = argv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark econ_doc_lint scaling")
+    parser.add_argument("--blocks", type=int, default=50_000, help="Largest spec size")
+    parser.add_argument("--steps", type=int, default=4, help="Number of halvings to time")
+    args = parser.parse_args()
+
+    sizes = [args.blocks >> i for i in reversed(range(args.steps))]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'blocks':>8} {'seconds':>9} {'us/block':>9}")
+        for size in sizes:
+            path = Path(tmp) / f"spec_{size}.md"
+            write_spec(path, size)
+            elapsed = time_lint(path)
+            print(f"{size:>8} {elapsed:>9.3f} {elapsed / size * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
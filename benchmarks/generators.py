@@ -0,0 +1,178 @@
+"""Deterministic synthetic inputs for the benchmarks.
+
+Every generator takes a size and a ``seed`` and writes the same bytes for the
+same arguments, so timings taken on different days compare like with like.
+The inputs mimic the real files: block specs in the ``BEGIN``/``END`` layout
+linted by ``block_lint.py``, a ``cross_refs.yml`` with matching heading
+documents, change request registries in either storage backend, an
+``enums.json`` registry and template datasets for ``generate_docs.py``.
+"""
+from __future__ import annotations
+
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+META = "file_seq created_at_utc checksum_sha256\n\n"
+BLOCK_TYPES = ("DEF", "REQ", "TABLE", "FLOW", "ALERT", "ARCH", "CTRL", "EXAMPLE")
+STATUSES = ("open", "in_review", "resolved")
+REVIEWERS = tuple(f"reviewer{n:02d}" for n in range(20))
+
+
+def _section(n: int) -> Tuple[int, int]:
+    """``(major, minor)`` of block ``n``; 1000 blocks per major section."""
+    return divmod(n, 1000)
+
+
+def write_spec(
+    path: Path, blocks: int, refs: int | None = None, doc: str = "ECON", seed: int = 0
+) -> None:
+    """Write a spec with ``blocks`` blocks and ``refs`` cross-references.
+
+    References point at random earlier sections of the same document; every
+    tenth one names the other prefix (``@HUEY`` in an ECON spec and vice
+    versa), which the single-document linters must skip. ``refs`` defaults to
+    one per block.
+    """
+    if blocks > 1_000_000:
+        raise ValueError("block IDs have three-digit sections; at most 1,000,000 blocks")
+    rng = random.Random(seed)
+    refs = blocks if refs is None else refs
+    other = "HUEY" if doc == "ECON" else "ECON"
+    per_block, extra = divmod(refs, blocks) if blocks else (0, 0)
+    with path.open("w", encoding="utf-8") as f:
+        f.write(META)
+        for n in range(blocks):
+            major, minor = _section(n)
+            bid = f"{doc}.{major:03d}.{minor:03d}.001.{BLOCK_TYPES[n % len(BLOCK_TYPES)]}.item_{n}"
+            f.write(f"<!-- BEGIN:{bid} -->\n")
+            f.write(f"Body of item {n}.")
+            for k in range(per_block + (n < extra)):
+                target = rng.randrange(n + 1)
+                prefix = other if k % 10 == 9 else doc
+                f.write(" see @%s.%03d.%03d" % ((prefix,) + _section(target)))
+            f.write(f"\n<!-- END:{bid} -->\n\n")
+
+
+def write_cross_refs(directory: Path, entries: int, seed: int = 0) -> Dict[str, Path]:
+    """Write ``cross_refs.yml`` with ``entries`` items plus the documents it names.
+
+    Two section keys map to one document each; about 2% of the referenced
+    sections and shared definitions are missing so the error path runs too.
+    Returns the paths of the cross-ref file, the doc map and the doc directory.
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "docs").mkdir(exist_ok=True)
+    (directory / "schemas").mkdir(exist_ok=True)
+    chapters = max(1, entries // 50)
+    headings = [(c, s) for c in range(1, chapters + 1) for s in range(1, 51)]
+    doc_map = {"huey_p_section": "docs/huey.md", "backend_section": "docs/backend.md"}
+    for doc in doc_map.values():
+        with (directory / doc).open("w", encoding="utf-8") as f:
+            f.write("# Synthetic spec\n\n")
+            for chapter, sub in headings:
+                if sub == 1:
+                    f.write(f"## §{chapter} Chapter {chapter}\n\n")
+                f.write(f"### §{chapter}.{sub} Section {chapter}.{sub}\n\nBody text.\n\n")
+    shared = [f"schemas/shared_{n:03d}.md" for n in range(100)]
+    for name in shared[:98]:
+        (directory / name).write_text(f"# {name}\n")
+    cross_refs: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for n in range(entries):
+        chapter, sub = headings[rng.randrange(len(headings))]
+        missing = rng.random() < 0.02
+        refs = {
+            "huey_p_section": f"§{chapter}.{sub}",
+            "backend_section": f"§{chapter + chapters}.{sub}" if missing else f"§{chapter}",
+            "description": f"Synthetic item {n}",
+            "shared_definition": shared[rng.randrange(len(shared))],
+        }
+        cross_refs.setdefault(f"category_{n // 100:04d}", {})[f"item_{n}"] = refs
+    paths = {
+        "cross_ref": directory / "cross_refs.yml",
+        "doc_map": directory / "doc_map.json",
+        "doc_dir": directory,
+    }
+    paths["cross_ref"].write_text(json.dumps(cross_refs, indent=2))
+    paths["doc_map"].write_text(json.dumps(doc_map, indent=2))
+    return paths
+
+
+def change_requests(records: int, seed: int = 0) -> List[Dict[str, object]]:
+    """``records`` change requests with realistic status, branch and reviewer spreads."""
+    rng = random.Random(seed)
+    branches = max(1, records // 10)
+    requests = []
+    for n in range(1, records + 1):
+        status = STATUSES[rng.randrange(len(STATUSES))]
+        requests.append(
+            {
+                "id": n,
+                "title": f"Change request {n}",
+                "description": f"Synthetic change request number {n}",
+                "branch": f"feature/{rng.randrange(branches):05d}",
+                "impact": "" if rng.random() < 0.05 else f"Touches module {rng.randrange(50)}",
+                "status": status,
+                "reviewers": rng.sample(REVIEWERS, 2) if status != "open" else [],
+            }
+        )
+    return requests
+
+
+def write_registry(path: Path, records: int, seed: int = 0) -> None:
+    """Write a registry of ``records`` requests in the backend chosen by ``path``."""
+    from change_request_store import open_store
+
+    requests = change_requests(records, seed)
+    if path.suffix == ".json":
+        # Same layout the JSON store writes, without the per-record overhead
+        path.write_text(json.dumps(requests, indent=2))
+        return
+    with open_store(path) as store:
+        store.replace_all(requests)
+
+
+def write_enums(path: Path, items: int, sections: int = 10, seed: int = 0) -> None:
+    """Write an ``enums.json`` with ``items`` entries spread over ``sections``."""
+    rng = random.Random(seed)
+    categories = ("calendar", "anticipation", "technical", "equity", "reentry")
+    data: Dict[str, List[Dict[str, object]]] = {}
+    for s in range(sections):
+        count = items // sections + (s < items % sections)
+        data[f"section_{s:02d}"] = [
+            {
+                "name": f"ENUM_{s:02d}_{n:06d}",
+                "description": f"Synthetic enum value {n} of section {s}",
+                "category": categories[rng.randrange(len(categories))],
+                "min_minutes": n * 5,
+                "max_minutes": n * 5 + 5,
+            }
+            for n in range(count)
+        ]
+    path.write_text(json.dumps(data, indent=2))
+
+
+def write_template_dataset(
+    directory: Path, documents: int, fields: int = 20, seed: int = 0
+) -> Tuple[Path, List[Path]]:
+    """Write a template with ``fields`` placeholders and one data file per document."""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    names = [f"FIELD_{k:02d}" for k in range(fields)]
+    template = directory / "template.md"
+    template.write_text(
+        "# Report $FIELD_00\n\n" + "".join(f"- {name}: ${name}\n" for name in names)
+    )
+    data_paths = []
+    for n in range(documents):
+        data = directory / f"data_{n:06d}.json"
+        data.write_text(json.dumps({name: f"{name.lower()}-{rng.randrange(10**6)}" for name in names}))
+        data_paths.append(data)
+    return template, data_paths
@@ -0,0 +1,354 @@
+"""Time the script entry points on synthetic inputs and compare to a baseline.
+
+Each case generates its input with :mod:`generators` and then runs its entry
+point in a fresh Python subprocess. Generating the input in this process keeps
+it out of the measured process, so the peak RSS a case reports is what the
+entry point needs. A case runs ``--repeat`` times on fresh input and keeps the
+fastest run.
+
+Results are compared with ``benchmarks/baseline.json``. A case that is slower
+than its baseline by more than ``--time-tolerance``, or uses more memory than
+``--rss-tolerance`` allows, is printed as a REGRESSION and the run exits with
+status 1. Differences under ``MIN_SECONDS`` are treated as timer noise.
+Timings depend on the machine, so refresh the baseline with
+``--update-baseline`` when the reference machine changes.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py [--case NAME ...] [--quick] [--repeat N]
+                                        [--baseline PATH] [--update-baseline] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import generators
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+TIME_TOLERANCE = 0.5
+RSS_TOLERANCE = 0.25
+MIN_SECONDS = 0.05
+# Registry operations timed per run of the change request cases
+ADDS = 10
+QUERIES = 12
+
+Context = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Case:
+    """One entry point: ``setup`` writes the input, ``run`` is what gets timed."""
+
+    name: str
+    unit: str
+    sizes: Tuple[int, ...]
+    setup: Callable[[Path, int], Context]
+    run: Callable[[Context], int]  # returns the number of units processed
+
+
+def _run_main(main: Callable[[], None], argv: Sequence[str]) -> None:
+    saved = sys.argv
+    sys.argv = list(argv)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            main()
+    except SystemExit as exc:
+        if exc.code not in (0, None):
+            raise RuntimeError(f"{argv[0]} exited with {exc.code}") from None
+    finally:
+        sys.argv = saved
+
+
+# -- cases --------------------------------------------------------------------
+
+
+def _setup_spec(workdir: Path, size: int) -> Context:
+    path = workdir / "spec.md"
+    generators.write_spec(path, size, refs=2 * size)
+    return {"path": str(path), "blocks": size}
+
+
+def _run_econ_doc_lint(ctx: Context) -> int:
+    import econ_doc_lint
+
+    _run_main(econ_doc_lint.main, ["econ_doc_lint.py", ctx["path"]])
+    return ctx["blocks"]
+
+
+def _setup_cross_refs(workdir: Path, size: int) -> Context:
+    paths = generators.write_cross_refs(workdir, size)
+    return {key: str(path) for key, path in paths.items()} | {"entries": size}
+
+
+def _run_cross_refs(ctx: Context) -> int:
+    from validate_cross_refs import CrossReferenceValidator, load_doc_map
+
+    validator = CrossReferenceValidator(
+        ctx["cross_ref"], ctx["doc_dir"], load_doc_map(ctx["doc_map"])
+    )
+    validator.validate_references()
+    return ctx["entries"]
+
+
+def _setup_registry(suffix: str) -> Callable[[Path, int], Context]:
+    def setup(workdir: Path, size: int) -> Context:
+        path = workdir / f"change_requests{suffix}"
+        generators.write_registry(path, size)
+        return {"db": str(path)}
+
+    return setup
+
+
+def _run_add_request(ctx: Context) -> int:
+    from change_request_manager import add_request
+
+    db = Path(ctx["db"])
+    for n in range(ADDS):
+        add_request(f"Benchmark request {n}", "added by the benchmark", f"bench/{n}", db)
+    return ADDS
+
+
+def _run_list_requests(ctx: Context) -> int:
+    from change_request_manager import list_requests
+
+    db = Path(ctx["db"])
+    for n in range(QUERIES):
+        if n % 3 == 0:
+            list_requests(status=generators.STATUSES[n % 2], db_path=db)
+        elif n % 3 == 1:
+            list_requests(db_path=db, branch=f"feature/{n:05d}")
+        else:
+            reviewer = generators.REVIEWERS[n % len(generators.REVIEWERS)]
+            list_requests(db_path=db, reviewer=reviewer)
+    return QUERIES
+
+
+def _setup_templates(workdir: Path, size: int) -> Context:
+    template, data = generators.write_template_dataset(workdir, size)
+    return {
+        "template": str(template),
+        "data": [str(p) for p in data],
+        "out": str(workdir / "out"),
+    }
+
+
+def _run_render_template(ctx: Context) -> int:
+    from generate_docs import render_template
+
+    out = Path(ctx["out"])
+    out.mkdir()
+    template = Path(ctx["template"])
+    for data in ctx["data"]:
+        render_template(template, Path(data), out / f"{Path(data).stem}.md")
+    return len(ctx["data"])
+
+
+def _setup_enums(workdir: Path, size: int) -> Context:
+    schema = workdir / "enums.json"
+    generators.write_enums(schema, size)
+    return {"schema": str(schema), "output": str(workdir / "enums.md"), "items": size}
+
+
+def _run_generate_enum_docs(ctx: Context) -> int:
+    from generate_enum_docs import generate
+
+    generate(Path(ctx["schema"]), Path(ctx["output"]))
+    return ctx["items"]
+
+
+REGISTRY_SIZES = (10_000, 100_000)
+CASES: Dict[str, Case] = {
+    case.name: case
+    for case in (
+        Case("econ_doc_lint", "blocks", (10_000, 100_000), _setup_spec, _run_econ_doc_lint),
+        Case("cross_refs", "entries", (1_000, 10_000), _setup_cross_refs, _run_cross_refs),
+        Case("add_request.json", "adds", REGISTRY_SIZES, _setup_registry(".json"), _run_add_request),
+        Case("add_request.sqlite", "adds", REGISTRY_SIZES, _setup_registry(".db"), _run_add_request),
+        Case(
+            "list_requests.json", "queries", REGISTRY_SIZES, _setup_registry(".json"),
+            _run_list_requests,
+        ),
+        Case(
+            "list_requests.sqlite", "queries", REGISTRY_SIZES, _setup_registry(".db"),
+            _run_list_requests,
+        ),
+        Case("render_template", "documents", (100, 1_000), _setup_templates, _run_render_template),
+        Case("generate_enum_docs", "items", (10_000, 100_000), _setup_enums, _run_generate_enum_docs),
+    )
+}
+
+
+# -- measurement ----------------------------------------------------------------
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss survives exec on Linux, so it would include the parent's peak
+    # at fork time; VmHWM belongs to this process image only.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_child(name: str, context_file: Path) -> Dict[str, Any]:
+    """Time one case in this process (the ``--child`` side of :func:`measure`)."""
+    ctx = json.loads(context_file.read_text())
+    start = time.perf_counter()
+    units = CASES[name].run(ctx)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "units": units, "peak_rss_kb": _peak_rss_kb()}
+
+
+def measure(case: Case, size: int, repeat: int = 1) -> Dict[str, Any]:
+    """Best of ``repeat`` subprocess runs of ``case`` on input of ``size``."""
+    best: Dict[str, Any] | None = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+            workdir = Path(tmp)
+            context_file = workdir / "context.json"
+            context_file.write_text(json.dumps(case.setup(workdir, size)))
+            proc = subprocess.run(
+                [sys.executable, __file__, "--child", case.name, str(context_file)],
+                capture_output=True,
+                text=True,
+            )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{case.name} [{size}] failed:\n{proc.stderr}")
+        result = json.loads(proc.stdout.splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    assert best is not None
+    best["throughput"] = best["units"] / best["seconds"] if best["seconds"] else float("inf")
+    return best
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, Any]]],
+    baseline: Dict[str, Dict[str, Dict[str, Any]]],
+    time_tolerance: float = TIME_TOLERANCE,
+    rss_tolerance: float = RSS_TOLERANCE,
+) -> List[str]:
+    """Regression messages for every result that exceeds its baseline."""
+    regressions = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            limit = base["seconds"] * (1 + time_tolerance)
+            if result["seconds"] > limit and result["seconds"] - base["seconds"] > MIN_SECONDS:
+                regressions.append(
+                    f"{name} [{size}]: {result['seconds']:.3f}s vs baseline "
+                    f"{base['seconds']:.3f}s (+{result['seconds'] / base['seconds'] - 1:.0%})"
+                )
+            rss_limit = base["peak_rss_kb"] * (1 + rss_tolerance)
+            if result["peak_rss_kb"] > rss_limit:
+                regressions.append(
+                    f"{name} [{size}]: peak RSS {result['peak_rss_kb'] / 1024:.1f} MiB vs baseline "
+                    f"{base['peak_rss_kb'] / 1024:.1f} MiB "
+                    f"(+{result['peak_rss_kb'] / base['peak_rss_kb'] - 1:.0%})"
+                )
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"cases": {}}
+    return json.loads(path.read_text())
+
+
+def format_row(
+    name: str, unit: str, size: int, result: Dict[str, Any], base: Dict[str, Any] | None
+) -> str:
+    delta = f"{result['seconds'] / base['seconds'] - 1:+.0%}" if base else "new"
+    return (
+        f"{name:<22} {size:>8} {result['seconds']:>9.3f} "
+        f"{result['throughput']:>12,.0f} {unit + '/s':<12} "
+        f"{result['peak_rss_kb'] / 1024:>8.1f} {delta:>8}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the spec tooling")
+    parser.add_argument(
+        "--case", action="append", choices=sorted(CASES), help="Only run NAME (repeatable)"
+    )
+    parser.add_argument("--quick", action="store_true", help="Only the smallest size of each case")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest counts")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store these results as the baseline"
+    )
+    parser.add_argument(
+        "--time-tolerance", type=float, default=TIME_TOLERANCE, help="Allowed slowdown (0.5 = 50%%)"
+    )
+    parser.add_argument(
+        "--rss-tolerance", type=float, default=RSS_TOLERANCE, help="Allowed peak RSS growth"
+    )
+    parser.add_argument("--json", action="store_true", help="Emit the results as JSON")
+    parser.add_argument("--child", nargs=2, metavar=("CASE", "CONTEXT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child[0], Path(args.child[1]))))
+        return
+
+    baseline = load_baseline(args.baseline)
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    if not args.json:
+        print(
+            f"{'case':<22} {'size':>8} {'seconds':>9} {'throughput':>12} {'':<12} "
+            f"{'RSS MiB':>8} {'vs base':>8}"
+        )
+    for name in args.case or CASES:
+        case = CASES[name]
+        for size in case.sizes[:1] if args.quick else case.sizes:
+            result = measure(case, size, args.repeat)
+            results.setdefault(name, {})[str(size)] = result
+            if not args.json:
+                base = baseline["cases"].get(name, {}).get(str(size))
+                print(format_row(name, case.unit, size, result, base), flush=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.update_baseline:
+        for name, sizes in results.items():
+            baseline["cases"].setdefault(name, {}).update(
+                {
+                    size: {"seconds": round(r["seconds"], 4), "peak_rss_kb": r["peak_rss_kb"]}
+                    for size, r in sizes.items()
+                }
+            )
+        baseline["machine"] = (
+            f"{platform.system()} {platform.machine()}, Python {platform.python_version()}"
+        )
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return
+    regressions = compare(results, baseline["cases"], args.time_tolerance, args.rss_tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
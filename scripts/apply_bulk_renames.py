@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Apply bulk rename, cross-ref fix and dependency operations to specs.
+
+Reads one or more JSON instruction files such as ``docs/econ_bulk_renames.json``
+(an ``edits`` list of ``search``/``search_regex`` + ``replace`` rules) and
+``docs/huey_bulk_operations.json`` (an ``operations`` list, currently
+``add_missing_deps``).
+
+All text rules are compiled into a single alternation regex with one named
+group per rule, so each line is scanned once however many rules there are;
+when several rules match at the same position the earlier one wins. Matches
+do not span lines and BEGIN/END marker lines are never rewritten.
+
+A rule can be limited to part of a spec with ``scope`` (a list of block-ID
+regexes, plus ``"csv-fence"`` for fenced ```` ```csv ```` examples). When only
+a free-text ``scope_hint`` is given, block-ID patterns such as
+``TABLE.*csv_artifacts`` and the phrase "CSV examples" are taken from it; a
+hint that names no recognisable scope is rejected rather than applied to the
+whole file.
+
+Usage::
+
+    python apply_bulk_renames.py CONFIG [CONFIG ...] [--index _index.yaml] [--jobs N] [--dry-run] [PATH|GLOB ...]
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+from atomic_io import atomic_write_text
+from block_lint import expand_targets, read_index
+from lint_cache import META_RE, parse_meta_values
+
+MARKER_RE = re.compile(r"^<!-- (BEGIN|END):([\w.]+) -->$")
+CSV_FENCE = "csv-fence"
+# Block-ID patterns inside a free-text scope hint, e.g. ``TABLE.*csv_artifacts``
+HINT_BLOCK_RE = re.compile(r"\b[A-Z]{2,}(?:\.\*?[\w*]+)+")
+
+
+@dataclass
+class TextRule:
+    """One search/replace edit, optionally limited to blocks or CSV fences."""
+
+    name: str
+    pattern: str
+    replace: str
+    blocks: Tuple[str, ...] = ()
+    csv_fence: bool = False
+
+    @property
+    def scoped(self) -> bool:
+        return bool(self.blocks) or self.csv_fence
+
+
+@dataclass
+class DepsRule:
+    """Ensure blocks whose ID matches ``pattern`` list ``dep`` in their DEPS."""
+
+    name: str
+    pattern: str
+    dep: str
+
+
+@dataclass
+class FileResult:
+    path: str
+    counts: Counter = field(default_factory=Counter)
+    diff: str = ""
+    error: str = ""
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.counts)
+
+
+def parse_scope(rule: Dict[str, Any]) -> Tuple[Tuple[str, ...], bool]:
+    """Return ``(block patterns, csv_fence)`` for a rule's ``scope``/``scope_hint``."""
+    if "scope" in rule:
+        scope = list(rule["scope"])
+        blocks = tuple(s for s in scope if s != CSV_FENCE)
+        return blocks, CSV_FENCE in scope
+    hint = rule.get("scope_hint")
+    if not hint:
+        return (), False
+    blocks = tuple(HINT_BLOCK_RE.findall(hint))
+    csv_fence = bool(re.search(r"\bcsv examples?\b", hint, re.IGNORECASE))
+    if not blocks and not csv_fence:
+        raise ValueError(f"cannot derive a scope from scope_hint {hint!r}; add an explicit 'scope'")
+    return blocks, csv_fence
+
+
+def load_rules(config_paths: Iterable[Path]) -> Tuple[List[TextRule], List[DepsRule]]:
+    """Read every instruction file into text rules and DEPS rules."""
+    text_rules: List[TextRule] = []
+    deps_rules: List[DepsRule] = []
+    for config_path in config_paths:
+        config = json.loads(Path(config_path).read_text())
+        for n, edit in enumerate(config.get("edits", []), 1):
+            name = f"{Path(config_path).stem}#{n} {edit.get('kind', 'edit')}"
+            if "search_regex" in edit:
+                pattern = edit["search_regex"]
+            elif "search" in edit:
+                pattern = re.escape(edit["search"])
+                if edit.get("kind") == "crossref-fix":
+                    # @ECON.007.004 must not match the start of @ECON.007.0041
+                    pattern += r"(?!\d)"
+            else:
+                raise ValueError(f"{config_path}: edit {n} has no search or search_regex")
+            re.compile(pattern)
+            blocks, csv_fence = parse_scope(edit)
+            text_rules.append(TextRule(name, pattern, edit["replace"], blocks, csv_fence))
+        for n, op in enumerate(config.get("operations", []), 1):
+            name = f"{Path(config_path).stem}#{n} {op.get('type')}"
+            if op.get("type") != "add_missing_deps":
+                raise ValueError(f"{config_path}: unsupported operation {op.get('type')!r}")
+            re.compile(op["pattern"])
+            deps_rules.append(DepsRule(name, op["pattern"], op["add_dep"]))
+    return text_rules, deps_rules
+
+
+class BulkApplier:
+    """Apply compiled rules to spec files in one pass per file."""
+
+    def __init__(self, text_rules: Sequence[TextRule], deps_rules: Sequence[DepsRule] = ()) -> None:
+        self.text_rules = list(text_rules)
+        self.deps_rules = list(deps_rules)
+        self.rule_res = [re.compile(r.pattern) for r in self.text_rules]
+        self.block_res = {p: re.compile(p) for r in self.text_rules for p in r.blocks}
+        self.deps_res = [re.compile(r.pattern) for r in self.deps_rules]
+        self.unscoped = frozenset(i for i, r in enumerate(self.text_rules) if not r.scoped)
+        # Combined regex per set of active rules; most files only need one or two.
+        self._combined: Dict[FrozenSet[int], re.Pattern | None] = {}
+
+    @classmethod
+    def from_configs(cls, config_paths: Iterable[Path]) -> "BulkApplier":
+        return cls(*load_rules(config_paths))
+
+    def combined(self, active: FrozenSet[int]) -> re.Pattern | None:
+        if active not in self._combined:
+            parts = [f"(?P<_r{i}>{self.text_rules[i].pattern})" for i in sorted(active)]
+            self._combined[active] = re.compile("|".join(parts)) if parts else None
+        return self._combined[active]
+
+    def _active(self, open_blocks: List[str], in_csv_fence: bool) -> FrozenSet[int]:
+        active = set(self.unscoped)
+        for i, rule in enumerate(self.text_rules):
+            if not rule.scoped or i in active:
+                continue
+            if rule.csv_fence and in_csv_fence:
+                active.add(i)
+            elif any(self.block_res[p].search(bid) for p in rule.blocks for bid in open_blocks):
+                active.add(i)
+        return frozenset(active)
+
+    def _replace(self, m: re.Match, counts: Counter) -> str:
+        i = int(m.lastgroup[2:])
+        rule = self.text_rules[i]
+        counts[rule.name] += 1
+        if "\\" not in rule.replace:
+            return rule.replace
+        # Re-match with the rule's own regex so its group references resolve.
+        return self.rule_res[i].match(m.string, m.start()).expand(rule.replace)
+
+    def apply_lines(self, lines: Sequence[str]) -> Tuple[List[str], Counter]:
+        """Return the rewritten lines and the number of changes per rule."""
+        counts: Counter = Counter()
+        out: List[str] = []
+        # Innermost-last stack of (block id, index of its DEPS line in ``out``)
+        stack: List[List[Any]] = []
+        in_fence = in_csv_fence = False
+        active = self._active([], False)
+        for line in lines:
+            stripped = line.strip()
+            m = MARKER_RE.match(stripped) if stripped.startswith("<!--") else None
+            if m:
+                if m.group(1) == "BEGIN":
+                    stack.append([m.group(2), None])
+                else:
+                    if stack and stack[-1][0] == m.group(2):
+                        self._ensure_deps(stack.pop(), out, line, counts)
+                active = self._active([b for b, _ in stack], in_csv_fence)
+                out.append(line)
+                continue
+            if stripped.startswith("```"):
+                if in_fence:
+                    in_fence = in_csv_fence = False
+                else:
+                    in_fence = True
+                    in_csv_fence = stripped[3:].strip().lower() == "csv"
+                active = self._active([b for b, _ in stack], in_csv_fence)
+            elif stack and stripped.startswith("<!-- DEPS:") and META_RE.match(stripped):
+                stack[-1][1] = len(out)
+            regex = self.combined(active)
+            if regex is not None:
+                line = regex.sub(lambda mm: self._replace(mm, counts), line)
+            out.append(line)
+        return out, counts
+
+    def _ensure_deps(self, block: List[Any], out: List[str], end_line: str, counts: Counter) -> None:
+        bid, deps_at = block
+        for rule, regex in zip(self.deps_rules, self.deps_res):
+            if not regex.search(bid):
+                continue
+            if deps_at is None:
+                indent = end_line[: len(end_line) - len(end_line.lstrip())]
+                out.append(f"{indent}<!-- DEPS: {rule.dep} -->\n")
+                deps_at = block[1] = len(out) - 1
+                counts[rule.name] += 1
+                continue
+            line = out[deps_at]
+            values = parse_meta_values(META_RE.match(line.strip()).group(2))
+            if rule.dep in values:
+                continue
+            indent = line[: len(line) - len(line.lstrip())]
+            newline = "\n" if line.endswith("\n") else ""
+            out[deps_at] = f"{indent}<!-- DEPS: {', '.join(values + [rule.dep])} -->{newline}"
+            counts[rule.name] += 1
+
+    def apply_file(self, path: str, dry_run: bool = False) -> FileResult:
+        """Rewrite ``path`` atomically, or with ``dry_run`` only diff it."""
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                lines = f.readlines()
+        except (OSError, UnicodeDecodeError) as exc:
+            return FileResult(str(path), error=f"Cannot read file: {exc}")
+        new_lines, counts = self.apply_lines(lines)
+        result = FileResult(str(path), counts)
+        if new_lines == lines:
+            result.counts = Counter()
+            return result
+        if dry_run:
+            result.diff = "".join(
+                difflib.unified_diff(lines, new_lines, f"a/{path}", f"b/{path}")
+            )
+        else:
+            atomic_write_text(path, "".join(new_lines))
+        return result
+
+    def apply_paths(
+        self, paths: Sequence[str], jobs: int | None = None, dry_run: bool = False
+    ) -> List[FileResult]:
+        """Apply to ``paths`` across a process pool, returning results in input order."""
+        func = partial(self.apply_file, dry_run=dry_run)
+        if jobs == 1 or len(paths) <= 1:
+            return [func(p) for p in paths]
+        workers = min(jobs or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, paths))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply bulk renames and DEPS operations")
+    parser.add_argument("configs", nargs="+", type=Path, help="Bulk rename/operation JSON files")
+    parser.add_argument(
+        "--spec", dest="paths", action="append", default=[], help="Spec file or glob (repeatable)"
+    )
+    parser.add_argument("--index", type=Path, help="Also process every file listed in the index")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--dry-run", action="store_true", help="Print a unified diff, write nothing")
+    args = parser.parse_args()
+
+    targets = list(args.paths)
+    if args.index:
+        for files in read_index(args.index).values():
+            targets.extend(files)
+    paths = expand_targets(targets)
+    if not paths:
+        parser.error("no spec files given (use --spec or --index)")
+
+    applier = BulkApplier.from_configs(args.configs)
+    results = applier.apply_paths(paths, args.jobs, args.dry_run)
+    failed = False
+    for result in results:
+        if result.error:
+            failed = True
+            print(f"{result.path}: {result.error}", file=sys.stderr)
+        elif result.changed:
+            if result.diff:
+                sys.stdout.write(result.diff)
+            summary = ", ".join(f"{name}: {n}" for name, n in sorted(result.counts.items()))
+            print(f"{result.path}: {summary}", file=sys.stderr)
+    changed = sum(r.changed for r in results)
+    verb = "would change" if args.dry_run else "changed"
+    print(f"Processed {len(results)} files, {verb} {changed}", file=sys.stderr)
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
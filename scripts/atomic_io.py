@@ -0,0 +1,86 @@
+"""Atomic file replacement and advisory locking helpers.
+
+Writes follow the protocol from ``contracts/csv_interface.md``: data goes to a
+temporary ``.tmp`` file next to the target, is flushed and fsynced, and is
+then renamed over the target, so readers see either the old or the new file
+and never a partial one.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+from pathlib import Path
+from typing import IO, Iterator
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+def tmp_path_for(path: Path) -> Path:
+    """Temporary sibling of ``path``; the pid keeps concurrent writers apart."""
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def fsync_dir(directory: Path) -> None:
+    """Persist a rename by syncing the containing directory (POSIX only)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_open(path: Path | str, mode: str = "w", **kwargs) -> Iterator[IO]:
+    """Open a temporary file that replaces ``path`` when the block succeeds."""
+    path = Path(path)
+    tmp = tmp_path_for(path)
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            tmp.unlink()
+        raise
+    fsync_dir(path.parent)
+
+
+def atomic_write_text(path: Path | str, text: str, encoding: str = "utf-8") -> None:
+    with atomic_open(path, "w", encoding=encoding) as f:
+        f.write(text)
+
+
+def atomic_write_bytes(path: Path | str, data: bytes) -> None:
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+
+
+@contextlib.contextmanager
+def file_lock(path: Path | str, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory lock on ``path`` (created if missing) for the block.
+
+    Shared locks are only available with ``fcntl``; elsewhere every lock is
+    exclusive.
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
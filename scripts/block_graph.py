@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Dependency graph of spec blocks built from their DEPS/AFFECTS metadata.
+
+Every BEGIN/END block of the scanned specs becomes a node. ``<!-- DEPS: X -->``
+inside block B adds the edge X -> B (a change to X affects B) and
+``<!-- AFFECTS: Y -->`` adds B -> Y. References may be full block IDs, ID
+prefixes such as ``ECON.002`` or ``ECON.002.001.001`` (every block below the
+prefix), or contain ``*`` components such as ``ECON.***`` or ``ECON.015.*``,
+which match any single component. Numeric components compare by value, so
+``ECON.2.1`` and ``ECON.002.001`` are the same prefix.
+
+Prefixes are resolved through a trie of ID components, strongly connected
+components are found with Tarjan's algorithm, and transitive impact is
+computed over the condensed DAG with memoized reachability sets, so repeated
+queries are cheap.
+
+Usage::
+
+    python block_graph.py [--index _index.yaml] [--spec PATH|GLOB ...] impact ID [ID ...]
+    python block_graph.py [--index _index.yaml] [--spec PATH|GLOB ...] cycles
+    python block_graph.py [--index _index.yaml] [--spec PATH|GLOB ...] export [--output graph.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from block_lint import DEFAULT_CONFIG, DEFAULT_INDEX, BlockLinter, expand_targets, read_index
+from lint_cache import META_RE, parse_meta_values
+
+
+def _components(ref: str) -> Tuple[str, ...]:
+    """Split an ID or reference into comparable components."""
+    parts = []
+    for part in ref.strip().split("."):
+        if part and set(part) == {"*"}:
+            parts.append("*")
+        elif part.isdigit():
+            parts.append(str(int(part)))
+        else:
+            parts.append(part)
+    return tuple(parts)
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        # IDs of every block at or below this node
+        self.ids: List[str] = []
+
+
+def scan_blocks(lines: Iterable[str], marker_re) -> List[Dict[str, Any]]:
+    """Return ``{id, start, end, deps, affects}`` for every block in ``lines``."""
+    blocks: List[Dict[str, Any]] = []
+    stack: List[Dict[str, Any]] = []
+    for i, line in enumerate(lines, 1):
+        if "<!--" not in line:
+            continue
+        stripped = line.strip()
+        m = marker_re.match(stripped)
+        if m:
+            if m.group(1) == "BEGIN":
+                stack.append({"id": m.group(2), "start": i, "end": None, "deps": [], "affects": []})
+            elif stack and stack[-1]["id"] == m.group(2):
+                block = stack.pop()
+                block["end"] = i
+                blocks.append(block)
+            continue
+        meta = META_RE.match(stripped)
+        if meta and stack:
+            key = "deps" if meta.group(1) == "DEPS" else "affects"
+            stack[-1][key].extend(parse_meta_values(meta.group(2)))
+    blocks.sort(key=lambda b: b["start"])
+    return blocks
+
+
+class BlockGraph:
+    """Adjacency lists of "changing A affects B" edges between block IDs."""
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.affects: Dict[str, Set[str]] = defaultdict(set)
+        self.unresolved: List[Dict[str, str]] = []
+        self.duplicates: List[Dict[str, Any]] = []
+        self._raw: List[Tuple[str, str, str]] = []
+        self._trie = _TrieNode()
+        self._resolved: Dict[str, List[str]] = {}
+        self._sccs: List[List[str]] | None = None
+        self._component: Dict[str, int] = {}
+        self._reach: Dict[int, frozenset] = {}
+
+    # -- building -----------------------------------------------------------
+    def add_file(self, path: str, blocks: Iterable[Dict[str, Any]]) -> None:
+        for block in blocks:
+            bid = block["id"]
+            if bid in self.nodes:
+                self.duplicates.append({"id": bid, "file": path, "line": block["start"]})
+            else:
+                self.nodes[bid] = {"file": path, "line": block["start"]}
+                node = self._trie
+                node.ids.append(bid)
+                for part in _components(bid):
+                    node = node.children.setdefault(part, _TrieNode())
+                    node.ids.append(bid)
+            self._raw.extend((bid, "DEPS", ref) for ref in block["deps"])
+            self._raw.extend((bid, "AFFECTS", ref) for ref in block["affects"])
+
+    def resolve(self, ref: str) -> List[str]:
+        """Block IDs matched by a full ID, prefix or wildcard reference."""
+        if ref not in self._resolved:
+            nodes = [self._trie]
+            for part in _components(ref):
+                if part == "*":
+                    nodes = [child for node in nodes for child in node.children.values()]
+                else:
+                    nodes = [node.children[part] for node in nodes if part in node.children]
+                if not nodes:
+                    break
+            ids = {bid for node in nodes for bid in node.ids} if nodes else set()
+            self._resolved[ref] = sorted(ids)
+        return self._resolved[ref]
+
+    def link(self) -> "BlockGraph":
+        """Resolve every recorded DEPS/AFFECTS reference into edges."""
+        for bid, kind, ref in self._raw:
+            targets = self.resolve(ref)
+            if not targets:
+                self.unresolved.append({"block": bid, "kind": kind, "ref": ref})
+            for target in targets:
+                if target == bid:
+                    continue
+                if kind == "DEPS":
+                    self.affects[target].add(bid)
+                else:
+                    self.affects[bid].add(target)
+        self._raw = []
+        self._sccs = None
+        self._reach.clear()
+        return self
+
+    @classmethod
+    def from_paths(
+        cls,
+        paths: Sequence[str],
+        config_path: Path = DEFAULT_CONFIG,
+        cache_dir: Path | None = None,
+    ) -> "BlockGraph":
+        """Scan ``paths`` (reusing lint cache entries when ``cache_dir`` is set)."""
+        linter = BlockLinter.from_config(config_path)
+        cache = None
+        if cache_dir is not None:
+            from lint_cache import LintCache
+
+            cache = LintCache(linter, cache_dir)
+        graph = cls()
+        for path in paths:
+            blocks = None
+            if cache is not None:
+                cache.lint_file(path)
+                entry = cache.load_entry(path)
+                blocks = entry["blocks"] if entry else None
+            if blocks is None:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        blocks = scan_blocks(f, linter.marker_re)
+                except (OSError, UnicodeDecodeError) as exc:
+                    print(f"{path}: cannot read file: {exc}", file=sys.stderr)
+                    continue
+            graph.add_file(str(path), blocks)
+        return graph.link()
+
+    @classmethod
+    def from_index(cls, db_path: Path) -> "BlockGraph":
+        """Build the graph from a ``spec_index`` database instead of re-parsing."""
+        from spec_index import SpecIndex
+
+        graph = cls()
+        with SpecIndex(db_path) as index:
+            for path, blocks in index.block_tables():
+                graph.add_file(path, blocks)
+        return graph.link()
+
+    # -- queries ------------------------------------------------------------
+    def sccs(self) -> List[List[str]]:
+        """Strongly connected components in reverse topological order (Tarjan)."""
+        if self._sccs is not None:
+            return self._sccs
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        result: List[List[str]] = []
+        counter = 0
+        for root in self.nodes:
+            if root in index:
+                continue
+            # Iterative DFS: (node, iterator over its successors)
+            work = [(root, iter(sorted(self.affects.get(root, ()))))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, successors = work[-1]
+                advanced = False
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = low[succ] = counter
+                        counter += 1
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(sorted(self.affects.get(succ, ())))))
+                        advanced = True
+                        break
+                    if succ in on_stack:
+                        low[node] = min(low[node], index[succ])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    result.append(sorted(component))
+        self._sccs = result
+        self._component = {bid: i for i, comp in enumerate(result) for bid in comp}
+        return result
+
+    def cycles(self) -> List[List[str]]:
+        return [comp for comp in self.sccs() if len(comp) > 1]
+
+    def _reachable(self, comp: int) -> frozenset:
+        """Blocks reachable from component ``comp``, memoized per component."""
+        sccs = self.sccs()
+        # Components come in reverse topological order, so successors of a
+        # component always have a lower number; fill the memo bottom-up.
+        pending = [comp]
+        while pending:
+            c = pending[-1]
+            if c in self._reach:
+                pending.pop()
+                continue
+            succs = {
+                self._component[s]
+                for bid in sccs[c]
+                for s in self.affects.get(bid, ())
+            } - {c}
+            missing = [s for s in succs if s not in self._reach]
+            if missing:
+                pending.extend(missing)
+                continue
+            reach: Set[str] = set(sccs[c]) if len(sccs[c]) > 1 else set()
+            for s in succs:
+                reach.update(sccs[s])
+                reach.update(self._reach[s])
+            self._reach[c] = frozenset(reach)
+            pending.pop()
+        return self._reach[comp]
+
+    def impact(self, refs: Iterable[str]) -> Dict[str, Any]:
+        """Everything transitively affected by changing the blocks ``refs`` match."""
+        self.sccs()
+        sources: Set[str] = set()
+        unknown = []
+        for ref in refs:
+            matched = self.resolve(ref)
+            if not matched:
+                unknown.append(ref)
+            sources.update(matched)
+        affected: Set[str] = set()
+        for bid in sources:
+            affected |= self._reachable(self._component[bid])
+        return {
+            "sources": sorted(sources),
+            "affected": sorted(affected - sources),
+            "unknown": unknown,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": self.nodes,
+            "affects": {bid: sorted(targets) for bid, targets in sorted(self.affects.items())},
+            "unresolved": self.unresolved,
+            "duplicates": self.duplicates,
+            "cycles": self.cycles(),
+        }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query the DEPS/AFFECTS block graph")
+    parser.add_argument("--spec", dest="paths", action="append", default=[], help="Spec file or glob")
+    parser.add_argument(
+        "--index", type=Path, default=None, help=f"Spec index (default: {DEFAULT_INDEX.name})"
+    )
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="Lint profile config")
+    parser.add_argument("--cache-dir", type=Path, help="Reuse block tables from this lint cache")
+    parser.add_argument("--db", type=Path, help="Read blocks from a spec_index database")
+    sub = parser.add_subparsers(dest="command", required=True)
+    impact = sub.add_parser("impact", help="Blocks affected by changing the given IDs")
+    impact.add_argument("ids", nargs="+", help="Block IDs, prefixes or wildcards")
+    sub.add_parser("cycles", help="List dependency cycles")
+    export = sub.add_parser("export", help="Write the graph as JSON")
+    export.add_argument("--output", type=Path, help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        graph = BlockGraph.from_index(args.db)
+    else:
+        targets = list(args.paths)
+        if args.index or not targets:
+            for files in read_index(args.index or DEFAULT_INDEX).values():
+                targets.extend(files)
+        graph = BlockGraph.from_paths(expand_targets(targets), args.config, args.cache_dir)
+
+    if args.command == "impact":
+        result = graph.impact(args.ids)
+        print(json.dumps(result, indent=2))
+        if result["unknown"]:
+            raise SystemExit(1)
+    elif args.command == "cycles":
+        cycles = graph.cycles()
+        for cycle in cycles:
+            print("cycle: " + ", ".join(cycle))
+        print(f"{len(cycles)} cycles among {len(graph.nodes)} blocks")
+        if cycles:
+            raise SystemExit(1)
+    else:
+        text = json.dumps(graph.to_dict(), indent=2)
+        if args.output:
+            from atomic_io import atomic_write_text
+
+            atomic_write_text(args.output, text + "\n")
+        else:
+            print(text)
+
+
+if __name__ == "__main__":
+    main()
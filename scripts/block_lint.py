@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""Lint BEGIN/END block specs for any configured document prefix.
+
+The document prefixes (``ECON``, ``HUEY``, ...) and the block types each one
+allows are read from ``config/lint_profiles.json``. A spec is checked for
+matching ``BEGIN``/``END`` markers, ``@DOC.MAJOR.MINOR`` cross-references that
+resolve to a block section, and the CSV meta fields every spec must mention.
+Files are streamed line by line, so very large generated specs can be linted
+in bounded memory.
+
+Many files can be linted in one run; they are spread over a process pool and
+merged into a single report with a status line per file.
+
+Usage::
+
+    python block_lint.py [--doc ECON] [--index _index.yaml] [--jobs N] [--cache]
+                         [--daemon [SOCKET]] [PATH|GLOB ...]
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CONFIG = ROOT / "config" / "lint_profiles.json"
+DEFAULT_INDEX = ROOT / "_index.yaml"
+DEFAULT_CACHE_DIR = ROOT / ".lintcache"
+
+
+@dataclass
+class LintResult:
+    """Errors found in one file."""
+
+    path: str
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def exit_status(self) -> int:
+        return 0 if self.ok else 1
+
+
+@dataclass
+class Block:
+    """One BEGIN/END block with its line span and dependency metadata."""
+
+    id: str
+    start: int
+    end: int
+    deps: List[str] = field(default_factory=list)
+    affects: List[str] = field(default_factory=list)
+
+
+class BlockTracker:
+    """Match BEGIN/END markers as they stream past and record the block table."""
+
+    def __init__(self) -> None:
+        self.stack: List[Tuple[str, int]] = []
+        self.errors: List[str] = []
+        self.blocks: List[Block] = []
+        # (DOC, MAJOR, MINOR) of every BEGIN id, so cross-refs resolve in O(1)
+        self.sections = set()
+
+    def feed(self, kind: str, bid: str, i: int) -> None:
+        if kind == "BEGIN":
+            self.stack.append((bid, i))
+            doc, major, minor = bid.split(".", 3)[:3]
+            self.sections.add((doc, int(major), int(minor)))
+        elif not self.stack:
+            self.errors.append(f"{i}: END without BEGIN: {bid}")
+        else:
+            begin_id, bi = self.stack.pop()
+            if begin_id != bid:
+                self.errors.append(
+                    f"{i}: END id mismatch. BEGIN at {bi} was {begin_id}, END is {bid}"
+                )
+            self.blocks.append(Block(begin_id, bi, i))
+
+    def finish(self) -> List[str]:
+        """Report unclosed blocks and return all structural errors."""
+        for bid, bi in self.stack:
+            self.errors.append(f"{bi}: Unclosed BEGIN: {bid}")
+        return self.errors
+
+    def resolves(self, ref: str) -> bool:
+        return _ref_key(ref) in self.sections
+
+
+def load_profiles(config_path: Path = DEFAULT_CONFIG) -> Dict[str, object]:
+    """Return the lint configuration stored in ``config_path``."""
+    return json.loads(Path(config_path).read_text())
+
+
+def read_index(index_path: Path = DEFAULT_INDEX) -> Dict[str, List[str]]:
+    """Parse ``_index.yaml`` into ``{section: [path, ...]}``.
+
+    Only the flat ``key:`` / ``- item`` layout used by the index is supported,
+    which keeps the tooling free of a YAML dependency. Paths are resolved
+    relative to the index file.
+    """
+    index_path = Path(index_path)
+    sections: Dict[str, List[str]] = {}
+    current: List[str] | None = None
+    for raw in index_path.read_text().splitlines():
+        line = raw.split("#", 1)[0].rstrip()
+        if not line.strip():
+            continue
+        if line.lstrip().startswith("- "):
+            if current is None:
+                raise ValueError(f"{index_path}: list item outside a section: {raw!r}")
+            current.append(str(index_path.parent / line.lstrip()[2:].strip()))
+        elif line.endswith(":"):
+            current = sections.setdefault(line[:-1].strip(), [])
+        else:
+            raise ValueError(f"{index_path}: unsupported line: {raw!r}")
+    return sections
+
+
+def expand_targets(patterns: Iterable[str]) -> List[str]:
+    """Expand files and glob patterns, keeping order and dropping duplicates."""
+    seen: Dict[str, None] = {}
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            seen.setdefault(match, None)
+    return list(seen)
+
+
+def _ref_key(ref: str) -> Tuple[str, int, int]:
+    """Map ``@DOC.MAJOR.MINOR`` to the ``(DOC, MAJOR, MINOR)`` section key."""
+    doc, major, minor = ref[1:].split(".")
+    return doc, int(major), int(minor)
+
+
+class BlockLinter:
+    """Lint specs whose block IDs use one of the configured document prefixes."""
+
+    def __init__(
+        self,
+        docs: Mapping[str, Iterable[str]],
+        required_fields: Sequence[str] = ("file_seq", "created_at_utc", "checksum_sha256"),
+    ) -> None:
+        if not docs:
+            raise ValueError("at least one document prefix is required")
+        self.docs = {name: tuple(types) for name, types in docs.items()}
+        self.required_fields = tuple(required_fields)
+        block_id = "|".join(
+            rf"{re.escape(name)}\.\d{{3}}\.\d{{3}}\.\d{{3}}\.(?:{'|'.join(types)})"
+            for name, types in self.docs.items()
+        )
+        self.marker_re = re.compile(rf"^<!-- (BEGIN|END):((?:{block_id})\.[a-z0-9_]+) -->$")
+        names = "|".join(re.escape(name) for name in self.docs)
+        self.ref_re = re.compile(rf"@(?:{names})\.\d+\.\d+")
+
+    @classmethod
+    def from_config(
+        cls, config_path: Path = DEFAULT_CONFIG, docs: Iterable[str] | None = None
+    ) -> "BlockLinter":
+        """Build a linter from the config file, optionally limited to ``docs``."""
+        config = load_profiles(config_path)
+        profiles = config["docs"]
+        if docs is not None:
+            unknown = [d for d in docs if d not in profiles]
+            if unknown:
+                raise ValueError(f"unknown document prefix: {', '.join(unknown)}")
+            profiles = {d: profiles[d] for d in docs}
+        return cls(
+            {name: profile["types"] for name, profile in profiles.items()},
+            config.get("required_meta_fields", ("file_seq", "created_at_utc", "checksum_sha256")),
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the settings that influence lint results."""
+        payload = json.dumps([self.docs, self.required_fields], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lint_lines(self, lines: Iterable[str]) -> List[str]:
+        """Return the lint errors for a spec given as an iterable of lines.
+
+        The lines are consumed in a single pass, so a file object can be passed
+        directly: memory is bounded by the open blocks and the references that
+        are still unresolved, not by the size of the document.
+        """
+        tracker = BlockTracker()
+        # References to sections not seen yet; resolved once the file ends
+        pending: List[str] = []
+        missing = dict.fromkeys(self.required_fields)
+
+        for i, line in enumerate(lines, 1):
+            m = self.marker_re.match(line.strip()) if "<!--" in line else None
+            if m:
+                tracker.feed(m.group(1), m.group(2), i)
+            elif "@" in line:
+                for ref in self.ref_re.findall(line):
+                    if not tracker.resolves(ref):
+                        pending.append(ref)
+            if missing:
+                for required in [r for r in missing if r in line]:
+                    del missing[required]
+
+        return self.collect_errors(tracker, pending, missing)
+
+    @staticmethod
+    def collect_errors(
+        tracker: BlockTracker, refs: Iterable[str], missing: Iterable[str]
+    ) -> List[str]:
+        """Order structural, cross-ref and meta-field errors as a report."""
+        errors = tracker.finish()
+        # Cross-ref sanity: section prefix resolution
+        for ref in refs:
+            if not tracker.resolves(ref):
+                errors.append(f"Cross-ref {ref} has no matching section prefix among block IDs")
+        # CSV required meta fields appear at least once in the doc
+        for required in missing:
+            errors.append(f"Missing required CSV meta field in doc: {required}")
+        return errors
+
+    def lint_file(self, path: str | os.PathLike) -> LintResult:
+        """Lint one file; unreadable files are reported instead of raised."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return LintResult(str(path), self.lint_lines(f))
+        except (OSError, UnicodeDecodeError) as exc:
+            return LintResult(str(path), [f"Cannot read file: {exc}"])
+
+    def lint_paths(self, paths: Sequence[str], jobs: int | None = None) -> List[LintResult]:
+        """Lint ``paths`` across a process pool, returning results in input order."""
+        return map_paths(self.lint_file, paths, jobs)
+
+
+def map_paths(
+    lint_file: Callable[[str], LintResult], paths: Sequence[str], jobs: int | None = None
+) -> List[LintResult]:
+    """Apply ``lint_file`` to ``paths`` in a process pool, keeping input order."""
+    if jobs == 1 or len(paths) <= 1:
+        return [lint_file(p) for p in paths]
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lint_file, paths, chunksize=chunksize))
+
+
+def run_single(doc: str, argv: Sequence[str]) -> None:
+    """Entry point for the single-file ``<doc>_doc_lint.py`` wrappers."""
+    if len(argv) < 2:
+        print(f"Usage: {Path(argv[0]).name} <spec.md>", file=sys.stderr)
+        sys.exit(2)
+    result = BlockLinter.from_config(docs=[doc]).lint_file(argv[1])
+    if result.errors:
+        print("\n".join(result.errors))
+        sys.exit(1)
+    print("OK: Lint passed")
+
+
+def format_report(results: Sequence[LintResult]) -> str:
+    """Merge per-file results into one human readable report."""
+    lines = []
+    for result in results:
+        status = "OK" if result.ok else f"FAIL ({len(result.errors)} errors)"
+        lines.append(f"{result.path}: {status}")
+        lines.extend(f"  {error}" for error in result.errors)
+    failed = sum(not r.ok for r in results)
+    lines.append(f"Linted {len(results)} files, {failed} failed")
+    return "\n".join(lines)
+
+
+def _lint_via_daemon(
+    socket_path: str | None, paths: Sequence[str], config: Path, docs: Sequence[str] | None
+) -> List[LintResult] | None:
+    """Results from a running ``spec_daemon.py``, or None to lint in-process."""
+    if socket_path is None:
+        return None
+    from spec_daemon import query
+
+    reply = query(
+        "lint",
+        socket_path=socket_path or None,
+        paths=[os.path.abspath(p) for p in paths],
+        config=os.path.abspath(config),
+        docs=docs,
+    )
+    if reply is None:
+        return None
+    return [LintResult(p, r["errors"]) for p, r in zip(paths, reply)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lint BEGIN/END block specs")
+    parser.add_argument("paths", nargs="*", help="Spec files or glob patterns")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="Lint profile config")
+    parser.add_argument(
+        "--doc", action="append", help="Restrict to a document prefix (repeatable)"
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        help="Also lint every file listed in an index such as _index.yaml",
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    parser.add_argument(
+        "--cache", action="store_true", help="Reuse results from the incremental lint cache"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Lint cache directory"
+    )
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const="",
+        metavar="SOCKET",
+        help="Ask a running spec_daemon.py first; lint in-process if none answers",
+    )
+    args = parser.parse_args()
+
+    targets = list(args.paths)
+    if args.index:
+        for files in read_index(args.index).values():
+            targets.extend(files)
+    paths = expand_targets(targets)
+    if not paths:
+        parser.error("no files to lint")
+
+    results = _lint_via_daemon(args.daemon, paths, args.config, args.doc)
+    if results is None:
+        linter = BlockLinter.from_config(args.config, args.doc)
+        if args.cache:
+            from lint_cache import LintCache
+
+            results = LintCache(linter, args.cache_dir).lint_paths(paths, args.jobs)
+        else:
+            results = linter.lint_paths(paths, args.jobs)
+    if args.json:
+        report = [
+            {"path": r.path, "exit_status": r.exit_status, "errors": r.errors}
+            for r in results
+        ]
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(results))
+    if any(not r.ok for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Classify values into the range buckets of ``schemas/enums.json``.
+
+``proximity_buckets`` (``min_minutes``/``max_minutes``) and ``outcome_buckets``
+(``rr_min``/``rr_max``) are compiled once into a sorted array of boundary
+points. Each point and each open interval between two points is a *piece*
+with a precomputed bucket code and flags, so classifying a value is one
+binary search plus two list lookups, and :meth:`BucketClassifier.classify`
+handles a whole column in a single call.
+
+Ranges are closed and a ``null`` bound is unbounded. Where one bucket ends
+exactly where the next begins, the shared point belongs to the lower bucket;
+any other value covered by several buckets is flagged ``OVERLAP`` (and coded
+as the first of them in registry order), and a value covered by none is
+flagged ``GAP`` with code ``-1``. NaN is flagged ``INVALID``.
+
+:func:`load_classifier` keeps the compiled form and only recompiles when the
+registry's SHA-256 changes.
+
+Usage::
+
+    python bucket_classifier.py FAMILY [VALUE ...] [--enums PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from build_manifest import file_sha256
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_ENUMS = ROOT / "schemas" / "enums.json"
+
+# Registry sections with range bounds, and the keys holding them
+BUCKET_FAMILIES = {
+    "proximity_buckets": ("min_minutes", "max_minutes"),
+    "outcome_buckets": ("rr_min", "rr_max"),
+}
+
+GAP = 1
+OVERLAP = 2
+INVALID = 4
+
+
+@dataclass
+class Classified:
+    """Bucket codes (``-1`` for none) and flag bits for a column of values."""
+
+    codes: array
+    flags: array
+    names: Sequence[str]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def labels(self) -> List[Optional[str]]:
+        names = self.names
+        return [names[c] if c >= 0 else None for c in self.codes]
+
+    def counts(self) -> Counter:
+        """Values per bucket name, plus ``gap``/``overlap``/``invalid`` totals."""
+        counts = Counter(self.names[c] for c in self.codes if c >= 0)
+        for flag, label in ((GAP, "gap"), (OVERLAP, "overlap"), (INVALID, "invalid")):
+            n = sum(1 for f in self.flags if f & flag)
+            if n:
+                counts[label] = n
+        return counts
+
+
+class BucketClassifier:
+    """Compiled ranges of one bucket family."""
+
+    def __init__(self, names: Sequence[str], ranges: Sequence[Tuple[float, float]]) -> None:
+        for name, (lo, hi) in zip(names, ranges):
+            if lo > hi:
+                raise ValueError(f"bucket {name}: lower bound {lo} exceeds upper bound {hi}")
+        self.names = list(names)
+        self.ranges = list(ranges)
+        self.points = sorted({b for r in ranges for b in r if math.isfinite(b)})
+        # Piece 2k is the open interval below points[k], piece 2k+1 is points[k]
+        self.piece_codes: List[int] = []
+        self.piece_flags: List[int] = []
+        for piece in range(2 * len(self.points) + 1):
+            code, flags = self._resolve(self._sample(piece), piece % 2 == 1)
+            self.piece_codes.append(code)
+            self.piece_flags.append(flags)
+
+    @classmethod
+    def from_items(
+        cls, items: Sequence[Mapping[str, Any]], low_key: str, high_key: str
+    ) -> "BucketClassifier":
+        def bound(value: Any, default: float) -> float:
+            return default if value is None else float(value)
+
+        ranges = [(bound(i[low_key], -math.inf), bound(i[high_key], math.inf)) for i in items]
+        return cls([i["name"] for i in items], ranges)
+
+    def _sample(self, piece: int) -> float:
+        """A value inside ``piece``."""
+        points = self.points
+        k, is_point = divmod(piece, 2)
+        if is_point:
+            return points[k]
+        if not points:
+            return 0.0
+        if k == 0:
+            return points[0] - 1
+        if k == len(points):
+            return points[-1] + 1
+        return (points[k - 1] + points[k]) / 2
+
+    def _resolve(self, value: float, is_point: bool) -> Tuple[int, int]:
+        covering = [i for i, (lo, hi) in enumerate(self.ranges) if lo <= value <= hi]
+        if not covering:
+            return -1, GAP
+        if len(covering) == 1:
+            return covering[0], 0
+        if is_point and len(covering) == 2:
+            a, b = covering
+            if self.ranges[a][1] == value == self.ranges[b][0]:
+                return a, 0
+            if self.ranges[b][1] == value == self.ranges[a][0]:
+                return b, 0
+        return covering[0], OVERLAP
+
+    def gaps_and_overlaps(self) -> List[Tuple[str, str]]:
+        """Describe every flagged piece as ``(kind, interval)`` for reports."""
+        found = []
+        points = self.points
+        for piece, flags in enumerate(self.piece_flags):
+            if not flags:
+                continue
+            k, is_point = divmod(piece, 2)
+            if is_point:
+                interval = f"[{points[k]:g}]"
+            else:
+                lo = f"{points[k - 1]:g}" if k else "-inf"
+                hi = f"{points[k]:g}" if k < len(points) else "inf"
+                interval = f"({lo}, {hi})"
+            found.append(("gap" if flags & GAP else "overlap", interval))
+        return found
+
+    def classify_one(self, value: float) -> Tuple[int, int]:
+        if value != value:
+            return -1, INVALID
+        points = self.points
+        k = bisect_left(points, value)
+        piece = 2 * k + 1 if k < len(points) and points[k] == value else 2 * k
+        return self.piece_codes[piece], self.piece_flags[piece]
+
+    def classify(self, values: Iterable[float]) -> Classified:
+        """Classify a whole column of values."""
+        points = self.points
+        n = len(points)
+        piece_codes = self.piece_codes
+        piece_flags = self.piece_flags
+        pieces = array("i")
+        invalid: List[int] = []
+        append = pieces.append
+        for i, value in enumerate(values):
+            k = bisect_left(points, value)
+            if k < n and points[k] == value:
+                append(2 * k + 1)
+            else:
+                if value != value:
+                    invalid.append(i)
+                append(2 * k)
+        codes = array("h", [piece_codes[p] for p in pieces])
+        flags = array("B", [piece_flags[p] for p in pieces])
+        for i in invalid:
+            codes[i], flags[i] = -1, INVALID
+        return Classified(codes, flags, self.names)
+
+
+# path -> (stat key, sha256, compiled families)
+_CACHE: Dict[str, Tuple[Tuple[int, int], str, Dict[str, BucketClassifier]]] = {}
+
+
+def compile_registry(enums: Mapping[str, Any]) -> Dict[str, BucketClassifier]:
+    """Compile every bucket family present in a parsed registry."""
+    return {
+        family: BucketClassifier.from_items(enums[family], *keys)
+        for family, keys in BUCKET_FAMILIES.items()
+        if family in enums
+    }
+
+
+def load_classifier(family: str, enums_path: Path | str = DEFAULT_ENUMS) -> BucketClassifier:
+    """Return the compiled classifier for ``family``, recompiling on content change."""
+    path = str(Path(enums_path).resolve())
+    st = os.stat(path)
+    key = (st.st_size, st.st_mtime_ns)
+    cached = _CACHE.get(path)
+    if cached is None or cached[0] != key:
+        digest = file_sha256(path)
+        if cached is not None and cached[1] == digest:
+            cached = _CACHE[path] = (key, digest, cached[2])
+        else:
+            enums = json.loads(Path(path).read_text())
+            cached = _CACHE[path] = (key, digest, compile_registry(enums))
+    try:
+        return cached[2][family]
+    except KeyError:
+        raise ValueError(f"{enums_path}: no bucket family {family!r}") from None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Classify values into enum range buckets")
+    parser.add_argument("family", choices=sorted(BUCKET_FAMILIES), help="Bucket family")
+    parser.add_argument("values", nargs="*", type=float, help="Values to classify")
+    parser.add_argument("--enums", type=Path, default=DEFAULT_ENUMS, help="Enum registry")
+    args = parser.parse_args()
+
+    try:
+        classifier = load_classifier(args.family, args.enums)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    for name, (lo, hi) in zip(classifier.names, classifier.ranges):
+        print(f"{name}: [{lo:g}, {hi:g}]")
+    for kind, interval in classifier.gaps_and_overlaps():
+        print(f"{kind}: {interval}")
+    if args.values:
+        result = classifier.classify(args.values)
+        for value, label, flags in zip(args.values, result.labels(), result.flags):
+            note = " (overlap)" if flags & OVERLAP else ""
+            print(f"{value:g}: {label or '-'}{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Build manifest for incremental document generation.
+
+The manifest maps every generated file to the SHA-256 of the inputs it was
+rendered from (template, data, schema, ...) and of the output itself. A
+generator asks :meth:`BuildManifest.write` to produce an output; the call is a
+no-op when the recorded input hashes still match and the output on disk is
+the one that was generated, so unchanged outputs keep their mtime and
+downstream lint/CI steps do not redo work. Outputs are written atomically.
+
+The manifest is a JSON file (``.buildmanifest.json`` at the repository root
+by default) and is saved under a lock, merging with entries other processes
+recorded in the meantime.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Mapping
+
+from atomic_io import atomic_write_text, file_lock, fsync_dir, tmp_path_for
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BUILD_MANIFEST = ROOT / ".buildmanifest.json"
+MANIFEST_VERSION = 1
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: Path | str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputWriter:
+    """Text sink that hashes everything written through it."""
+
+    def __init__(self, f: IO[str]) -> None:
+        self._f = f
+        self._digest = hashlib.sha256()
+        self.changed = False
+
+    def write(self, text: str) -> None:
+        self._f.write(text)
+        self._digest.update(text.encode("utf-8"))
+
+    def writelines(self, lines) -> None:
+        for line in lines:
+            self.write(line)
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+class BuildManifest:
+    """Input/output hashes of generated files, keyed by resolved output path."""
+
+    def __init__(self, path: Path | str = DEFAULT_BUILD_MANIFEST) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = self._read()
+        # Entries recorded by this instance, merged into the file on save
+        self.changes: Dict[str, Dict[str, Any]] = {}
+
+    def __enter__(self) -> "BuildManifest":
+        return self
+
+    def __exit__(self, exc_type, *exc: Any) -> None:
+        if exc_type is None:
+            self.save()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("outputs", {})
+
+    @staticmethod
+    def key(output: Path | str) -> str:
+        return str(Path(output).resolve())
+
+    def up_to_date(self, output: Path | str, inputs: Mapping[str, str]) -> bool:
+        """True when ``output`` was generated from ``inputs`` and is untouched since."""
+        entry = self.entries.get(self.key(output))
+        if not entry or entry["inputs"] != dict(inputs):
+            return False
+        try:
+            st = os.stat(output)
+        except OSError:
+            return False
+        if (entry["size"], entry["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+            return True
+        # Touched but possibly identical (e.g. after a checkout); compare content.
+        if file_sha256(output) != entry["sha256"]:
+            return False
+        self.record(output, inputs, entry["sha256"])
+        return True
+
+    def record(self, output: Path | str, inputs: Mapping[str, str], sha256: str) -> None:
+        st = os.stat(output)
+        entry = {
+            "inputs": dict(inputs),
+            "sha256": sha256,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        self.entries[self.key(output)] = entry
+        self.changes[self.key(output)] = entry
+
+    def merge(self, changes: Mapping[str, Dict[str, Any]]) -> None:
+        """Adopt entries recorded elsewhere, e.g. by worker processes."""
+        self.entries.update(changes)
+        self.changes.update(changes)
+
+    def write(self, output: Path | str, text: str, inputs: Mapping[str, str]) -> bool:
+        """Write ``text`` to ``output`` unless it is already current; True if written."""
+        output = Path(output)
+        digest = sha256_text(text)
+        try:
+            unchanged = output.stat().st_size == len(text.encode("utf-8")) and (
+                file_sha256(output) == digest
+            )
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(output, text)
+        self.record(output, inputs, digest)
+        return not unchanged
+
+    @contextlib.contextmanager
+    def open_output(self, output: Path | str, inputs: Mapping[str, str]) -> Iterator[OutputWriter]:
+        """Stream a generated output into a temporary file.
+
+        On success the temporary file replaces ``output`` only if its content
+        differs (``writer.changed`` tells which), and the entry is recorded.
+        """
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = tmp_path_for(output)
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                writer = OutputWriter(f)
+                yield writer
+                f.flush()
+                os.fsync(f.fileno())
+            digest = writer.hexdigest()
+            try:
+                writer.changed = file_sha256(output) != digest
+            except OSError:
+                writer.changed = True
+            if writer.changed:
+                os.replace(tmp, output)
+                fsync_dir(output.parent)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                tmp.unlink()
+        self.record(output, inputs, digest)
+
+    def save(self) -> None:
+        """Merge recorded entries into the manifest file atomically."""
+        if not self.changes:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path.with_name(self.path.name + ".lock")):
+            entries = self._read()
+            entries.update(self.changes)
+            atomic_write_text(
+                self.path,
+                json.dumps({"version": MANIFEST_VERSION, "outputs": entries}, indent=1, sort_keys=True),
+            )
+        self.entries = entries
+        self.changes = {}
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Encode and decode CAL8/CAL5 calendar identifiers.
+
+CAL8 (``03_identifier_systems.md`` §3.2) is ``R C C I E E V F``: region,
+two-letter country, impact (``H``/``M``), two-letter event type, ingest
+schema version and revision flag, e.g. ``AUSHNF10``. The revision flag is the
+event's revision count capped at 9. CAL5, the legacy alias, is the first five
+symbols (region, country, impact and the first letter of the event type).
+
+:class:`Cal8Codec` derives the fields of a normalized event (``ccy``,
+``impact``, ``title``) from ``config/cal8.json``: currencies map to region and
+country, impacts to ``H``/``M`` and titles to event types through one
+combined regex. The six-symbol prefix is memoized per ``(ccy, impact,
+title)``, so encoding a batch costs one dict lookup per event.
+
+Usage::
+
+    python cal8.py CAL8 [CAL8 ...]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CONFIG = ROOT / "config" / "cal8.json"
+CAL8_RE = re.compile(r"([A-Z])([A-Z]{2})([HM])([A-Z]{2})([0-9])([0-9])")
+MAX_REVISION_FLAG = 9
+
+
+class Cal8(NamedTuple):
+    region: str
+    country: str
+    impact: str
+    event_type: str
+    version: int
+    revision: int
+
+    def __str__(self) -> str:
+        return f"{self.region}{self.country}{self.impact}{self.event_type}{self.version}{self.revision}"
+
+    @property
+    def cal5(self) -> str:
+        return str(self)[:5]
+
+    def with_revision(self, revision_seq: int) -> "Cal8":
+        return self._replace(revision=revision_flag(revision_seq))
+
+
+def revision_flag(revision_seq: int) -> int:
+    """The ``F`` symbol for an event revised ``revision_seq`` times."""
+    return min(revision_seq, MAX_REVISION_FLAG)
+
+
+def decode(value: str) -> Cal8:
+    m = CAL8_RE.fullmatch(value)
+    if not m:
+        raise ValueError(f"invalid CAL8 {value!r}")
+    region, country, impact, event_type, version, revision = m.groups()
+    return Cal8(region, country, impact, event_type, int(version), int(revision))
+
+
+def cal5_of(cal8: str) -> str:
+    return cal8[:5]
+
+
+class Cal8Codec:
+    """Assign CAL8 identifiers to normalized events."""
+
+    def __init__(
+        self,
+        currencies: Mapping[str, Sequence[str]],
+        impacts: Mapping[str, str],
+        event_types: Sequence[Tuple[str, str]],
+        default_event_type: str = "OT",
+        version: int = 1,
+    ) -> None:
+        if not 0 <= version <= 9:
+            raise ValueError(f"CAL8 version must be a single digit, got {version}")
+        self.currencies = {ccy: "".join(rc) for ccy, rc in currencies.items()}
+        self.impacts = dict(impacts)
+        self.version = version
+        self.default_event_type = default_event_type
+        self.event_codes = [code for code, _ in event_types]
+        self._types_re = re.compile(
+            "|".join(f"(?P<_e{i}>{pattern})" for i, (_, pattern) in enumerate(event_types)),
+            re.IGNORECASE,
+        ) if event_types else None
+        self._event_types: Dict[str, str] = {}
+        self._prefixes: Dict[Tuple[str, str, str], str] = {}
+
+    @classmethod
+    def from_config(cls, path: Path | str = DEFAULT_CONFIG) -> "Cal8Codec":
+        config = json.loads(Path(path).read_text())
+        return cls(
+            config["currencies"],
+            config["impacts"],
+            [tuple(item) for item in config["event_types"]],
+            config.get("default_event_type", "OT"),
+            config.get("version", 1),
+        )
+
+    def event_type(self, title: str) -> str:
+        """Event type code of ``title``; the first matching rule wins."""
+        code = self._event_types.get(title)
+        if code is None:
+            m = self._types_re.search(title) if self._types_re else None
+            code = self.event_codes[int(m.lastgroup[2:])] if m else self.default_event_type
+            self._event_types[title] = code
+        return code
+
+    def prefix(self, ccy: str, impact: str, title: str) -> str:
+        """The six symbols that do not depend on version and revision."""
+        key = (ccy, impact, title)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            region_country = self.currencies.get(ccy)
+            if region_country is None:
+                raise ValueError(f"unknown currency {ccy!r}")
+            code = self.impacts.get(impact)
+            if code is None:
+                raise ValueError(f"unknown impact {impact!r}")
+            prefix = self._prefixes[key] = f"{region_country}{code}{self.event_type(title)}"
+        return prefix
+
+    def encode(self, event: Mapping[str, Any], revision_seq: int = 0) -> str:
+        prefix = self.prefix(event["ccy"], event["impact"], event["title"])
+        return f"{prefix}{self.version}{revision_flag(revision_seq)}"
+
+    def encode_batch(
+        self, events: Iterable[Mapping[str, Any]], revisions: Optional[Sequence[int]] = None
+    ) -> Tuple[List[Optional[str]], List[Tuple[int, str]]]:
+        """CAL8 per event (None where it cannot be assigned) and ``(row, error)`` pairs."""
+        cal8s: List[Optional[str]] = []
+        errors: List[Tuple[int, str]] = []
+        prefixes = self._prefixes
+        suffixes = [f"{self.version}{revision_flag(n)}" for n in range(MAX_REVISION_FLAG + 1)]
+        for i, event in enumerate(events):
+            try:
+                key = (event["ccy"], event["impact"], event["title"])
+                prefix = prefixes.get(key) or self.prefix(*key)
+            except (KeyError, TypeError, ValueError) as exc:
+                if isinstance(exc, KeyError):
+                    errors.append((i, f"missing field {exc}"))
+                elif isinstance(exc, TypeError):
+                    errors.append((i, f"malformed event: {exc}"))
+                else:
+                    errors.append((i, str(exc)))
+                cal8s.append(None)
+                continue
+            seq = revisions[i] if revisions is not None else 0
+            cal8s.append(prefix + suffixes[min(seq, MAX_REVISION_FLAG)])
+        return cal8s, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Decode CAL8 identifiers")
+    parser.add_argument("ids", nargs="+", help="CAL8 identifiers")
+    args = parser.parse_args()
+
+    failed = False
+    for value in args.ids:
+        try:
+            cal8 = decode(value)
+        except ValueError as exc:
+            print(f"{value}: {exc}")
+            failed = True
+            continue
+        print(
+            f"{value}: region={cal8.region} country={cal8.country} impact={cal8.impact} "
+            f"event_type={cal8.event_type} version={cal8.version} revision={cal8.revision} "
+            f"cal5={cal8.cal5}"
+        )
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""SQLite persistence for normalized calendar events (spec §4.13).
+
+``calendar_events`` holds one row per event, unique on the canonical key
+``(ccy, title, event_date)``. :meth:`CalendarStore.import_events` ingests a
+whole normalized batch in one ``BEGIN IMMEDIATE`` transaction:
+
+* CAL8 prefixes come from :class:`cal8.Cal8Codec` and proximity buckets from
+  :func:`bucket_classifier.load_classifier`, both computed for the batch in
+  bulk;
+* the stored rows of the batch's date range are read once and diffed in
+  memory, so unchanged events cost nothing;
+* new events and revisions (changed ``event_time_utc`` or ``impact``) go
+  through a single ``executemany`` UPSERT. A revision increments
+  ``revision_seq`` and recomputes the CAL8 ``F`` flag and proximity of that
+  row only;
+* a reschedule to another UTC day changes the canonical key. An event whose
+  ``previous_event_time_utc`` names its old slot revises that row in place.
+  Without it, an event with no row under its own key revises the closest
+  unreleased row of the same ``(ccy, title)`` within ``RESCHEDULE_WINDOW``,
+  but only a row dated inside the batch's date span that the batch does not
+  list itself: the batch covers that day, so the occurrence moved. Rows on
+  days the batch does not cover are left alone.
+
+:meth:`CalendarStore.bump_revisions` records official revisions that change
+no field, and :meth:`CalendarStore.refresh_proximity` rewrites only the rows
+whose bucket moved since the last tick. The database runs in WAL mode.
+
+Usage::
+
+    python calendar_store.py [--db PATH] import EVENTS.jsonl
+    python calendar_store.py [--db PATH] refresh
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from bucket_classifier import DEFAULT_ENUMS, load_classifier
+from cal8 import MAX_REVISION_FLAG, Cal8Codec, cal5_of, revision_flag
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / ".calendar.sqlite"
+TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# How far an official reschedule may move an event
+RESCHEDULE_WINDOW = timedelta(hours=24)
+
+Key = Tuple[str, str, str]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def parse_utc(value: str) -> datetime:
+    """Parse an ISO-8601 UTC timestamp (``Z`` or ``+00:00``)."""
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if ts.tzinfo is None or ts.utcoffset():
+        raise ValueError(f"not a UTC timestamp: {value!r}")
+    return ts
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    revised: List[Tuple[str, str]] = field(default_factory=list)  # (old cal8, new cal8)
+    unchanged: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+class CalendarStore:
+    """``calendar_events`` in a local SQLite database."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS calendar_events (
+            event_id       INTEGER PRIMARY KEY,
+            cal8           TEXT NOT NULL,
+            cal5           TEXT NOT NULL,
+            title          TEXT NOT NULL,
+            ccy            TEXT NOT NULL,
+            impact         TEXT NOT NULL,
+            event_date     TEXT NOT NULL,
+            event_time_utc TEXT NOT NULL,
+            state          TEXT NOT NULL DEFAULT 'SCHEDULED',
+            proximity      TEXT,
+            revision_seq   INTEGER NOT NULL DEFAULT 0,
+            quality_score  REAL,
+            blocked        INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (ccy, title, event_date)
+        );
+        CREATE INDEX IF NOT EXISTS idx_calendar_events_state_time
+            ON calendar_events(state, event_time_utc);
+        CREATE INDEX IF NOT EXISTS idx_calendar_events_ccy_impact
+            ON calendar_events(ccy, impact);
+    """
+    SELECT = (
+        "SELECT event_id, ccy, title, event_date, event_time_utc, impact, cal8, "
+        "revision_seq FROM calendar_events"
+    )
+    MOVE = """
+        UPDATE calendar_events SET
+            cal8 = ?, cal5 = ?, impact = ?, event_date = ?, event_time_utc = ?,
+            proximity = ?, revision_seq = ?, quality_score = ?
+        WHERE event_id = ?
+    """
+    UPSERT = """
+        INSERT INTO calendar_events (
+            cal8, cal5, title, ccy, impact, event_date, event_time_utc,
+            proximity, revision_seq, quality_score
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (ccy, title, event_date) DO UPDATE SET
+            cal8 = excluded.cal8,
+            cal5 = excluded.cal5,
+            impact = excluded.impact,
+            event_time_utc = excluded.event_time_utc,
+            proximity = excluded.proximity,
+            revision_seq = excluded.revision_seq,
+            quality_score = excluded.quality_score
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str = DEFAULT_DB,
+        codec: Cal8Codec | None = None,
+        enums_path: Path | str = DEFAULT_ENUMS,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.codec = codec or Cal8Codec.from_config()
+        self.enums_path = enums_path
+        # Autocommit mode: transactions are opened explicitly
+        self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def __enter__(self) -> "CalendarStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _proximity(self, times: Sequence[datetime], now: datetime) -> List[Optional[str]]:
+        classifier = load_classifier("proximity_buckets", self.enums_path)
+        return classifier.classify([(t - now).total_seconds() / 60 for t in times]).labels()
+
+    def import_events(
+        self, events: Iterable[Mapping[str, Any]], now: datetime | None = None
+    ) -> ImportResult:
+        """Insert new events and apply revisions from one normalized batch."""
+        now = now or _utcnow()
+        result = ImportResult()
+        events = list(events)
+        cal8s, result.errors = self.codec.encode_batch(events)
+        failed = {i for i, _ in result.errors}
+        # Canonical key -> (row index, normalized time); later duplicates win
+        batch: Dict[Key, Tuple[int, datetime]] = {}
+        # Canonical key -> key of the slot the event was explicitly moved from
+        previous: Dict[Key, Key] = {}
+        for i, event in enumerate(events):
+            if i in failed:
+                continue
+            try:
+                ts = parse_utc(event["event_time_utc"])
+            except (KeyError, TypeError, ValueError) as exc:
+                result.errors.append((i, f"bad event_time_utc: {exc}"))
+                continue
+            try:
+                moved_from = event.get("previous_event_time_utc")
+                prev = parse_utc(moved_from) if moved_from else None
+            except (TypeError, ValueError) as exc:
+                result.errors.append((i, f"bad previous_event_time_utc: {exc}"))
+                continue
+            key = (event["ccy"], event["title"], f"{ts:%Y-%m-%d}")
+            batch[key] = (i, ts)
+            previous.pop(key, None)
+            if prev is not None and f"{prev:%Y-%m-%d}" != key[2]:
+                previous[key] = (key[0], key[1], f"{prev:%Y-%m-%d}")
+        result.errors.sort()
+        if not batch:
+            return result
+
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            times = [ts for _, ts in batch.values()]
+            stored = {
+                (r["ccy"], r["title"], r["event_date"]): r
+                for r in conn.execute(
+                    self.SELECT + " WHERE event_date BETWEEN ? AND ?",
+                    (f"{min(times):%Y-%m-%d}", f"{max(times):%Y-%m-%d}"),
+                )
+            }
+            for prev in set(previous.values()) - stored.keys():
+                row = conn.execute(
+                    self.SELECT + " WHERE ccy = ? AND title = ? AND event_date = ?", prev
+                ).fetchone()
+                if row is not None:
+                    stored[prev] = row
+            # Rows of the covered days that the batch no longer lists (and no
+            # event claims explicitly) may have been rescheduled
+            claimed = set(previous.values())
+            movable: Dict[Tuple[str, str], List[sqlite3.Row]] = {}
+            for key, row in stored.items():
+                if (
+                    key not in batch
+                    and key not in claimed
+                    and parse_utc(row["event_time_utc"]) >= now
+                ):
+                    movable.setdefault(key[:2], []).append(row)
+            # (key, row index, time, revision_seq, prior row)
+            changed: List[Tuple[Key, int, datetime, int, Optional[sqlite3.Row]]] = []
+            for key, (i, ts) in batch.items():
+                event = events[i]
+                old = stored.get(key)
+                prev = previous.get(key)
+                if old is None and prev is not None and prev not in batch:
+                    old = stored.pop(prev, None)
+                if old is None:
+                    old = self._rescheduled(movable.get(key[:2]), ts)
+                if old is None:
+                    changed.append((key, i, ts, 0, None))
+                    result.inserted += 1
+                elif old["event_time_utc"] != f"{ts:{TS_FORMAT}}" or old["impact"] != event["impact"]:
+                    changed.append((key, i, ts, old["revision_seq"] + 1, old))
+                else:
+                    result.unchanged += 1
+            proximity = self._proximity([ts for _, _, ts, _, _ in changed], now)
+            rows, moves = [], []
+            for (key, i, ts, seq, old), prox in zip(changed, proximity):
+                event = events[i]
+                cal8 = f"{cal8s[i][:6]}{self.codec.version}{revision_flag(seq)}"
+                if old is not None:
+                    result.revised.append((old["cal8"], cal8))
+                if old is not None and old["event_date"] != key[2]:
+                    moves.append(
+                        (cal8, cal5_of(cal8), event["impact"], key[2], f"{ts:{TS_FORMAT}}",
+                         prox, seq, event.get("quality_score"), old["event_id"])
+                    )
+                    continue
+                rows.append(
+                    (cal8, cal5_of(cal8), key[1], key[0], event["impact"], key[2],
+                     f"{ts:{TS_FORMAT}}", prox, seq, event.get("quality_score"))
+                )
+            conn.executemany(self.MOVE, moves)
+            conn.executemany(self.UPSERT, rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    @staticmethod
+    def _rescheduled(
+        candidates: Optional[List[sqlite3.Row]], ts: datetime
+    ) -> Optional[sqlite3.Row]:
+        """Claim the closest candidate row within the reschedule window of ``ts``."""
+        if not candidates:
+            return None
+        row = min(candidates, key=lambda r: abs(parse_utc(r["event_time_utc"]) - ts))
+        distance = abs(parse_utc(row["event_time_utc"]) - ts)
+        if distance > RESCHEDULE_WINDOW:
+            return None
+        candidates.remove(row)
+        return row
+
+    def bump_revisions(self, keys: Iterable[Key]) -> int:
+        """Record an official revision of each ``(ccy, title, event_date)``."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                f"""UPDATE calendar_events SET
+                        revision_seq = revision_seq + 1,
+                        cal8 = substr(cal8, 1, 7) || min(revision_seq + 1, {MAX_REVISION_FLAG})
+                    WHERE ccy = ? AND title = ? AND event_date = ?""",
+                list(keys),
+            )
+            changed = conn.total_changes - before
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return changed
+
+    def refresh_proximity(self, now: datetime | None = None) -> int:
+        """Recompute proximity of upcoming and bucketed events; returns rows updated."""
+        now = now or _utcnow()
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT event_id, event_time_utc, proximity FROM calendar_events "
+                "WHERE event_time_utc >= ? OR proximity IS NOT NULL",
+                (f"{now:{TS_FORMAT}}",),
+            ).fetchall()
+            labels = self._proximity([parse_utc(r["event_time_utc"]) for r in rows], now)
+            updates = [
+                (label, r["event_id"]) for r, label in zip(rows, labels) if label != r["proximity"]
+            ]
+            conn.executemany("UPDATE calendar_events SET proximity = ? WHERE event_id = ?", updates)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(updates)
+
+    def events(self, ccy: str | None = None) -> List[Dict[str, Any]]:
+        sql = "SELECT * FROM calendar_events"
+        params: Tuple[Any, ...] = ()
+        if ccy:
+            sql += " WHERE ccy = ?"
+            params = (ccy,)
+        return [dict(r) for r in self.conn.execute(sql + " ORDER BY event_time_utc, event_id", params)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calendar events database")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="SQLite database")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Import normalized events (JSONL)")
+    imp.add_argument("path", type=Path)
+    sub.add_parser("refresh", help="Recompute proximity buckets")
+    args = parser.parse_args()
+
+    with CalendarStore(args.db) as store:
+        if args.command == "import":
+            with open(args.path, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f if line.strip()]
+            result = store.import_events(events)
+            for row, message in result.errors:
+                print(f"event {row + 1}: {message}")
+            for old, new in result.revised:
+                print(f"revised {old} -> {new}")
+            print(
+                f"Imported {result.inserted} new, {len(result.revised)} revised, "
+                f"{result.unchanged} unchanged, {len(result.errors)} rejected"
+            )
+        else:
+            print(f"Updated proximity of {store.refresh_proximity()} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,12 @@ Usage::
     python change_request_manager.py add TITLE [--description DESC] [--branch BR]
     python change_request_manager.py impact ID "impact description"
     python change_request_manager.py start-review ID reviewer1 reviewer2
-    python change_request_manager.py list [--status STATE]
+    python change_request_manager.py list [--status STATE] [--branch BR] [--reviewer NAME]
     python change_request_manager.py resolve ID
+    python change_request_manager.py compact
+    python change_request_manager.py apply ops.jsonl
+    python change_request_manager.py --db registry.db import config/change_requests.json
+    python change_request_manager.py --db registry.db export out.json
 
 Stored change request format::
 
@@ -23,32 +27,50 @@ Stored change request format::
       status: "in_review"
       reviewers: ["alice", "bob"]
 
-The storage file uses JSON for portability.
+The storage file uses JSON for portability. Mutations are appended to a
+JSON Lines journal next to it (``change_requests.json.journal``) and folded
+back into the JSON file periodically or with ``compact``. Every command runs
+as one locked transaction, so concurrent invocations never lose writes or
+reuse ids; ``apply`` runs a whole batch of operations in one transaction.
+Pass ``--db`` with a ``.db`` path to use the SQLite backend instead; see
+``change_request_store.py``.
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
-import json
+import change_request_store
+from change_request_store import JsonStore, SqliteStore
 
 DEFAULT_DB = Path(__file__).resolve().parents[1] / "config" / "change_requests.json"
 
 
+def open_store(db_path: Path = DEFAULT_DB) -> JsonStore | SqliteStore:
+    """Open the indexed store behind ``db_path`` (SQLite for ``.db`` paths)."""
+    return change_request_store.open_store(db_path)
+
+
 def load_requests(db_path: Path = DEFAULT_DB) -> List[Dict[str, Any]]:
     """Load change requests from disk."""
-    if db_path.exists():
-        data = json.loads(db_path.read_text())
-        if isinstance(data, list):
-            return data
-    return []
+    with open_store(db_path) as store:
+        return store.all()
 
 
 def save_requests(requests: List[Dict[str, Any]], db_path: Path = DEFAULT_DB) -> None:
     """Persist change requests to disk."""
-    db_path.write_text(json.dumps(requests, indent=2, sort_keys=True))
+    with open_store(db_path) as store:
+        store.replace_all(requests)
+
+
+def get_request(req_id: int, db_path: Path = DEFAULT_DB) -> Dict[str, Any] | None:
+    """Return a single request by id."""
+    with open_store(db_path) as store:
+        return store.get(req_id)
 
 
 def add_request(
@@ -58,10 +80,15 @@ def add_request(
     db_path: Path = DEFAULT_DB,
 ) -> Dict[str, Any]:
     """Add a new change request."""
-    requests = load_requests(db_path)
-    next_id = 1 + max((r["id"] for r in requests), default=0)
+    with open_store(db_path) as store, store.transaction():
+        return _add(store, title, description, branch)
+
+
+def _add(
+    store: JsonStore | SqliteStore, title: str, description: str, branch: str | None
+) -> Dict[str, Any]:
     request = {
-        "id": next_id,
+        "id": store.next_id,
         "title": title,
         "description": description,
         "branch": branch,
@@ -69,55 +96,133 @@ def add_request(
         "status": "open",
         "reviewers": [],
     }
-    requests.append(request)
-    save_requests(requests, db_path)
+    store.add(request)
     return request
 
 
-def list_requests(status: str | None = None, db_path: Path = DEFAULT_DB) -> List[Dict[str, Any]]:
-    """Return requests filtered by optional status."""
-    requests = load_requests(db_path)
+def list_requests(
+    status: str | None = None,
+    db_path: Path = DEFAULT_DB,
+    branch: str | None = None,
+    reviewer: str | None = None,
+) -> List[Dict[str, Any]]:
+    """Return requests filtered by optional status, branch and reviewer."""
+    with open_store(db_path) as store:
+        if branch is not None:
+            requests = store.with_branch(branch)
+        elif reviewer is not None:
+            requests = store.for_reviewer(reviewer)
+        elif status:
+            requests = store.with_status(status)
+        else:
+            requests = store.all()
+    # The index above narrowed by one criterion; apply the remaining ones.
     if status:
         requests = [r for r in requests if r["status"] == status]
+    if branch is not None and reviewer is not None:
+        requests = [r for r in requests if reviewer in r["reviewers"]]
     return requests
 
 
+def find_by_branch(branch: str, db_path: Path = DEFAULT_DB) -> List[Dict[str, Any]]:
+    """Return the requests tracked on ``branch``."""
+    return list_requests(branch=branch, db_path=db_path)
+
+
+def requests_for_reviewer(reviewer: str, db_path: Path = DEFAULT_DB) -> List[Dict[str, Any]]:
+    """Return every request ``reviewer`` is assigned to."""
+    return list_requests(reviewer=reviewer, db_path=db_path)
+
+
 def set_impact(req_id: int, impact: str, db_path: Path = DEFAULT_DB) -> bool:
     """Attach impact analysis to a request."""
-    requests = load_requests(db_path)
-    for r in requests:
-        if r["id"] == req_id:
-            r["impact"] = impact
-            save_requests(requests, db_path)
-            return True
-    return False
+    with open_store(db_path) as store:
+        return store.update(req_id, impact=impact)
 
 
 def start_review(req_id: int, reviewers: Iterable[str], db_path: Path = DEFAULT_DB) -> bool:
     """Move request to ``in_review`` with specified reviewers."""
-    requests = load_requests(db_path)
-    for r in requests:
-        if r["id"] == req_id:
-            r["status"] = "in_review"
-            r["reviewers"] = list(reviewers)
-            save_requests(requests, db_path)
-            return True
-    return False
+    with open_store(db_path) as store:
+        return store.update(req_id, status="in_review", reviewers=list(reviewers))
 
 
 def resolve_request(req_id: int, db_path: Path = DEFAULT_DB) -> bool:
     """Mark a request as resolved."""
-    requests = load_requests(db_path)
-    for r in requests:
-        if r["id"] == req_id:
-            r["status"] = "resolved"
-            save_requests(requests, db_path)
-            return True
-    return False
+    with open_store(db_path) as store:
+        return store.update(req_id, status="resolved")
+
+
+def apply_operations(
+    operations: Iterable[Dict[str, Any]], db_path: Path = DEFAULT_DB
+) -> List[Dict[str, Any] | bool]:
+    """Apply many operations in a single locked transaction.
+
+    Each operation is a dict with an ``op`` key and the arguments of the
+    matching CLI command, e.g. ``{"op": "add", "title": "...", "branch": "x"}``,
+    ``{"op": "impact", "id": 3, "impact": "..."}``,
+    ``{"op": "start-review", "id": 3, "reviewers": ["alice"]}`` or
+    ``{"op": "resolve", "id": 3}``. Returns the added record or the success
+    flag of each operation. If any operation is invalid nothing is applied.
+    """
+    results: List[Dict[str, Any] | bool] = []
+    with open_store(db_path) as store, store.transaction():
+        for n, op in enumerate(operations, 1):
+            kind = op.get("op")
+            if kind == "add":
+                results.append(
+                    _add(store, op["title"], op.get("description", ""), op.get("branch"))
+                )
+            elif kind == "impact":
+                results.append(store.update(op["id"], impact=op["impact"]))
+            elif kind == "start-review":
+                results.append(
+                    store.update(op["id"], status="in_review", reviewers=list(op["reviewers"]))
+                )
+            elif kind == "resolve":
+                results.append(store.update(op["id"], status="resolved"))
+            else:
+                raise ValueError(f"Operation {n}: unknown op {kind!r}")
+    return results
+
+
+def read_operations(path: Path) -> Iterable[Dict[str, Any]]:
+    """Yield operations from a JSON Lines file (``-`` reads stdin)."""
+    f = sys.stdin if str(path) == "-" else open(path)
+    try:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def compact(db_path: Path = DEFAULT_DB) -> None:
+    """Fold the mutation journal into the JSON snapshot."""
+    with open_store(db_path) as store:
+        store.compact()
+
+
+def export_requests(json_path: Path, db_path: Path = DEFAULT_DB) -> int:
+    """Export the registry at ``db_path`` to a JSON registry file."""
+    with open_store(db_path) as store:
+        return change_request_store.export_json(store, json_path)
+
+
+def import_requests(json_path: Path, db_path: Path = DEFAULT_DB) -> int:
+    """Replace the registry at ``db_path`` with a JSON registry file."""
+    with open_store(db_path) as store:
+        return change_request_store.import_json(json_path, store)
 
 
 def _cli() -> None:
     parser = argparse.ArgumentParser(description="Change request manager")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DEFAULT_DB,
+        help="Registry path; .db/.sqlite/.sqlite3 selects the SQLite backend",
+    )
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     add_p = sub.add_parser("add", help="Add a new change request")
@@ -129,6 +234,8 @@ def _cli() -> None:
     list_p.add_argument(
         "--status", choices=["open", "in_review", "resolved"], default=None
     )
+    list_p.add_argument("--branch", default=None)
+    list_p.add_argument("--reviewer", default=None)
 
     impact_p = sub.add_parser("impact", help="Attach impact analysis to a request")
     impact_p.add_argument("id", type=int)
@@ -143,30 +250,54 @@ def _cli() -> None:
     res_p = sub.add_parser("resolve", help="Mark a change request as resolved")
     res_p.add_argument("id", type=int)
 
+    sub.add_parser("compact", help="Fold the journal into the registry")
+
+    apply_p = sub.add_parser("apply", help="Apply a JSON Lines file of operations")
+    apply_p.add_argument("ops", type=Path, help="Operations file, or - for stdin")
+
+    export_p = sub.add_parser("export", help="Write the registry to a JSON file")
+    export_p.add_argument("json_path", type=Path)
+
+    import_p = sub.add_parser("import", help="Replace the registry with a JSON file")
+    import_p.add_argument("json_path", type=Path)
+
     args = parser.parse_args()
 
     if args.cmd == "add":
-        req = add_request(args.title, args.description, args.branch)
+        req = add_request(args.title, args.description, args.branch, db_path=args.db)
         print(f"Added change request #{req['id']}")
     elif args.cmd == "list":
-        for r in list_requests(args.status):
+        for r in list_requests(args.status, args.db, args.branch, args.reviewer):
             branch = f" ({r['branch']})" if r.get("branch") else ""
             print(f"[{r['status']}] {r['id']}{branch}: {r['title']}")
     elif args.cmd == "impact":
-        if set_impact(args.id, args.impact):
+        if set_impact(args.id, args.impact, db_path=args.db):
             print(f"Recorded impact for change request #{args.id}")
         else:
             print(f"Change request #{args.id} not found")
     elif args.cmd == "start-review":
-        if start_review(args.id, args.reviewers):
+        if start_review(args.id, args.reviewers, db_path=args.db):
             print(f"Started review for change request #{args.id}")
         else:
             print(f"Change request #{args.id} not found")
     elif args.cmd == "resolve":
-        if resolve_request(args.id):
+        if resolve_request(args.id, db_path=args.db):
             print(f"Resolved change request #{args.id}")
         else:
             print(f"Change request #{args.id} not found")
+    elif args.cmd == "compact":
+        compact(args.db)
+        print("Compacted change request journal")
+    elif args.cmd == "apply":
+        results = apply_operations(read_operations(args.ops), args.db)
+        failed = sum(r is False for r in results)
+        print(f"Applied {len(results)} operations ({failed} referenced unknown requests)")
+    elif args.cmd == "export":
+        count = export_requests(args.json_path, args.db)
+        print(f"Exported {count} change requests to {args.json_path}")
+    elif args.cmd == "import":
+        count = import_requests(args.json_path, args.db)
+        print(f"Imported {count} change requests from {args.json_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,555 @@
+"""Indexed storage backend for the change request registry.
+
+:class:`JsonStore` keeps the registry in two files:
+
+* the snapshot, ``change_requests.json``: the same pretty-printed JSON array
+  the manager has always written, so existing registries load unchanged;
+* the journal, ``change_requests.json.journal``: JSON Lines, one entry per
+  mutation (``{"op": "add", "record": {...}}`` or
+  ``{"op": "update", "id": 3, "fields": {...}}``).
+
+A mutation appends one journal line instead of rewriting the snapshot. Once
+the journal reaches ``compact_threshold`` entries it is folded back into the
+snapshot. Replaying an entry twice has no further effect, so a crash between
+writing the snapshot and truncating the journal loses nothing.
+
+Writers serialize on an exclusive lock on ``change_requests.json.lock``:
+:meth:`JsonStore.transaction` takes the lock, reloads the registry, and
+appends all mutations of the transaction to the journal in one fsynced
+write. Readers take the lock shared. The snapshot is replaced with the
+temp-file + fsync + rename protocol from ``contracts/csv_interface.md``.
+
+Records are held in an ``id -> record`` dict with ``status``, ``branch`` and
+reviewer secondary indexes, so lookups and filtered queries never scan the
+registry.
+
+:class:`SqliteStore` offers the same interface on a local SQLite database
+(selected by a ``.db``/``.sqlite``/``.sqlite3`` path) where those queries are
+indexed SQL lookups. :func:`export_json` and :func:`import_json` move a
+registry between the two formats.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from atomic_io import atomic_write_text, file_lock
+
+COMPACT_THRESHOLD = 500
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+
+def open_store(db_path: Path, **kwargs: Any) -> "JsonStore | SqliteStore":
+    """Open the backend matching the file extension of ``db_path``."""
+    if Path(db_path).suffix in SQLITE_SUFFIXES:
+        return SqliteStore(db_path)
+    return JsonStore(db_path, **kwargs)
+
+
+def journal_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + ".journal")
+
+
+def lock_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + ".lock")
+
+
+class JsonStore:
+    """Change requests loaded from a JSON snapshot plus its journal."""
+
+    def __init__(self, db_path: Path, compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        self.db_path = Path(db_path)
+        self.journal = journal_path(self.db_path)
+        self.compact_threshold = compact_threshold
+        self.records: Dict[int, Dict[str, Any]] = {}
+        self.by_status: Dict[str, Set[int]] = {}
+        self.by_branch: Dict[str, Set[int]] = {}
+        self.by_reviewer: Dict[str, Set[int]] = {}
+        self.journal_entries = 0
+        self.max_id = 0
+        # Journal entries of the open transaction, or None outside one
+        self._pending: List[Dict[str, Any]] | None = None
+        self._journal_offset = 0
+        self._snapshot_sig: Tuple[int, int, int] | None = None
+        self.load()
+
+    def __enter__(self) -> "JsonStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    # -- loading -----------------------------------------------------------
+    def load(self) -> None:
+        """(Re)build the in-memory indexes from the snapshot and journal."""
+        if self._pending is not None:
+            self._load()
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(lock_path(self.db_path), shared=True):
+            self._load()
+
+    def _load(self) -> None:
+        self._clear()
+        self.journal_entries = 0
+        self._journal_offset = 0
+        self._snapshot_sig = _file_signature(self.db_path)
+        if self._snapshot_sig is not None:
+            data = json.loads(self.db_path.read_text() or "[]")
+            if isinstance(data, list):
+                for record in data:
+                    self._put(record)
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        for entry, self._journal_offset in iter_journal(self.journal, self._journal_offset):
+            self._apply(entry)
+            self.journal_entries += 1
+
+    def _refresh(self) -> None:
+        """Catch up with other writers, replaying only new journal entries.
+
+        Falls back to a full reload when the snapshot was rewritten or the
+        journal was truncated by a compaction.
+        """
+        journal_size = self.journal.stat().st_size if self.journal.exists() else 0
+        if _file_signature(self.db_path) != self._snapshot_sig or journal_size < self._journal_offset:
+            self._load()
+        else:
+            self._replay_journal()
+
+    def _clear(self) -> None:
+        self.records.clear()
+        self.by_status.clear()
+        self.by_branch.clear()
+        self.by_reviewer.clear()
+        self.max_id = 0
+
+    def _put(self, record: Dict[str, Any]) -> None:
+        req_id = record["id"]
+        old = self.records.get(req_id)
+        if old is not None:
+            self.by_status.get(old.get("status"), set()).discard(req_id)
+            self.by_branch.get(old.get("branch"), set()).discard(req_id)
+            for reviewer in old.get("reviewers") or ():
+                self.by_reviewer.get(reviewer, set()).discard(req_id)
+        self.records[req_id] = record
+        self.max_id = max(self.max_id, req_id)
+        self.by_status.setdefault(record.get("status"), set()).add(req_id)
+        self.by_branch.setdefault(record.get("branch"), set()).add(req_id)
+        for reviewer in record.get("reviewers") or ():
+            self.by_reviewer.setdefault(reviewer, set()).add(req_id)
+
+    def _apply(self, entry: Dict[str, Any]) -> bool:
+        if entry["op"] == "add":
+            self._put(dict(entry["record"]))
+            return True
+        if entry["op"] == "update":
+            record = self.records.get(entry["id"])
+            if record is None:
+                return False
+            self._put({**record, **entry["fields"]})
+            return True
+        raise ValueError(f"Unknown journal op: {entry['op']!r}")
+
+    # -- queries -----------------------------------------------------------
+    @property
+    def next_id(self) -> int:
+        return 1 + self.max_id
+
+    def get(self, req_id: int) -> Dict[str, Any] | None:
+        return self.records.get(req_id)
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self.records.values())
+
+    def with_status(self, status: str) -> List[Dict[str, Any]]:
+        return self._select(self.by_status.get(status, ()))
+
+    def with_branch(self, branch: str) -> List[Dict[str, Any]]:
+        return self._select(self.by_branch.get(branch, ()))
+
+    def for_reviewer(self, reviewer: str) -> List[Dict[str, Any]]:
+        return self._select(self.by_reviewer.get(reviewer, ()))
+
+    def _select(self, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.records[i] for i in sorted(ids)]
+
+    # -- mutations ---------------------------------------------------------
+    def add(self, record: Dict[str, Any]) -> None:
+        self._commit({"op": "add", "record": record})
+
+    def update(self, req_id: int, **fields: Any) -> bool:
+        with self.transaction():
+            if req_id not in self.records:
+                return False
+            self._commit({"op": "update", "id": req_id, "fields": fields})
+        return True
+
+    def _commit(self, entry: Dict[str, Any]) -> None:
+        if self._pending is None:
+            with self.transaction():
+                self._commit(entry)
+            return
+        self._apply(entry)
+        self._pending.append(entry)
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator["JsonStore"]:
+        """Lock the registry, reload it and commit all mutations atomically.
+
+        Reads inside the block (``next_id``, ``get``) see the latest state, so
+        concurrent writers cannot reuse ids or overwrite each other.
+        """
+        if self._pending is not None:  # nested: join the outer transaction
+            yield self
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(lock_path(self.db_path)):
+            self._pending = []
+            try:
+                self._refresh()
+                yield self
+                if self._pending:
+                    self._append_journal(self._pending)
+            except BaseException:
+                self._pending = None
+                self._load()
+                raise
+            self._pending = None
+            if self.journal_entries >= self.compact_threshold:
+                self._compact()
+
+    def _append_journal(self, entries: List[Dict[str, Any]]) -> None:
+        data = "".join(json.dumps(e, sort_keys=True) + "\n" for e in entries)
+        if self.journal.exists() and self.journal.stat().st_size > self._journal_offset:
+            # Drop a torn line left by an interrupted writer before appending.
+            os.truncate(self.journal, self._journal_offset)
+        with self.journal.open("ab") as f:
+            f.write(data.encode())
+            f.flush()
+            os.fsync(f.fileno())
+            self._journal_offset = f.tell()
+        self.journal_entries += len(entries)
+
+    def replace_all(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Replace the whole registry with ``records`` and compact."""
+        with self.transaction():
+            self._clear()
+            for record in records:
+                self._put(record)
+            self._compact()
+
+    def compact(self) -> None:
+        """Write the current state to the snapshot and empty the journal."""
+        with self.transaction():
+            self._compact()
+
+    def _compact(self) -> None:
+        atomic_write_text(self.db_path, json.dumps(self.all(), indent=2, sort_keys=True))
+        if self.journal.exists():
+            self.journal.unlink()
+        self.journal_entries = 0
+        self._journal_offset = 0
+        self._snapshot_sig = _file_signature(self.db_path)
+
+
+class SqliteStore:
+    """Change requests in a local SQLite database with indexed queries."""
+
+    COLUMNS = ("id", "title", "description", "branch", "impact", "status", "reviewers")
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS change_requests (
+            id          INTEGER PRIMARY KEY,
+            title       TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            branch      TEXT,
+            impact      TEXT NOT NULL DEFAULT '',
+            status      TEXT NOT NULL,
+            reviewers   TEXT NOT NULL DEFAULT '[]',
+            extra       TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_cr_status ON change_requests(status);
+        CREATE INDEX IF NOT EXISTS idx_cr_branch ON change_requests(branch);
+        CREATE TABLE IF NOT EXISTS cr_reviewers (
+            reviewer TEXT NOT NULL,
+            cr_id    INTEGER NOT NULL REFERENCES change_requests(id) ON DELETE CASCADE,
+            PRIMARY KEY (reviewer, cr_id)
+        ) WITHOUT ROWID;
+        -- Rewriting a request's reviewers deletes by cr_id
+        CREATE INDEX IF NOT EXISTS idx_cr_reviewers_cr ON cr_reviewers(cr_id);
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        # Autocommit mode: transactions are opened explicitly in transaction()
+        self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self._depth = 0
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def __enter__(self) -> "SqliteStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # -- row conversion ----------------------------------------------------
+    @classmethod
+    def _to_row(cls, record: Dict[str, Any]) -> tuple:
+        extra = {k: v for k, v in record.items() if k not in cls.COLUMNS}
+        return (
+            record["id"],
+            record.get("title", ""),
+            record.get("description") or "",
+            record.get("branch"),
+            record.get("impact") or "",
+            record.get("status", "open"),
+            json.dumps(list(record.get("reviewers") or [])),
+            json.dumps(extra, sort_keys=True) if extra else None,
+        )
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> Dict[str, Any]:
+        record = {key: row[key] for key in SqliteStore.COLUMNS}
+        record["reviewers"] = json.loads(row["reviewers"])
+        if row["extra"]:
+            record.update(json.loads(row["extra"]))
+        return record
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        return [self._to_record(row) for row in self.conn.execute(sql, params)]
+
+    # -- queries -----------------------------------------------------------
+    @property
+    def next_id(self) -> int:
+        return 1 + self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_requests").fetchone()[0]
+
+    def get(self, req_id: int) -> Dict[str, Any] | None:
+        rows = self._query("SELECT * FROM change_requests WHERE id = ?", (req_id,))
+        return rows[0] if rows else None
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM change_requests ORDER BY id")
+
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        for row in self.conn.execute("SELECT * FROM change_requests ORDER BY id"):
+            yield self._to_record(row)
+
+    def with_status(self, status: str) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM change_requests WHERE status = ? ORDER BY id", (status,))
+
+    def with_branch(self, branch: str) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM change_requests WHERE branch = ? ORDER BY id", (branch,))
+
+    def for_reviewer(self, reviewer: str) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT cr.* FROM cr_reviewers r JOIN change_requests cr ON cr.id = r.cr_id "
+            "WHERE r.reviewer = ? ORDER BY cr.id",
+            (reviewer,),
+        )
+
+    # -- mutations ---------------------------------------------------------
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator["SqliteStore"]:
+        """Run the block in one ``BEGIN IMMEDIATE`` write transaction."""
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+        finally:
+            self._depth = 0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self.transaction():
+            self._insert(record)
+
+    def _insert(self, record: Dict[str, Any]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO change_requests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            self._to_row(record),
+        )
+        self._set_reviewers(record["id"], record.get("reviewers") or [])
+
+    def _set_reviewers(self, req_id: int, reviewers: Iterable[str]) -> None:
+        self.conn.execute("DELETE FROM cr_reviewers WHERE cr_id = ?", (req_id,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO cr_reviewers (reviewer, cr_id) VALUES (?, ?)",
+            [(reviewer, req_id) for reviewer in reviewers],
+        )
+
+    def update(self, req_id: int, **fields: Any) -> bool:
+        with self.transaction():
+            record = self.get(req_id)
+            if record is None:
+                return False
+            self._insert({**record, **fields})
+        return True
+
+    def replace_all(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Replace the whole registry with ``records`` in one transaction."""
+        with self.transaction():
+            self.conn.execute("DELETE FROM cr_reviewers")
+            self.conn.execute("DELETE FROM change_requests")
+            for record in records:
+                self._insert(record)
+
+    def compact(self) -> None:
+        """Checkpoint the write-ahead log into the database file."""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def iter_records(db_path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream the records of any registry format without loading it whole.
+
+    SQLite databases are read through a cursor, ``.jsonl`` files hold one
+    record per line, and JSON snapshots are decoded element by element with
+    their journal applied on the fly. Only the journal, which compaction keeps
+    short, is held in memory.
+    """
+    db_path = Path(db_path)
+    if db_path.suffix in SQLITE_SUFFIXES:
+        with SqliteStore(db_path) as store:
+            yield from store.iter_all()
+        return
+    if db_path.suffix == ".jsonl":
+        with db_path.open() as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    # id -> (True, full record) for journal adds, (False, fields) for updates
+    overlay: Dict[int, Tuple[bool, Dict[str, Any]]] = {}
+    for entry, _ in iter_journal(journal_path(db_path)):
+        if entry["op"] == "add":
+            overlay[entry["record"]["id"]] = (True, dict(entry["record"]))
+        else:
+            overlay.setdefault(entry["id"], (False, {}))[1].update(entry["fields"])
+    if db_path.exists():
+        with db_path.open() as f:
+            for record in iter_json_array(f):
+                if record["id"] in overlay:
+                    is_full, data = overlay.pop(record["id"])
+                    record = data if is_full else {**record, **data}
+                yield record
+    for is_full, data in overlay.values():
+        if is_full:
+            yield data
+
+
+def iter_json_array(f: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array read incrementally from ``f``."""
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    eof = not buf
+    pos = _skip(buf, 0)
+    if pos == len(buf) and eof:
+        return
+    if buf[pos:pos + 1] != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+    expect_value = True
+    while True:
+        pos = _skip(buf, pos)
+        if pos == len(buf):
+            if eof:
+                raise ValueError("unterminated JSON array")
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        ch = buf[pos]
+        if ch == "]":
+            return
+        if ch == "," and not expect_value:
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            value, end = None, None
+        if end is None or (end == len(buf) and not eof):
+            # The element may continue in the next chunk.
+            if eof:
+                raise ValueError(f"malformed JSON array element at offset {pos}")
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield value
+        pos = end
+        expect_value = False
+
+
+def _skip(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def export_json(store: "JsonStore | SqliteStore", json_path: Path) -> int:
+    """Write every record of ``store`` to ``json_path`` in the JSON registry format."""
+    records = store.all()
+    with JsonStore(json_path) as target:
+        target.replace_all(records)
+    return len(records)
+
+
+def import_json(json_path: Path, store: "JsonStore | SqliteStore") -> int:
+    """Replace the contents of ``store`` with the JSON registry at ``json_path``."""
+    with JsonStore(json_path) as source:
+        records = source.all()
+    store.replace_all(records)
+    return len(records)
+
+
+def iter_journal(path: Path, offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """Yield ``(entry, end_offset)`` for journal entries starting at byte ``offset``.
+
+    A torn final line from an interrupted write is ignored.
+    """
+    if not path.exists():
+        return
+    with path.open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                yield json.loads(line), offset
+
+
+def _file_signature(path: Path) -> Tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
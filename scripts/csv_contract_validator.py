@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Validate exchanged CSV files against ``contracts/csv_interface.md``.
+
+Contracts (column sets and per-column types) live in
+``config/csv_contracts.json``; enum columns take their allowed values from
+``schemas/enums.json`` and ``hybrid_id`` columns are checked against the same
+registry by :class:`hybrid_id.HybridIdCodec`. A file's contract is chosen from
+its name, ``{base_name}_{YYYYMMDDTHHMMSSZ}_{sequence:06d}.csv`` or plain
+``{base_name}.csv``.
+
+Files are streamed in chunks of rows. Each chunk is transposed into columns
+and every column is checked in one go: pattern, number and timestamp columns
+are joined and matched with a single regex, enum columns with one set
+difference, and only a failing column is walked value by value to report the
+offending rows. The per-row ``checksum`` (SHA-256 of the row's other fields,
+see the contract) is verified in the same pass, and ``file_seq`` must never
+decrease within a file and must increase strictly from one rotated file to
+the next. Memory use is bounded by the chunk size.
+
+Usage::
+
+    python csv_contract_validator.py PATH [PATH ...] [--jobs N] [--max-errors N] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from hybrid_id import HybridIdCodec
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CONTRACTS = ROOT / "config" / "csv_contracts.json"
+DEFAULT_ENUMS = ROOT / "schemas" / "enums.json"
+CHUNK_ROWS = 8192
+MAX_ERRORS = 100
+
+FILE_NAME_RE = re.compile(r"^(?P<base>.+?)(?:_(?P<ts>\d{8}T\d{6}Z)_(?P<seq>\d{6}))?\.csv$")
+TYPE_PATTERNS = {
+    "int": r"-?\d+",
+    "float": r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?",
+    "timestamp": r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?Z",
+    "sha256": r"[0-9a-f]{64}",
+}
+
+
+def row_checksum(fields: Sequence[str]) -> str:
+    """Contract checksum of a row: SHA-256 of its other fields joined with ``,``."""
+    return hashlib.sha256(",".join(fields).encode("utf-8")).hexdigest()
+
+
+def parse_file_name(path: str | os.PathLike) -> Tuple[str, str, int] | None:
+    """Return ``(base_name, timestamp, sequence)`` for a contract file name."""
+    m = FILE_NAME_RE.match(Path(path).name)
+    if not m:
+        return None
+    return m.group("base"), m.group("ts") or "", int(m.group("seq") or 0)
+
+
+@dataclass
+class ColumnCheck:
+    """Compiled check for one column."""
+
+    name: str
+    kind: str
+    regex: Optional[re.Pattern] = None
+    # Whole-column regex: the per-value pattern repeated across "\n"-joined values
+    column_regex: Optional[re.Pattern] = None
+    allowed: Optional[frozenset] = None
+    # Hybrid ID columns are checked by the same codec as hybrid_id.py
+    codec: Optional[HybridIdCodec] = None
+    max_length: Optional[int] = None
+    optional: bool = False
+
+    def bad_rows(self, values: Sequence[str]) -> List[int]:
+        """Indexes of the values in ``values`` that violate this column's type."""
+        if self.optional:
+            idx = [i for i, v in enumerate(values) if v]
+            present = [values[i] for i in idx]
+        else:
+            idx, present = None, values
+        bad = self._bad(present)
+        return [idx[i] for i in bad] if idx is not None else bad
+
+    def _bad(self, values: Sequence[str]) -> List[int]:
+        if not values:
+            return []
+        bad: List[int] = []
+        if self.allowed is not None:
+            if not set(values) <= self.allowed:
+                bad = [i for i, v in enumerate(values) if v not in self.allowed]
+        elif self.codec is not None:
+            encoded = self.codec.encode_column(values)
+            if encoded.invalid:
+                bad = [i for i, mask in enumerate(encoded.errors) if mask]
+        elif self.column_regex is not None:
+            joined = "\n".join(values)
+            # A value with its own newline would pass as two matching values
+            if joined.count("\n") != len(values) - 1 or not self.column_regex.fullmatch(joined):
+                fullmatch = self.regex.fullmatch
+                bad = [i for i, v in enumerate(values) if "\n" in v or not fullmatch(v)]
+        elif not self.optional:
+            bad = [i for i, v in enumerate(values) if not v]
+        if self.max_length is not None and max(map(len, values)) > self.max_length:
+            bad = sorted(set(bad) | {i for i, v in enumerate(values) if len(v) > self.max_length})
+        return bad
+
+    def describe(self) -> str:
+        if self.allowed is not None:
+            return "a known enum value"
+        if self.codec is not None:
+            return "a valid hybrid ID (schemas/hybrid_id.md)"
+        if self.kind == "pattern":
+            return f"a value matching {self.regex.pattern}"
+        return f"a valid {self.kind}"
+
+
+def compile_pattern(pattern: str) -> Tuple[re.Pattern, re.Pattern]:
+    """Per-value regex and the whole-column regex used by :class:`ColumnCheck`."""
+    return re.compile(pattern), re.compile(f"(?:{pattern})(?:\n(?:{pattern}))*")
+
+
+@dataclass
+class Contract:
+    name: str
+    columns: Dict[str, ColumnCheck]
+    checksum_column: str
+    checksum_aliases: Tuple[str, ...] = ()
+
+
+@dataclass
+class CsvReport:
+    path: str
+    contract: str = ""
+    rows: int = 0
+    first_seq: Optional[int] = None
+    last_seq: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def load_contracts(
+    contracts_path: Path = DEFAULT_CONTRACTS, enums_path: Path = DEFAULT_ENUMS
+) -> Dict[str, Contract]:
+    """Compile the contract definitions, resolving enum columns from the registry."""
+    config = json.loads(Path(contracts_path).read_text())
+    enums = json.loads(Path(enums_path).read_text())
+    checksum_column = config.get("checksum_column", "checksum")
+    aliases = tuple(config.get("checksum_aliases", ()))
+    contracts = {}
+    hybrid_codec = None
+    for name, spec in config["contracts"].items():
+        columns = {}
+        for col, rule in spec["columns"].items():
+            kind = rule["type"]
+            check = ColumnCheck(
+                col, kind, max_length=rule.get("max_length"), optional=rule.get("optional", False)
+            )
+            if kind == "enum":
+                check.allowed = frozenset(item["name"] for item in enums[rule["enum"]])
+            elif kind == "hybrid_id":
+                if hybrid_codec is None:
+                    hybrid_codec = HybridIdCodec.from_enums(enums_path)
+                check.codec = hybrid_codec
+            elif kind in TYPE_PATTERNS or kind == "pattern":
+                pattern = rule["pattern"] if kind == "pattern" else TYPE_PATTERNS[kind]
+                check.regex, check.column_regex = compile_pattern(pattern)
+            elif kind != "text":
+                raise ValueError(f"{contracts_path}: {name}.{col}: unknown type {kind!r}")
+            columns[col] = check
+        contracts[name] = Contract(name, columns, checksum_column, aliases)
+    return contracts
+
+
+def validate_file(
+    path: str,
+    contracts: Dict[str, Contract],
+    contract_name: str | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+    max_errors: int = MAX_ERRORS,
+) -> CsvReport:
+    """Stream ``path`` and check it against its contract."""
+    report = CsvReport(str(path))
+
+    def error(message: str) -> bool:
+        """Record an error; False once ``max_errors`` is reached."""
+        if len(report.errors) >= max_errors:
+            report.truncated = True
+            return False
+        report.errors.append(message)
+        return True
+
+    parsed = parse_file_name(path)
+    name = contract_name or (parsed[0] if parsed else "")
+    contract = contracts.get(name)
+    if contract is None:
+        error(f"no contract for file name {Path(path).name!r}")
+        return report
+    report.contract = name
+
+    try:
+        f = open(path, "r", encoding="utf-8", newline="")
+    except OSError as exc:
+        error(f"cannot read file: {exc}")
+        return report
+    with f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            error("empty file: missing header")
+            return report
+        header = [contract.checksum_column if h in contract.checksum_aliases else h for h in header]
+        expected = set(contract.columns)
+        missing = [c for c in contract.columns if c not in header]
+        extra = [c for c in header if c not in expected]
+        if len(set(header)) != len(header):
+            error("duplicate column names in header")
+        if missing:
+            error(f"missing columns: {', '.join(missing)}")
+        if extra:
+            error(f"unexpected columns: {', '.join(extra)}")
+        if missing or len(set(header)) != len(header):
+            return report
+
+        width = len(header)
+        positions = [(header.index(c), check) for c, check in contract.columns.items()]
+        sum_at = header.index(contract.checksum_column)
+        seq_at = header.index("file_seq") if "file_seq" in header else None
+        others = itemgetter(*[i for i in range(width) if i != sum_at])
+        sha256 = hashlib.sha256
+        line = 1
+        while True:
+            chunk = list(islice(reader, chunk_rows))
+            if not chunk:
+                break
+            first_line = line + 1
+            line += len(chunk)
+            if set(map(len, chunk)) != {width}:
+                for i, row in enumerate(chunk):
+                    if len(row) != width and not error(
+                        f"line {first_line + i}: expected {width} fields, got {len(row)}"
+                    ):
+                        return report
+                lines = [first_line + i for i, row in enumerate(chunk) if len(row) == width]
+                chunk = [row for row in chunk if len(row) == width]
+                if not chunk:
+                    continue
+            else:
+                lines = None
+            report.rows += len(chunk)
+            columns = list(zip(*chunk))
+
+            for pos, check in positions:
+                for i in check.bad_rows(columns[pos]):
+                    n = lines[i] if lines else first_line + i
+                    if not error(
+                        f"line {n}: {check.name}={columns[pos][i]!r} is not {check.describe()}"
+                    ):
+                        return report
+
+            # Checksums: one hash per row over the other fields, in file order.
+            digests = [sha256(",".join(others(row)).encode()).hexdigest() for row in chunk]
+            if digests != list(columns[sum_at]):
+                for i, (digest, expected) in enumerate(zip(digests, columns[sum_at])):
+                    if digest != expected:
+                        n = lines[i] if lines else first_line + i
+                        if not error(f"line {n}: checksum mismatch"):
+                            return report
+
+            if seq_at is not None:
+                seqs = columns[seq_at]
+                try:
+                    values = list(map(int, seqs))
+                except ValueError:
+                    # Bad values were already reported by the column check
+                    values = [int(v) if v.lstrip("-").isdigit() else None for v in seqs]
+                for i, value in enumerate(values):
+                    if value is None:
+                        continue
+                    if report.last_seq is not None and value < report.last_seq:
+                        n = lines[i] if lines else first_line + i
+                        if not error(f"line {n}: file_seq {value} decreases from {report.last_seq}"):
+                            return report
+                    if report.first_seq is None:
+                        report.first_seq = value
+                    report.last_seq = value
+    return report
+
+
+def collect_files(paths: Iterable[str]) -> List[str]:
+    """Expand directories into their ``*.csv`` files; keep explicit files as given."""
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(str(p) for p in Path(path).glob("*.csv")))
+        else:
+            files.append(path)
+    return files
+
+
+def check_sequence(reports: Sequence[CsvReport]) -> List[str]:
+    """Check that ``file_seq`` increases strictly across rotated files of each base name."""
+    errors = []
+    by_base: Dict[Tuple[str, str], List[Tuple[Tuple[str, int], CsvReport]]] = {}
+    for report in reports:
+        parsed = parse_file_name(report.path)
+        if parsed is None or report.first_seq is None:
+            continue
+        key = (str(Path(report.path).parent), report.contract)
+        by_base.setdefault(key, []).append(((parsed[1], parsed[2]), report))
+    for files in by_base.values():
+        files.sort(key=lambda item: item[0])
+        for (_, prev), (_, cur) in zip(files, files[1:]):
+            if cur.first_seq <= prev.last_seq:
+                errors.append(
+                    f"{cur.path}: file_seq {cur.first_seq} does not follow "
+                    f"{prev.last_seq} in {Path(prev.path).name}"
+                )
+    return errors
+
+
+def validate_paths(
+    paths: Sequence[str],
+    contracts: Dict[str, Contract],
+    jobs: int | None = None,
+    contract_name: str | None = None,
+    max_errors: int = MAX_ERRORS,
+) -> Tuple[List[CsvReport], List[str]]:
+    """Validate every file (in a process pool) plus cross-file ``file_seq`` order."""
+    files = collect_files(paths)
+    func = partial(
+        validate_file, contracts=contracts, contract_name=contract_name, max_errors=max_errors
+    )
+    if jobs == 1 or len(files) <= 1:
+        reports = [func(p) for p in files]
+    else:
+        workers = min(jobs or os.cpu_count() or 1, len(files))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(func, files))
+    return reports, check_sequence(reports)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate CSV files against their contracts")
+    parser.add_argument("paths", nargs="+", help="CSV files or directories of rotated files")
+    parser.add_argument("--contracts", type=Path, default=DEFAULT_CONTRACTS, help="Contract config")
+    parser.add_argument("--enums", type=Path, default=DEFAULT_ENUMS, help="Enum registry")
+    parser.add_argument("--contract", help="Use this contract for every file")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument(
+        "--max-errors", type=int, default=MAX_ERRORS, help="Errors reported per file"
+    )
+    parser.add_argument("--json", action="store_true", help="Emit a JSON report")
+    args = parser.parse_args()
+
+    contracts = load_contracts(args.contracts, args.enums)
+    reports, sequence_errors = validate_paths(
+        args.paths, contracts, args.jobs, args.contract, args.max_errors
+    )
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "files": [
+                        {"path": r.path, "contract": r.contract, "rows": r.rows, "errors": r.errors}
+                        for r in reports
+                    ],
+                    "sequence_errors": sequence_errors,
+                },
+                indent=2,
+            )
+        )
+    else:
+        for r in reports:
+            status = "OK" if r.ok else f"FAIL ({len(r.errors)}{'+' if r.truncated else ''} errors)"
+            print(f"{r.path}: {status}, {r.rows} rows")
+            for e in r.errors:
+                print(f"  {e}")
+        for e in sequence_errors:
+            print(e)
+        failed = sum(not r.ok for r in reports)
+        print(f"Validated {len(reports)} files, {failed} failed")
+    if sequence_errors or any(not r.ok for r in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
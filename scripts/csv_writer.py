@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Write contract CSV files following ``contracts/csv_interface.md``.
+
+:class:`CsvWriter` takes rows (sequences in column order, or mappings) or
+column batches and writes ``{base_name}_{YYYYMMDDTHHMMSSZ}_{sequence:06d}.csv``
+files through :func:`atomic_io.atomic_open`: each file is written to a
+``.tmp`` sibling, fsynced and renamed into place when it is complete.
+
+The writer fills in the common columns itself: ``file_seq`` (monotonic across
+files and runs), ``created_at_utc`` (when the file was opened) and the per-row
+``checksum``. Rows are formatted in batches, serialized with one
+``csv.writer.writerows`` call per batch and written in a single ``write`` to a
+large buffer; the file's SHA-256 is updated from the same bytes, so nothing is
+read back. Files rotate after ``max_rows`` rows or before exceeding
+``max_bytes``.
+
+The last ``file_seq`` and file sequence number are kept in
+``.{base_name}.state.json`` in the output directory; a writer holds
+``.{base_name}.lock`` while open, so two producers cannot interleave numbers.
+
+Usage::
+
+    python csv_writer.py BASE_NAME INPUT.{csv,jsonl} [--dir DIR] [--max-rows N] [--max-bytes N]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from atomic_io import atomic_open, atomic_write_text, file_lock
+from csv_contract_validator import DEFAULT_CONTRACTS
+
+MANAGED_COLUMNS = ("file_seq", "created_at_utc", "checksum")
+BATCH_ROWS = 4096
+BUFFER_SIZE = 1 << 20
+
+
+@dataclass
+class WrittenFile:
+    path: Path
+    rows: int
+    first_seq: Optional[int]
+    last_seq: Optional[int]
+    bytes: int
+    sha256: str
+
+
+def contract_columns(base_name: str, contracts_path: Path = DEFAULT_CONTRACTS) -> List[str]:
+    """Producer columns of ``base_name``'s contract, without the managed ones."""
+    config = json.loads(Path(contracts_path).read_text())
+    try:
+        columns = config["contracts"][base_name]["columns"]
+    except KeyError:
+        raise ValueError(f"{contracts_path}: no contract for {base_name!r}") from None
+    return [c for c in columns if c not in MANAGED_COLUMNS]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CsvWriter:
+    """Buffered, rotating writer for one contract file series."""
+
+    def __init__(
+        self,
+        directory: Path | str,
+        base_name: str,
+        columns: Sequence[str] | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        buffer_size: int = BUFFER_SIZE,
+        batch_rows: int = BATCH_ROWS,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self.directory = Path(directory)
+        self.base_name = base_name
+        self.columns = list(columns) if columns is not None else contract_columns(base_name)
+        self.header = self.columns + list(MANAGED_COLUMNS)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.batch_rows = batch_rows
+        self.clock = clock
+        self.written: List[WrittenFile] = []
+        self.state_path = self.directory / f".{base_name}.state.json"
+        self._lock = contextlib.ExitStack()
+        self._file: contextlib.ExitStack | None = None
+        self._out = None
+        self._opened = False
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def open(self) -> "CsvWriter":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock.enter_context(file_lock(self.directory / f".{self.base_name}.lock"))
+        try:
+            state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            state = {}
+        self.file_seq = state.get("file_seq", 0)
+        self.sequence = state.get("sequence", 0)
+        self._opened = True
+        return self
+
+    def close(self) -> List[WrittenFile]:
+        """Finish the current file and release the lock."""
+        try:
+            self._finish()
+        finally:
+            self._lock.close()
+            self._opened = False
+        return self.written
+
+    def abort(self) -> None:
+        """Discard the file being written; finished files stay."""
+        if self._file is not None:
+            err = RuntimeError("CsvWriter aborted")
+            with contextlib.suppress(RuntimeError):
+                self._file.__exit__(RuntimeError, err, None)
+            self._file = self._out = None
+        self._lock.close()
+        self._opened = False
+
+    def __enter__(self) -> "CsvWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _start(self) -> None:
+        now = self.clock().astimezone(timezone.utc)
+        self.sequence += 1
+        name = f"{self.base_name}_{now:%Y%m%dT%H%M%SZ}_{self.sequence:06d}.csv"
+        self._path = self.directory / name
+        self._created = f"{now:%Y-%m-%dT%H:%M:%SZ}"
+        self._file = contextlib.ExitStack()
+        self._out = self._file.enter_context(
+            atomic_open(self._path, "wb", buffering=self.buffer_size)
+        )
+        self._digest = hashlib.sha256()
+        self._rows = self._bytes = 0
+        self._first_seq = None
+        self._emit(self._serialize([self.header]))
+
+    def _finish(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self.written.append(
+            WrittenFile(
+                self._path,
+                self._rows,
+                self._first_seq,
+                self.file_seq if self._rows else None,
+                self._bytes,
+                self._digest.hexdigest(),
+            )
+        )
+        self._file = self._out = None
+        atomic_write_text(
+            self.state_path, json.dumps({"file_seq": self.file_seq, "sequence": self.sequence})
+        )
+
+    def rotate(self) -> None:
+        """Finish the current file; the next row starts a new one."""
+        self._finish()
+
+    # -- writing -------------------------------------------------------------
+
+    def write_rows(self, rows: Iterable[Sequence[Any] | Mapping[str, Any]]) -> int:
+        """Write ``rows`` (producer columns only); returns the number written."""
+        if not self._opened:
+            raise RuntimeError("CsvWriter is not open")
+        it = iter(rows)
+        total = 0
+        while True:
+            batch = list(islice(it, self.batch_rows))
+            if not batch:
+                return total
+            if isinstance(batch[0], Mapping):
+                if len(self.columns) > 1:
+                    batch = list(map(itemgetter(*self.columns), batch))
+                else:
+                    batch = [(row[self.columns[0]],) for row in batch]
+            total += len(batch)
+            while batch:
+                batch = self._write_batch(batch)
+
+    def write_columns(self, batch: Mapping[str, Sequence[Any]]) -> int:
+        """Write a column batch: ``{column: values}`` with equal-length values."""
+        return self.write_rows(zip(*[batch[c] for c in self.columns]))
+
+    def _write_batch(self, batch: List[Sequence[Any]]) -> List[Sequence[Any]]:
+        """Write as much of ``batch`` as fits the current file; return the rest."""
+        if self._file is None:
+            self._start()
+        if self.max_rows:
+            room = self.max_rows - self._rows
+            if room <= 0:
+                self._finish()
+                return batch
+            batch, rest = batch[:room], batch[room:]
+        else:
+            rest = []
+        rows = self._format(batch, self.file_seq)
+        data = self._serialize(rows)
+        if self.max_bytes and self._bytes + len(data) > self.max_bytes:
+            # Find how many rows still fit; at least one so a file is never empty.
+            fit, size = 0, self._bytes
+            for row in rows:
+                size += len(self._serialize([row]))
+                if size > self.max_bytes:
+                    break
+                fit += 1
+            if fit == 0 and self._rows == 0:
+                fit = 1
+            if fit < len(rows):
+                if fit:
+                    self._commit(self._serialize(rows[:fit]), fit)
+                self._finish()
+                return batch[fit:] + rest
+        self._commit(data, len(rows))
+        if self.max_rows and self._rows >= self.max_rows:
+            self._finish()
+        return rest
+
+    def _format(self, batch: List[Sequence[Any]], seq: int) -> List[List[str]]:
+        created = self._created
+        sha256 = hashlib.sha256
+        rows = []
+        for values in batch:
+            seq += 1
+            fields = [v if type(v) is str else "" if v is None else str(v) for v in values]
+            fields.append(str(seq))
+            fields.append(created)
+            fields.append(sha256(",".join(fields).encode("utf-8")).hexdigest())
+            rows.append(fields)
+        return rows
+
+    @staticmethod
+    def _serialize(rows: List[List[str]]) -> bytes:
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        return buf.getvalue().encode("utf-8")
+
+    def _commit(self, data: bytes, count: int) -> None:
+        if self._first_seq is None:
+            self._first_seq = self.file_seq + 1
+        self.file_seq += count
+        self._rows += count
+        self._emit(data)
+
+    def _emit(self, data: bytes) -> None:
+        self._out.write(data)
+        self._digest.update(data)
+        self._bytes += len(data)
+
+
+def _read_input(path: Path) -> Iterable[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write contract CSV files from producer rows")
+    parser.add_argument("base_name", help="Contract base name, e.g. active_calendar_signals")
+    parser.add_argument("input", type=Path, help="Producer rows as CSV or JSONL")
+    parser.add_argument("--dir", type=Path, default=Path("."), help="Output directory")
+    parser.add_argument("--max-rows", type=int, help="Rotate after this many rows")
+    parser.add_argument("--max-bytes", type=int, help="Rotate before a file exceeds this size")
+    args = parser.parse_args()
+
+    try:
+        writer = CsvWriter(args.dir, args.base_name, max_rows=args.max_rows, max_bytes=args.max_bytes)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    with writer:
+        writer.write_rows(_read_input(args.input))
+    for written in writer.written:
+        print(f"{written.path}: {written.rows} rows, file_seq {written.first_seq}-{written.last_seq}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,32 +3,283 @@
 This utility performs simple variable substitution using ``string.Template``.
 Templates use ``$VARIABLE`` placeholders.
 
+Besides rendering a single document, one run can render a whole dataset: a
+JSON Lines or CSV file (or a JSON array) yields one document per record, and
+the output path is a ``str.format`` pattern filled from the record, e.g.
+``out/{SYMBOL}.md`` (``{_index}`` is the record number). A manifest lists
+many ``template``/``data``/``output`` triples, one JSON object per line, with
+paths relative to the manifest. Compiled templates are cached per process and
+records are rendered in chunks across a process pool, so the dataset is never
+held in memory at once.
+
+Outputs are tracked in a build manifest (see ``build_manifest.py``): a
+document whose template and data hashes are unchanged is not rewritten, and
+changed documents are replaced atomically. ``--force`` renders everything
+but still records the outputs, so the next run skips them again.
+
 Usage:
     python generate_docs.py template_path data_json output_path
+    python generate_docs.py template_path --dataset rows.jsonl --output 'out/{SYMBOL}.md' [--jobs N]
+    python generate_docs.py --manifest manifest.jsonl [--jobs N]
+
+    Any form also accepts ``--build-manifest PATH`` and ``--force``.
 """
 from __future__ import annotations
 
 import argparse
+import csv
 import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from string import Template
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from atomic_io import atomic_write_text
+from build_manifest import DEFAULT_BUILD_MANIFEST, BuildManifest, file_sha256, sha256_text
+
+# Records handed to a worker at a time; large enough to amortise pickling.
+CHUNK_SIZE = 500
+
+# (template path, data path, output pattern)
+RenderJob = Tuple[Path, Path, str]
+
+
+@lru_cache(maxsize=256)
+def _compile(path: str, mtime_ns: int) -> Tuple[Template, str]:
+    text = Path(path).read_text()
+    return Template(text), sha256_text(text)
+
+
+def _compiled(template_path: Path) -> Tuple[Template, str]:
+    template_path = Path(template_path)
+    return _compile(str(template_path.resolve()), template_path.stat().st_mtime_ns)
+
+
+def load_template(template_path: Path) -> Template:
+    """Return the compiled template, re-reading it only when the file changed."""
+    return _compiled(template_path)[0]
+
+
+@lru_cache(maxsize=8)
+def _open_manifest(path: str, mtime_ns: int) -> BuildManifest:
+    return BuildManifest(path)
+
+
+def _worker_manifest(path: str) -> BuildManifest:
+    """Per-process read-only view of the manifest; changes go back to the parent."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    manifest = _open_manifest(path, mtime_ns)
+    manifest.changes = {}
+    return manifest
+
+
+def render_template(
+    template_path: Path,
+    data_path: Path,
+    output_path: Path,
+    manifest: BuildManifest | None = None,
+    force: bool = False,
+) -> bool:
+    """Render one document; returns False when ``manifest`` shows it is current.
+
+    ``force`` renders even a current document (it is still recorded).
+    """
+    template, template_hash = _compiled(template_path)
+    inputs = {"template": template_hash, "data": file_sha256(data_path)}
+    if manifest is not None and not force and manifest.up_to_date(output_path, inputs):
+        return False
+    result = template.safe_substitute(json.loads(data_path.read_text()))
+    if manifest is None:
+        atomic_write_text(output_path, result)
+        return True
+    return manifest.write(output_path, result, inputs)
 
 
-def render_template(template_path: Path, data_path: Path, output_path: Path) -> None:
-    template_text = template_path.read_text()
-    data = json.loads(data_path.read_text())
-    result = Template(template_text).safe_substitute(data)
-    output_path.write_text(result)
+def record_digest(record: Dict[str, Any]) -> str:
+    return sha256_text(json.dumps(record, sort_keys=True, default=str))
+
+
+def iter_dataset(data_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a ``.jsonl``, ``.csv`` or JSON data file."""
+    data_path = Path(data_path)
+    if data_path.suffix == ".jsonl":
+        with data_path.open() as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif data_path.suffix == ".csv":
+        with data_path.open(newline="") as f:
+            yield from csv.DictReader(f)
+    else:
+        data = json.loads(data_path.read_text())
+        if isinstance(data, list):
+            yield from data
+        else:
+            yield data
+
+
+def output_path_for(pattern: str, record: Dict[str, Any], index: int) -> Path:
+    try:
+        return Path(pattern.format_map({**record, "_index": index}))
+    except (KeyError, IndexError) as exc:
+        raise ValueError(f"output pattern {pattern!r} needs field {exc} missing from record {index}")
+
+
+def render_records(
+    template_path: Path,
+    output_pattern: str,
+    start: int,
+    records: List[Dict[str, Any]],
+    manifest_path: str | None = None,
+    force: bool = False,
+) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """Render ``records`` (numbered from ``start``) to disk.
+
+    Returns the number of documents written and the manifest entries recorded,
+    which the caller merges; with no ``manifest_path`` every record is written.
+    """
+    template, template_hash = _compiled(template_path)
+    manifest = _worker_manifest(manifest_path) if manifest_path else None
+    made = set()
+    written = 0
+    for i, record in enumerate(records, start):
+        out = output_path_for(output_pattern, record, i)
+        if manifest is not None:
+            inputs = {"template": template_hash, "data": record_digest(record)}
+            if not force and manifest.up_to_date(out, inputs):
+                continue
+        if out.parent not in made:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            made.add(out.parent)
+        text = template.safe_substitute(record)
+        if manifest is None:
+            atomic_write_text(out, text)
+            written += 1
+        else:
+            written += manifest.write(out, text, inputs)
+    return written, manifest.changes if manifest is not None else {}
+
+
+def read_manifest(manifest_path: Path) -> List[RenderJob]:
+    """Parse a JSON Lines manifest of ``template``/``data``/``output`` entries."""
+    manifest_path = Path(manifest_path)
+    base = manifest_path.parent
+    jobs = []
+    with manifest_path.open() as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            try:
+                jobs.append((base / entry["template"], base / entry["data"], str(base / entry["output"])))
+            except KeyError as exc:
+                raise ValueError(f"{manifest_path}:{n}: manifest entry missing {exc}")
+    return jobs
+
+
+def _chunks(render_jobs: Iterable[RenderJob], chunk_size: int) -> Iterator[tuple]:
+    for template_path, data_path, pattern in render_jobs:
+        records = iter_dataset(data_path)
+        start = 0
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            yield template_path, pattern, start, chunk
+            start += len(chunk)
+
+
+def render_batch(
+    render_jobs: Iterable[RenderJob],
+    jobs: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    manifest: BuildManifest | None = None,
+    force: bool = False,
+) -> int:
+    """Render every record of every job, returning the number of documents written.
+
+    Datasets are read lazily and at most two chunks per worker are in flight,
+    so memory stays bounded however many documents are produced. With a
+    ``manifest``, unchanged documents are skipped (unless ``force``) and the
+    manifest is saved.
+    """
+    manifest_path = str(manifest.path) if manifest is not None else None
+    if manifest is not None:
+        # Workers read the manifest from disk; publish pending entries first.
+        manifest.save()
+    chunks = (chunk + (manifest_path, force) for chunk in _chunks(render_jobs, chunk_size))
+    total = 0
+
+    def collect(result: Tuple[int, Dict[str, Dict[str, Any]]]) -> None:
+        nonlocal total
+        total += result[0]
+        if manifest is not None:
+            manifest.merge(result[1])
+
+    if jobs == 1:
+        for chunk in chunks:
+            collect(render_records(*chunk))
+    else:
+        workers = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        collect(f.result())
+                pending.add(pool.submit(render_records, *chunk))
+            for f in pending:
+                collect(f.result())
+    if manifest is not None:
+        manifest.save()
+    return total
 
 
 def _cli() -> None:
     parser = argparse.ArgumentParser(description="Render a documentation template")
-    parser.add_argument("template", type=Path)
-    parser.add_argument("data", type=Path)
-    parser.add_argument("output", type=Path)
+    parser.add_argument("template", type=Path, nargs="?")
+    parser.add_argument("data", type=Path, nargs="?")
+    parser.add_argument("output", type=Path, nargs="?")
+    parser.add_argument("--dataset", type=Path, help="JSONL, CSV or JSON array of records")
+    parser.add_argument("--output", dest="pattern", help="Output path pattern for --dataset")
+    parser.add_argument("--manifest", type=Path, help="JSONL manifest of template/data/output")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Records per task")
+    parser.add_argument(
+        "--build-manifest",
+        type=Path,
+        default=DEFAULT_BUILD_MANIFEST,
+        help="Input/output hashes used to skip unchanged outputs",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-render every output, ignoring recorded hashes")
     args = parser.parse_args()
-    render_template(args.template, args.data, args.output)
-    print(f"Generated {args.output}")
+
+    manifest = BuildManifest(args.build_manifest)
+
+    if args.manifest:
+        render_jobs = read_manifest(args.manifest)
+    elif args.dataset:
+        if not args.template or not args.pattern:
+            parser.error("--dataset needs a template and an --output pattern")
+        render_jobs = [(args.template, args.dataset, args.pattern)]
+    else:
+        if not (args.template and args.data and args.output):
+            parser.error("expected template, data and output paths")
+        if render_template(args.template, args.data, args.output, manifest, args.force):
+            print(f"Generated {args.output}")
+        else:
+            print(f"Up to date: {args.output}")
+        manifest.save()
+        return
+    count = render_batch(render_jobs, args.jobs, args.chunk_size, manifest, args.force)
+    print(f"Generated {count} documents")
 
 
 if __name__ == "__main__":
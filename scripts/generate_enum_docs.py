@@ -1,52 +1,175 @@
-"""Generate markdown documentation from enum registry YAML."""
+"""Generate markdown documentation from enum registry YAML.
+
+The output is recorded in the build manifest (``build_manifest.py``) and is
+only rewritten when the schema hash changed or the file was edited by hand.
+
+Sections and rows are streamed to the output file. Each section is wrapped in
+``<!-- BEGIN:enum:<name> sha256=<hash> -->`` / ``<!-- END:enum:<name> -->``
+markers, where the hash covers that section's enum list. With ``--partial``
+only sections whose hash changed are rendered again; the others are copied
+from the existing output.
+"""
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hashlib
+import re
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, IO, Iterable, Iterator, List, Any, Tuple
 
 import json
 
+from atomic_io import atomic_open
+from build_manifest import DEFAULT_BUILD_MANIFEST, BuildManifest, file_sha256
+
+MARKER_RE = re.compile(rb"^<!-- (BEGIN|END):enum:(\w+)(?: sha256=([0-9a-f]{64}))? -->$")
+
 
 def _load(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text())
 
 
-def _section_markdown(name: str, items: List[Dict[str, Any]]) -> str:
-    headers: List[str] = []
-    for item in items:
-        for key in item.keys():
-            if key not in headers:
-                headers.append(key)
-    lines = [f"# {name.replace('_', ' ').title()}"]
-    lines.append("| " + " | ".join(h.capitalize() for h in headers) + " |")
-    lines.append("|" + " | ".join(["---"] * len(headers)) + " |")
+def section_hash(items: List[Dict[str, Any]]) -> str:
+    payload = json.dumps(items, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _section_lines(name: str, items: List[Dict[str, Any]]) -> Iterator[str]:
+    # Ordered set of keys in first-seen order, found in a single pass.
+    headers = list(dict.fromkeys(key for item in items for key in item))
+    yield f"# {name.replace('_', ' ').title()}\n"
+    yield "| " + " | ".join(h.capitalize() for h in headers) + " |\n"
+    yield "|" + " | ".join(["---"] * len(headers)) + " |\n"
     for item in items:
-        row = [str(item.get(h, "")) for h in headers]
-        lines.append("| " + " | ".join(row) + " |")
-    lines.append("")
-    return "\n".join(lines)
+        yield "| " + " | ".join([str(item.get(h, "")) for h in headers]) + " |\n"
+
+
+def iter_sections(
+    data: Dict[str, List[Dict[str, Any]]],
+    reuse: Dict[str, Tuple[str, int, int]] | None = None,
+    source: IO[bytes] | None = None,
+) -> Iterator[Tuple[str, bool, Iterable[str]]]:
+    """Yield ``(name, rendered, chunks)`` for every section of ``data``.
+
+    ``reuse`` maps section names to ``(hash, start, end)`` byte spans of the
+    previous output open as ``source``; sections with an unchanged hash are
+    copied from there instead of being rendered.
+    """
+    for name, items in data.items():
+        digest = section_hash(items)
+        previous = (reuse or {}).get(name)
+        if source is not None and previous and previous[0] == digest:
+            yield name, False, _copy_span(source, previous[1], previous[2])
+            continue
+        yield name, True, _marked(name, digest, items)
 
 
-def generate(schema_path: Path, output_path: Path) -> None:
+def _copy_span(source: IO[bytes], start: int, end: int) -> Iterator[str]:
+    source.seek(start)
+    while source.tell() < end:
+        yield source.readline().decode("utf-8")
+
+
+def _marked(name: str, digest: str, items: List[Dict[str, Any]]) -> Iterator[str]:
+    yield f"<!-- BEGIN:enum:{name} sha256={digest} -->\n"
+    yield from _section_lines(name, items)
+    yield f"<!-- END:enum:{name} -->\n"
+
+
+def read_sections(path: Path) -> Dict[str, Tuple[str, int, int]]:
+    """Map each marked section of an existing output to ``(hash, start, end)`` byte offsets."""
+    sections: Dict[str, Tuple[str, int, int]] = {}
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return sections
+    with f:
+        current = None
+        offset = 0
+        for line in f:
+            m = MARKER_RE.match(line.rstrip(b"\r\n")) if line.startswith(b"<!--") else None
+            if m and m.group(1) == b"BEGIN" and m.group(3):
+                current = (m.group(2).decode(), m.group(3).decode(), offset)
+            elif m and current is not None and m.group(2).decode() == current[0]:
+                sections[current[0]] = (current[1], current[2], offset + len(line))
+                current = None
+            offset += len(line)
+    return sections
+
+
+def write_sections(
+    out: IO[str],
+    data: Dict[str, List[Dict[str, Any]]],
+    reuse: Dict[str, Tuple[str, int, int]] | None = None,
+    source: IO[bytes] | None = None,
+) -> List[str]:
+    """Stream all sections to ``out``; returns the names that were rendered."""
+    rendered = []
+    for i, (name, fresh, chunks) in enumerate(iter_sections(data, reuse, source)):
+        if i:
+            out.write("\n")
+        for chunk in chunks:
+            out.write(chunk)
+        if fresh:
+            rendered.append(name)
+    return rendered
+
+
+def generate(
+    schema_path: Path,
+    output_path: Path,
+    manifest: BuildManifest | None = None,
+    partial: bool = False,
+    force: bool = False,
+) -> List[str] | None:
+    """Render ``schema_path`` to ``output_path``.
+
+    Returns the names of the sections that were rendered, or ``None`` when
+    ``manifest`` shows the output is current. With ``partial``, sections whose
+    enum list is unchanged are spliced in from the existing output. ``force``
+    renders a current output too (it is still recorded).
+    """
+    inputs = {"schema": file_sha256(schema_path)}
+    if manifest is not None and not force and manifest.up_to_date(output_path, inputs):
+        return None
     data = _load(schema_path)
-    sections = [
-        _section_markdown(section, items)
-        for section, items in data.items()
-    ]
-    output_path.write_text("\n".join(sections))
+    reuse = read_sections(output_path) if partial else {}
+    # The new output goes to a temporary file, so the old one stays readable.
+    with contextlib.ExitStack() as stack:
+        source = stack.enter_context(open(output_path, "rb")) if reuse else None
+        if manifest is None:
+            out = stack.enter_context(atomic_open(output_path, "w", encoding="utf-8"))
+        else:
+            out = stack.enter_context(manifest.open_output(output_path, inputs))
+        return write_sections(out, data, reuse, source)
 
 
 def _cli() -> None:
     parser = argparse.ArgumentParser(description="Generate enum documentation")
     parser.add_argument("schema", type=Path, help="Path to enums.json")
     parser.add_argument("output", type=Path, help="Destination markdown file")
+    parser.add_argument(
+        "--build-manifest",
+        type=Path,
+        default=DEFAULT_BUILD_MANIFEST,
+        help="Input/output hashes used to skip an unchanged output",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-render, ignoring recorded hashes")
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="Only re-render sections whose enum list changed",
+    )
     args = parser.parse_args()
-    generate(args.schema, args.output)
-    print(f"Generated {args.output}")
+    with BuildManifest(args.build_manifest) as manifest:
+        rendered = generate(args.schema, args.output, manifest, args.partial, args.force)
+    if rendered is None:
+        print(f"Up to date: {args.output}")
+    else:
+        print(f"Generated {args.output} ({len(rendered)} sections rendered)")
 
 
 if __name__ == "__main__":
     _cli()
-
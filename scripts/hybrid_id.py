@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Parse and validate hybrid IDs (``schemas/hybrid_id.md``).
+
+A hybrid ID is ``CAL8-GEN-SIG-DUR-OUT-PROX-SYMBOL``, at most 64 characters,
+e.g. ``AUSHNF10-O-ECO_HIGH_USD-FL-O1-IM-EURUSD``. SIG, OUT and PROX must be
+approved values from ``schemas/enums.json`` (``signal_types``,
+``outcome_buckets``, ``proximity_buckets``); GEN and DUR have fixed value
+sets; CAL8 and SYMBOL are checked by shape only unless a symbol list is given.
+
+Every component has a :class:`Vocabulary` mapping its values to small integer
+codes. Closed vocabularies are built once from the registry; CAL8 and SYMBOL
+grow as new values are seen, and every value is interned, so decoded
+components share one string object per distinct value. The bulk API,
+:meth:`HybridIdCodec.encode_column`, turns a column of IDs into one
+``array('i')`` of codes per component (``-1`` where invalid) plus an
+``array('H')`` of error bits per ID, which is what re-entry decisions are
+joined on.
+
+Usage::
+
+    python hybrid_id.py ID [ID ...]
+    python hybrid_id.py --csv reentry_decisions.csv [--column hybrid_id]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+import sys
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_ENUMS = ROOT / "schemas" / "enums.json"
+MAX_LENGTH = 64
+NON_CALENDAR = "00000000"
+# Distinct IDs remembered per encode_column call
+MEMO_SIZE = 1 << 16
+
+COMPONENTS = ("cal8", "gen", "sig", "dur", "out", "prox", "symbol")
+GENERATIONS = ("O", "R1", "R2")
+DURATIONS = ("FL", "QK", "MD", "LG", "EX", "NA")
+# Components whose approved values come from the enum registry
+ENUM_SECTIONS = {"sig": "signal_types", "out": "outcome_buckets", "prox": "proximity_buckets"}
+SHAPES = {"cal8": re.compile(r"[A-Z0-9]{8}"), "symbol": re.compile(r"[A-Z0-9]{3,12}")}
+
+# Error bits: whole-ID problems, then one bit per component in COMPONENTS order
+ERR_LENGTH = 1 << 0
+ERR_FORMAT = 1 << 1
+ERR_COMPONENT = {name: 1 << (2 + i) for i, name in enumerate(COMPONENTS)}
+
+
+class HybridId(NamedTuple):
+    cal8: str
+    gen: str
+    sig: str
+    dur: str
+    out: str
+    prox: str
+    symbol: str
+
+    def __str__(self) -> str:
+        return "-".join(self)
+
+    @property
+    def is_calendar(self) -> bool:
+        return self.cal8 != NON_CALENDAR
+
+
+def describe_errors(mask: int) -> List[str]:
+    """Human-readable names of the bits set in an error mask."""
+    names = []
+    if mask & ERR_LENGTH:
+        names.append(f"longer than {MAX_LENGTH} characters")
+    if mask & ERR_FORMAT:
+        names.append(f"not {len(COMPONENTS)} '-'-separated components")
+    names.extend(f"invalid {name}" for name, bit in ERR_COMPONENT.items() if mask & bit)
+    return names
+
+
+@dataclass
+class Vocabulary:
+    """Value <-> code mapping for one component.
+
+    A closed vocabulary only knows its initial values; an open one adds any
+    value matching ``shape``.
+    """
+
+    values: List[str] = field(default_factory=list)
+    shape: Optional[re.Pattern] = None
+    codes: Dict[str, int] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.values = [sys.intern(v) for v in dict.fromkeys(self.values)]
+        self.codes = {v: i for i, v in enumerate(self.values)}
+
+    @property
+    def closed(self) -> bool:
+        return self.shape is None
+
+    def code(self, value: str) -> int:
+        """Code of ``value``, or -1 if it is not allowed."""
+        code = self.codes.get(value)
+        if code is not None:
+            return code
+        if self.shape is None or not self.shape.fullmatch(value):
+            return -1
+        code = self.codes[value] = len(self.values)
+        self.values.append(sys.intern(value))
+        return code
+
+
+@dataclass
+class EncodedColumn:
+    """Integer-coded components of a column of hybrid IDs."""
+
+    codes: Dict[str, array]
+    errors: array
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    @property
+    def invalid(self) -> int:
+        return sum(1 for e in self.errors if e)
+
+
+class HybridIdCodec:
+    """Validate, decompose and integer-code hybrid IDs."""
+
+    def __init__(self, vocabularies: Dict[str, Vocabulary]) -> None:
+        missing = set(COMPONENTS) - set(vocabularies)
+        if missing:
+            raise ValueError(f"missing vocabularies: {', '.join(sorted(missing))}")
+        self.vocabularies = vocabularies
+        self._code_funcs = [vocabularies[name].code for name in COMPONENTS]
+        self._bits = [ERR_COMPONENT[name] for name in COMPONENTS]
+
+    @classmethod
+    def from_enums(
+        cls, enums_path: Path | str = DEFAULT_ENUMS, symbols: Iterable[str] | None = None
+    ) -> "HybridIdCodec":
+        """Build vocabularies from the enum registry; ``symbols`` closes SYMBOL."""
+        enums = json.loads(Path(enums_path).read_text())
+        vocab = {
+            name: Vocabulary([item["name"] for item in enums[section]])
+            for name, section in ENUM_SECTIONS.items()
+        }
+        vocab["gen"] = Vocabulary(list(GENERATIONS))
+        vocab["dur"] = Vocabulary(list(DURATIONS))
+        vocab["cal8"] = Vocabulary([NON_CALENDAR], SHAPES["cal8"])
+        if symbols is None:
+            vocab["symbol"] = Vocabulary([], SHAPES["symbol"])
+        else:
+            vocab["symbol"] = Vocabulary(list(symbols))
+        return cls(vocab)
+
+    def _encode(self, value: str) -> tuple[List[int], int]:
+        parts = value.split("-")
+        mask = ERR_LENGTH if len(value) > MAX_LENGTH else 0
+        if len(parts) != len(COMPONENTS):
+            return [-1] * len(COMPONENTS), mask | ERR_FORMAT
+        codes = [code(p) for code, p in zip(self._code_funcs, parts)]
+        if -1 in codes:
+            for c, bit in zip(codes, self._bits):
+                if c < 0:
+                    mask |= bit
+        return codes, mask
+
+    def errors(self, value: str) -> int:
+        """Error mask of ``value``; 0 when it is a valid hybrid ID."""
+        return self._encode(value)[1]
+
+    def is_valid(self, value: str) -> bool:
+        return not self._encode(value)[1]
+
+    def parse(self, value: str) -> HybridId:
+        """Decompose ``value``; raises ``ValueError`` naming what is wrong."""
+        codes, mask = self._encode(value)
+        if mask:
+            raise ValueError(f"invalid hybrid_id {value!r}: {'; '.join(describe_errors(mask))}")
+        return self.decode(codes)
+
+    def decode(self, codes: Iterable[int]) -> HybridId:
+        """Rebuild a :class:`HybridId` (interned strings) from component codes."""
+        return HybridId(
+            *(self.vocabularies[name].values[c] for name, c in zip(COMPONENTS, codes))
+        )
+
+    def encode_column(self, values: Iterable[str]) -> EncodedColumn:
+        """Integer-code a column of IDs; frequently repeated IDs are split only once."""
+        columns = [array("i") for _ in COMPONENTS]
+        appends = [col.append for col in columns]
+        errors = array("H")
+        append_error = errors.append
+        seen: Dict[str, tuple] = {}
+        encode = self._encode
+        for value in values:
+            hit = seen.get(value)
+            if hit is None:
+                hit = encode(value)
+                if len(seen) < MEMO_SIZE:
+                    seen[value] = hit
+            codes, mask = hit
+            for append, code in zip(appends, codes):
+                append(code)
+            append_error(mask)
+        return EncodedColumn(dict(zip(COMPONENTS, columns)), errors)
+
+    def row(self, encoded: EncodedColumn, i: int) -> Optional[HybridId]:
+        """The decoded ID at row ``i`` of ``encoded``, or None if it was invalid."""
+        if encoded.errors[i]:
+            return None
+        return self.decode(encoded.codes[name][i] for name in COMPONENTS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate hybrid IDs")
+    parser.add_argument("ids", nargs="*", help="Hybrid IDs to check")
+    parser.add_argument("--csv", type=Path, help="CSV file with a hybrid ID column")
+    parser.add_argument("--column", default="hybrid_id", help="Column to read with --csv")
+    parser.add_argument("--enums", type=Path, default=DEFAULT_ENUMS, help="Enum registry")
+    args = parser.parse_args()
+
+    codec = HybridIdCodec.from_enums(args.enums)
+    if args.csv:
+        with open(args.csv, "r", encoding="utf-8", newline="") as f:
+            encoded = codec.encode_column(row[args.column] for row in csv.DictReader(f))
+        print(f"{len(encoded)} IDs, {encoded.invalid} invalid")
+        for name in COMPONENTS:
+            print(f"  {name}: {len(codec.vocabularies[name].values)} distinct values")
+        failed = encoded.invalid
+    else:
+        failed = 0
+        for value in args.ids:
+            mask = codec.errors(value)
+            failed += bool(mask)
+            print(f"{value}: {'; '.join(describe_errors(mask)) or 'OK'}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Incremental, on-disk cache for ``block_lint``.
+
+Each linted file gets one JSON entry under the cache directory holding its
+size, mtime, SHA-256, block table (IDs, line spans, DEPS/AFFECTS), outgoing
+references and the resulting errors. A file whose stat or content hash is
+unchanged is not parsed at all.
+
+When a file did change, it is split into segments: each top-level BEGIN/END
+block and each run of text between blocks. Segments are keyed by their own
+content hash, so the references, meta fields and DEPS/AFFECTS of every block
+that was not edited are taken from the cache and only edited segments are
+scanned again. BEGIN/END matching always runs over the whole file, since it
+only looks at marker lines.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from block_lint import (
+    DEFAULT_CACHE_DIR,
+    BlockLinter,
+    BlockTracker,
+    LintResult,
+    map_paths,
+)
+
+CACHE_VERSION = 1
+# Text outside blocks is cut into segments of at most this many lines so the
+# buffered segment stays small even for specs without any blocks.
+MAX_SEGMENT_LINES = 2000
+META_RE = re.compile(r"^<!-- (DEPS|AFFECTS):(.*?)-->$")
+
+
+def parse_meta_values(raw: str) -> List[str]:
+    """Split a DEPS/AFFECTS value list, dropping the ``None`` placeholder."""
+    values = [v.strip() for v in raw.split(",")]
+    return [v for v in values if v and v != "None"]
+
+
+class LintCache:
+    """Lint files through a persistent cache kept in ``cache_dir``."""
+
+    def __init__(self, linter: BlockLinter, cache_dir: Path | str = DEFAULT_CACHE_DIR) -> None:
+        self.linter = linter
+        self.cache_dir = Path(cache_dir)
+        self.stats: Counter = Counter()
+
+    def entry_path(self, path: str | os.PathLike) -> Path:
+        key = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def load_entry(self, path: str | os.PathLike) -> Dict[str, Any] | None:
+        try:
+            entry = json.loads(self.entry_path(path).read_text())
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_VERSION or entry.get("linter") != self.linter.fingerprint:
+            return None
+        return entry
+
+    def store_entry(self, path: str | os.PathLike, entry: Dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self.entry_path(path)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, target)
+
+    def lint_file(self, path: str | os.PathLike) -> LintResult:
+        """Lint ``path``, reusing whatever the cache still knows about it."""
+        try:
+            st = os.stat(path)
+            entry = self.load_entry(path)
+            if entry and (entry["size"], entry["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+                self.stats["skipped"] += 1
+                return LintResult(str(path), entry["errors"])
+            digest = _file_sha256(path)
+            if entry and entry["sha256"] == digest:
+                self.stats["skipped"] += 1
+                entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                self.store_entry(path, entry)
+                return LintResult(str(path), entry["errors"])
+            segments = entry["segments"] if entry else {}
+            with open(path, "r", encoding="utf-8") as f:
+                scan = self._scan(f, segments)
+        except (OSError, UnicodeDecodeError) as exc:
+            return LintResult(str(path), [f"Cannot read file: {exc}"])
+
+        scan.update(
+            version=CACHE_VERSION,
+            linter=self.linter.fingerprint,
+            path=str(path),
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            sha256=digest,
+        )
+        self.store_entry(path, scan)
+        return LintResult(str(path), scan["errors"])
+
+    def lint_paths(self, paths: Sequence[str], jobs: int | None = None) -> List[LintResult]:
+        """Lint ``paths`` across a process pool, returning results in input order."""
+        return map_paths(self.lint_file, paths, jobs)
+
+    def _scan(self, lines, old_segments: Dict[str, Any]) -> Dict[str, Any]:
+        marker_re = self.linter.marker_re
+        tracker = BlockTracker()
+        segments: Dict[str, Any] = {}
+        refs: List[List[Any]] = []
+        meta: List[List[Any]] = []
+        missing = dict.fromkeys(self.linter.required_fields)
+        buffered: List[str] = []
+        first = 1
+
+        def flush() -> None:
+            nonlocal first
+            if not buffered:
+                return
+            digest = hashlib.sha256("".join(buffered).encode()).hexdigest()
+            payload = segments.get(digest) or old_segments.get(digest)
+            if payload is None:
+                payload = self._scan_segment(buffered)
+                self.stats["segments_scanned"] += 1
+            else:
+                self.stats["segments_reused"] += 1
+            segments[digest] = payload
+            refs.extend([first + off, ref] for off, ref in payload["refs"])
+            meta.extend([first + off, kind, values] for off, kind, values in payload["meta"])
+            for required in payload["fields"]:
+                missing.pop(required, None)
+            first += len(buffered)
+            buffered.clear()
+
+        for i, line in enumerate(lines, 1):
+            m = marker_re.match(line.strip()) if "<!--" in line else None
+            if m and m.group(1) == "BEGIN" and not tracker.stack:
+                flush()
+            buffered.append(line)
+            if m:
+                tracker.feed(m.group(1), m.group(2), i)
+                if m.group(1) == "END" and not tracker.stack:
+                    flush()
+            elif not tracker.stack and len(buffered) >= MAX_SEGMENT_LINES:
+                flush()
+        flush()
+
+        blocks = sorted(tracker.blocks, key=lambda b: b.start)
+        _attach_meta(blocks, meta)
+        errors = self.linter.collect_errors(tracker, (ref for _, ref in refs), missing)
+        return {
+            "errors": errors,
+            "blocks": [vars(b) for b in blocks],
+            "refs": refs,
+            "segments": segments,
+        }
+
+    def _scan_segment(self, lines: List[str]) -> Dict[str, Any]:
+        """Collect references, meta fields and DEPS/AFFECTS of one segment."""
+        ref_re = self.linter.ref_re
+        refs, meta, fields = [], [], set()
+        for off, line in enumerate(lines):
+            if "@" in line:
+                refs.extend([off, ref] for ref in ref_re.findall(line))
+            if "<!--" in line:
+                m = META_RE.match(line.strip())
+                if m:
+                    meta.append([off, m.group(1), parse_meta_values(m.group(2))])
+            fields.update(r for r in self.linter.required_fields if r in line)
+        return {"refs": refs, "meta": meta, "fields": sorted(fields)}
+
+
+def _attach_meta(blocks, meta) -> None:
+    """Assign each DEPS/AFFECTS line to the innermost block enclosing it."""
+    stack = []
+    it = iter(blocks)
+    nxt = next(it, None)
+    for line, kind, values in meta:
+        while nxt is not None and nxt.start <= line:
+            stack.append(nxt)
+            nxt = next(it, None)
+        while stack and stack[-1].end < line:
+            stack.pop()
+        # Blocks were pushed in start order; the innermost open one is last.
+        for block in reversed(stack):
+            if block.start <= line <= block.end:
+                (block.deps if kind == "DEPS" else block.affects).extend(values)
+                break
+
+
+def _file_sha256(path: str | os.PathLike) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
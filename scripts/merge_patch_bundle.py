@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Merge a patch bundle of BEGIN/END blocks into a spec.
+
+Replaces the ``cat bundle.md >> spec.md`` step of the patch workflow. The
+spec's top-level blocks are indexed by ID with byte offsets in one pass, and
+so are the bundle's. A bundle block whose ID already exists replaces that
+block in place; a new block is inserted after the last block of the same
+``DOC.MAJOR.MINOR`` section (or, failing that, after the closest preceding
+section of the same document). The merged spec is streamed to a temporary file
+and renamed over the target, so the cost is one read of each input and one
+write, whatever the number of blocks.
+
+With ``--supersede`` a bundle block also replaces an older PATCH of the same
+item (same ``DOC.MAJOR.MINOR``, TYPE and ITEM_ID), since IDs only change by
+incrementing PATCH.
+
+Usage::
+
+    python merge_patch_bundle.py BUNDLE SPEC [--output PATH] [--supersede] [--dry-run]
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import re
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Tuple
+
+from atomic_io import atomic_open
+
+MARKER_RE = re.compile(rb"^<!-- (BEGIN|END):([\w.]+) -->\r?\n?$")
+
+
+@dataclass
+class BlockSpan:
+    """A top-level block and its ``[start, end)`` byte range, END line included."""
+
+    id: str
+    start: int
+    end: int
+
+    @property
+    def sort_key(self) -> Tuple[str, int, int, int]:
+        doc, major, minor, patch = self.id.split(".", 4)[:4]
+        return doc, int(major), int(minor), int(patch)
+
+    @property
+    def item_key(self) -> Tuple[str, str, str, str, str]:
+        """The ID without PATCH: identifies an item across patch revisions."""
+        doc, major, minor, _, rest = self.id.split(".", 4)
+        return doc, major, minor, *rest.split(".", 1)
+
+
+@dataclass
+class MergePlan:
+    replaced: List[str] = field(default_factory=list)
+    inserted: List[str] = field(default_factory=list)
+    # (offset in spec or None to append, spec bytes replaced, bundle block,
+    # True when inserting in front of the block at ``offset``)
+    edits: List[Tuple[int | None, int, BlockSpan, bool]] = field(default_factory=list)
+
+
+def index_blocks(f: BinaryIO, source: str = "<spec>") -> List[BlockSpan]:
+    """Return the top-level blocks of ``f`` in file order (nested ones stay inside)."""
+    blocks: List[BlockSpan] = []
+    stack: List[Tuple[str, int, int]] = []
+    offset = 0
+    for n, line in enumerate(f, 1):
+        m = MARKER_RE.match(line) if line.startswith(b"<!--") else None
+        if m:
+            bid = m.group(2).decode()
+            if m.group(1) == b"BEGIN":
+                stack.append((bid, offset, n))
+            elif not stack or stack[-1][0] != bid:
+                raise ValueError(f"{source}:{n}: END:{bid} does not close the open block")
+            else:
+                _, start, _ = stack.pop()
+                if not stack:
+                    blocks.append(BlockSpan(bid, start, offset + len(line)))
+        offset += len(line)
+    if stack:
+        bid, _, n = stack[-1]
+        raise ValueError(f"{source}:{n}: unclosed BEGIN:{bid}")
+    return blocks
+
+
+def _by_id(blocks: List[BlockSpan], source: str) -> Dict[str, BlockSpan]:
+    by_id: Dict[str, BlockSpan] = {}
+    for block in blocks:
+        if block.id in by_id:
+            raise ValueError(f"{source}: duplicate block id {block.id}")
+        by_id[block.id] = block
+    return by_id
+
+
+def plan_merge(
+    spec_blocks: List[BlockSpan], bundle_blocks: List[BlockSpan], supersede: bool = False
+) -> MergePlan:
+    """Decide where every bundle block goes in the spec."""
+    spec_by_id = _by_id(spec_blocks, "spec")
+    _by_id(bundle_blocks, "bundle")
+    by_item: Dict[tuple, BlockSpan] = {}
+    if supersede:
+        for block in spec_blocks:
+            current = by_item.get(block.item_key)
+            if current is None or block.sort_key > current.sort_key:
+                by_item[block.item_key] = block
+    # Insertion anchors: spec blocks ordered by (DOC, MAJOR, MINOR, PATCH)
+    anchors = sorted(spec_blocks, key=lambda b: (b.sort_key, b.start))
+    keys = [b.sort_key for b in anchors]
+
+    plan = MergePlan()
+    for block in bundle_blocks:
+        target = spec_by_id.get(block.id)
+        if target is None and supersede:
+            older = by_item.get(block.item_key)
+            if older is not None and older.sort_key < block.sort_key:
+                target = older
+        if target is not None:
+            plan.edits.append((target.start, target.end - target.start, block, False))
+            plan.replaced.append(block.id)
+            continue
+        doc = block.sort_key[0]
+        i = bisect.bisect_right(keys, block.sort_key)
+        if i and keys[i - 1][0] == doc:
+            plan.edits.append((anchors[i - 1].end, 0, block, False))
+        elif i < len(keys) and keys[i][0] == doc:
+            plan.edits.append((anchors[i].start, 0, block, True))
+        else:
+            # No block of this document yet: append
+            plan.edits.append((None, 0, block, False))
+        plan.inserted.append(block.id)
+    return plan
+
+
+def _copy(src: BinaryIO, out: BinaryIO, start: int, end: int | None) -> None:
+    src.seek(start)
+    if end is None:
+        shutil.copyfileobj(src, out)
+        return
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(remaining, 1 << 20))
+        if not chunk:
+            break
+        out.write(chunk)
+        remaining -= len(chunk)
+
+
+def _block_bytes(bundle: BinaryIO, block: BlockSpan) -> bytes:
+    bundle.seek(block.start)
+    data = bundle.read(block.end - block.start)
+    return data if data.endswith(b"\n") else data + b"\n"
+
+
+def merge(
+    bundle_path: Path, spec_path: Path, output_path: Path | None = None, supersede: bool = False
+) -> MergePlan:
+    """Merge ``bundle_path`` into ``spec_path`` and write ``output_path`` atomically."""
+    output_path = Path(output_path or spec_path)
+    with open(spec_path, "rb") as spec, open(bundle_path, "rb") as bundle:
+        plan = plan_merge(
+            index_blocks(spec, str(spec_path)), index_blocks(bundle, str(bundle_path)), supersede
+        )
+        size = spec.seek(0, 2)
+        # Appends go last; at one offset insertions precede a replacement and
+        # otherwise keep bundle order.
+        edits = sorted(
+            enumerate(plan.edits),
+            key=lambda e: (size if e[1][0] is None else e[1][0], bool(e[1][1]), e[0]),
+        )
+        with atomic_open(output_path, "wb") as out:
+            pos = 0
+            for _, (offset, skip, block, before) in edits:
+                if offset is None:
+                    if pos < size:
+                        _copy(spec, out, pos, size)
+                        spec.seek(size - 1)
+                        if spec.read(1) != b"\n":
+                            out.write(b"\n")
+                        pos = size
+                    out.write(b"\n" + _block_bytes(bundle, block))
+                    continue
+                _copy(spec, out, pos, offset)
+                if skip:
+                    out.write(_block_bytes(bundle, block))
+                elif before:
+                    out.write(_block_bytes(bundle, block) + b"\n")
+                else:
+                    out.write(b"\n" + _block_bytes(bundle, block))
+                pos = max(pos, offset + skip)
+            _copy(spec, out, pos, None)
+    return plan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge patch bundle blocks into a spec")
+    parser.add_argument("bundle", type=Path, help="Patch bundle markdown")
+    parser.add_argument("spec", type=Path, help="Spec to merge into")
+    parser.add_argument("--output", type=Path, help="Write here instead of updating SPEC")
+    parser.add_argument(
+        "--supersede", action="store_true", help="Replace older PATCH revisions of the same item"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only print the merge plan")
+    args = parser.parse_args()
+
+    try:
+        if args.dry_run:
+            with open(args.spec, "rb") as spec, open(args.bundle, "rb") as bundle:
+                plan = plan_merge(
+                    index_blocks(spec, str(args.spec)),
+                    index_blocks(bundle, str(args.bundle)),
+                    args.supersede,
+                )
+        else:
+            plan = merge(args.bundle, args.spec, args.output, args.supersede)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}")
+    for bid in plan.replaced:
+        print(f"replace {bid}")
+    for bid in plan.inserted:
+        print(f"insert  {bid}")
+    verb = "Would merge" if args.dry_run else "Merged"
+    print(f"{verb} {len(plan.replaced)} replaced, {len(plan.inserted)} inserted")
+
+
+if __name__ == "__main__":
+    main()
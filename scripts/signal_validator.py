@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Validate normalized signals (``schemas/signal_model.md``) in columnar batches.
+
+Signals are collected into a :class:`SignalBatch`: one list or ``array`` per
+field instead of one dict per signal. Enum fields (``kind``, ``direction``,
+``confidence``) are stored as small integer codes, numbers as ``array('d')``
+with NaN for a missing optional value, and ``n`` as ``array('q')`` with -1.
+Each field is then checked once per batch: ``id`` and ``ts`` with a single
+regex over the joined column, enums while encoding, ranges with ``min``/``max``
+over the array. Only a failing column is walked row by row to name the bad
+rows.
+
+:func:`iter_batches` streams JSONL or CSV input (CSV ``tags`` are
+``;``-separated) in fixed-size batches, so memory is bounded by the batch
+size.
+
+Usage::
+
+    python signal_validator.py SIGNALS.{jsonl,csv} [--batch-size N] [--max-errors N]
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from csv_contract_validator import ColumnCheck, compile_pattern
+
+BATCH_SIZE = 4096
+MAX_ERRORS = 100
+
+KINDS = ("breakout", "momentum", "mean_reversion", "squeeze", "other")
+DIRECTIONS = ("long", "short", "neutral")
+CONFIDENCE = ("LOW", "MED", "HIGH", "VERY_HIGH")
+ENUM_FIELDS = {"kind": KINDS, "direction": DIRECTIONS, "confidence": CONFIDENCE}
+# Free-form probability extension fields, kept as given
+EXTRA_FIELDS = ("trigger", "target", "state", "horizon", "notes")
+# ``n`` is stored in ``array('q')``
+MAX_COUNT = 2**63 - 1
+
+UUID = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+UTC_TS = (
+    r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])"
+    r"T(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d(?:\.\d{1,9})?(?:Z|\+00:00)"
+)
+SYMBOL = r"[A-Z0-9]{3,12}"
+TEXT_CHECKS = {
+    "id": ColumnCheck("id", "uuid", *compile_pattern(UUID)),
+    "ts": ColumnCheck("ts", "UTC ISO8601 timestamp", *compile_pattern(UTC_TS)),
+    "source": ColumnCheck("source", "text"),
+    "symbol": ColumnCheck("symbol", "symbol", *compile_pattern(SYMBOL)),
+}
+
+
+class SignalBatch:
+    """Column-oriented storage for a batch of signals."""
+
+    __slots__ = (
+        "id", "ts", "source", "symbol", "kind", "direction", "strength", "confidence",
+        "ttl", "tags", "p", "n", "extras", "errors",
+    )
+
+    def __init__(self) -> None:
+        self.id: List[str] = []
+        self.ts: List[str] = []
+        self.source: List[str] = []
+        self.symbol: List[str] = []
+        self.kind = array("b")
+        self.direction = array("b")
+        self.strength = array("d")
+        self.confidence = array("b")
+        self.ttl = array("d")
+        self.tags: List[Tuple[str, ...]] = []
+        self.p = array("d")
+        self.n = array("q")
+        # Extension fields only get a column once some signal in the batch has them
+        self.extras: Dict[str, List[Any]] = {}
+        # (row, field, message) found while building or validating
+        self.errors: List[Tuple[int, str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "SignalBatch":
+        """Build a batch from decoded signals (dicts from JSON or CSV rows)."""
+        batch = cls()
+        for name in TEXT_CHECKS:
+            column = [r.get(name) for r in records]
+            # All text fields are required; CSV readers give "" for an empty cell
+            if not all(type(v) is str and v for v in column):
+                for i, v in enumerate(column):
+                    if v is None or v == "":
+                        batch.errors.append((i, name, "missing"))
+                    elif type(v) is not str:
+                        batch.errors.append((i, name, "not a string"))
+                column = [v if type(v) is str else "" for v in column]
+            setattr(batch, name, column)
+        for name, values in ENUM_FIELDS.items():
+            codes = {v: i for i, v in enumerate(values)}
+            column = [r.get(name) for r in records]
+            # Only strings are looked up: a list or dict value is not hashable
+            encoded = array("b", [codes.get(v, -1) if type(v) is str else -1 for v in column])
+            if -1 in encoded:
+                batch.errors.extend(
+                    (i, name, f"{column[i]!r} not in {'/'.join(values)}")
+                    for i, c in enumerate(encoded)
+                    if c < 0
+                )
+            setattr(batch, name, encoded)
+        batch.strength = batch._numbers(records, "strength", required=True)
+        batch.ttl = batch._numbers(records, "ttl")
+        batch.p = batch._numbers(records, "p")
+        batch.n = batch._counts(batch._numbers(records, "n"))
+        batch.tags = batch._tags(records)
+        for name in EXTRA_FIELDS:
+            column = [r.get(name) for r in records]
+            if any(v is not None for v in column):
+                batch.extras[name] = column
+        return batch
+
+    def _numbers(
+        self, records: Sequence[Mapping[str, Any]], name: str, required: bool = False
+    ) -> array:
+        column = [r.get(name) for r in records]
+        # NaN (JSON allows it) and ints too large for a double fall through to
+        # the row scan, which rejects them
+        if all((type(v) is float or type(v) is int) and v == v for v in column):
+            try:
+                return array("d", column)
+            except OverflowError:
+                pass
+        values = array("d")
+        for i, v in enumerate(column):
+            if v is None or v == "":
+                if required:
+                    self.errors.append((i, name, "missing"))
+                values.append(math.nan)
+                continue
+            try:
+                if type(v) is bool:
+                    raise ValueError
+                value = float(v)
+                if value != value:
+                    raise ValueError
+            except (TypeError, ValueError, OverflowError):
+                self.errors.append((i, name, f"{v!r} is not a number"))
+                value = math.nan
+            values.append(value)
+        return values
+
+    def _counts(self, values: array) -> array:
+        counts = array("q")
+        for i, v in enumerate(values):
+            if v != v:
+                counts.append(-1)
+            elif v < 0 or not v.is_integer():
+                self.errors.append((i, "n", f"{v:g} is not a non-negative integer"))
+                counts.append(-1)
+            elif v > MAX_COUNT:
+                self.errors.append((i, "n", f"{v:g} is out of range"))
+                counts.append(-1)
+            else:
+                counts.append(int(v))
+        return counts
+
+    def _tags(self, records: Sequence[Mapping[str, Any]]) -> List[Tuple[str, ...]]:
+        tags = []
+        for i, r in enumerate(records):
+            value = r.get("tags")
+            if type(value) is list and all(type(t) is str for t in value):
+                tags.append(tuple(value))
+            elif type(value) is str:
+                tags.append(tuple(t for t in value.split(";") if t))
+            else:
+                problem = "missing" if value is None else "not a list of strings"
+                self.errors.append((i, "tags", problem))
+                tags.append(())
+        return tags
+
+    def validate(self) -> List[Tuple[int, str, str]]:
+        """Run the column checks (once per batch); returns all errors sorted by row."""
+        errors = self.errors
+        for name, check in TEXT_CHECKS.items():
+            column = getattr(self, name)
+            errors.extend(
+                (i, name, f"{column[i]!r} is not a valid {check.kind}")
+                for i in check.bad_rows(column)
+                if column[i]  # empty values were reported as missing by from_records
+            )
+        if len(set(self.id)) != len(self.id):
+            seen: Dict[str, int] = {}
+            for i, value in enumerate(self.id):
+                if value and seen.setdefault(value, i) != i:
+                    errors.append((i, "id", f"duplicate of row {seen[value]}"))
+        self._range("strength", self.strength, 0, 100)
+        self._range("p", self.p, 0, 1)
+        self._range("ttl", self.ttl, 0, math.inf)
+        errors.sort(key=lambda e: e[0])
+        return errors
+
+    def _range(self, name: str, values: array, low: float, high: float) -> None:
+        # NaN (missing) is skipped by min/max unless it comes first, in which
+        # case the comparison fails and the row scan below sorts it out.
+        if not values or (low <= min(values) and max(values) <= high):
+            return
+        self.errors.extend(
+            (i, name, f"{v:g} is outside {low:g}-{high:g}")
+            for i, v in enumerate(values)
+            if v == v and not low <= v <= high
+        )
+
+    @property
+    def valid(self) -> bytearray:
+        """1 per row without errors, 0 otherwise."""
+        mask = bytearray(b"\x01") * len(self)
+        for i, _, _ in self.errors:
+            mask[i] = 0
+        return mask
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Row ``i`` as a dict (for reporting; the batch itself keeps no dicts)."""
+        record: Dict[str, Any] = {
+            "id": self.id[i],
+            "ts": self.ts[i],
+            "source": self.source[i],
+            "symbol": self.symbol[i],
+            "kind": KINDS[self.kind[i]] if self.kind[i] >= 0 else None,
+            "direction": DIRECTIONS[self.direction[i]] if self.direction[i] >= 0 else None,
+            "strength": self.strength[i],
+            "confidence": CONFIDENCE[self.confidence[i]] if self.confidence[i] >= 0 else None,
+            "tags": list(self.tags[i]),
+        }
+        if self.ttl[i] == self.ttl[i]:
+            record["ttl"] = self.ttl[i]
+        if self.p[i] == self.p[i]:
+            record["p"] = self.p[i]
+        if self.n[i] >= 0:
+            record["n"] = self.n[i]
+        for name, column in self.extras.items():
+            if column[i] is not None:
+                record[name] = column[i]
+        return record
+
+
+def _read_records(path: Path) -> Iterator[Mapping[str, Any]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix == ".csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_batches(path: Path | str, batch_size: int = BATCH_SIZE) -> Iterator[SignalBatch]:
+    """Stream validated batches from a JSONL or CSV file."""
+    records = _read_records(Path(path))
+    while True:
+        chunk = list(islice(records, batch_size))
+        if not chunk:
+            return
+        batch = SignalBatch.from_records(chunk)
+        batch.validate()
+        yield batch
+
+
+def validate_file(
+    path: Path | str, batch_size: int = BATCH_SIZE, max_errors: int = MAX_ERRORS
+) -> Tuple[int, int, List[str]]:
+    """Return ``(signals, invalid signals, error messages)`` for a whole file."""
+    total = invalid = 0
+    messages: List[str] = []
+    for batch in iter_batches(path, batch_size):
+        invalid += len(batch) - sum(batch.valid)
+        for row, name, message in batch.errors:
+            if len(messages) < max_errors:
+                messages.append(f"signal {total + row + 1}: {name}: {message}")
+        total += len(batch)
+    return total, invalid, messages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate normalized signals")
+    parser.add_argument("path", type=Path, help="Signals as JSONL or CSV")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Signals per batch")
+    parser.add_argument("--max-errors", type=int, default=MAX_ERRORS, help="Errors to print")
+    args = parser.parse_args()
+
+    total, invalid, messages = validate_file(args.path, args.batch_size, args.max_errors)
+    for message in messages:
+        print(message)
+    print(f"Validated {total} signals, {invalid} invalid")
+    if invalid:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""Resident daemon that keeps lint, cross-ref and change-request state warm.
+
+Every CI step and pre-commit hook otherwise starts Python cold and re-reads
+the whole corpus. ``spec_daemon.py serve`` keeps a :class:`SpecState` in
+memory instead: per-file lint results, the heading indexes of the
+cross-reference validator and the change request registry. Each cached item
+is keyed by the stat signature (inode, size, mtime) of the files it was built
+from, so a query only redoes the work for files that changed.
+
+While serving, the daemon polls the files listed in ``_index.yaml`` and
+everything under ``docs/``, ``config/`` and ``schemas/`` and re-lints or
+re-validates what changed right away, so the next query is answered from
+memory.
+
+Clients talk to it over a Unix socket, one JSON request and one JSON reply
+per connection (see :func:`query`). ``block_lint.py``, ``validate_cross_refs.py``
+and ``validate_change_requests.py`` accept ``--daemon [SOCKET]``; when no
+daemon answers they run in-process exactly as before.
+
+Usage::
+
+    python spec_daemon.py serve [--socket PATH] [--interval SECONDS]
+    python spec_daemon.py status|stop [--socket PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from block_lint import DEFAULT_CONFIG, DEFAULT_INDEX, ROOT, BlockLinter, LintResult, read_index
+from change_request_store import journal_path
+from validate_change_requests import DEFAULT_DB, RULES, ValidationSummary, load_requests, summarize
+from validate_cross_refs import CrossReferenceValidator, DEFAULT_DOC_MAP_FILE, load_doc_map
+
+DEFAULT_SOCKET = ROOT / ".spec_daemon.sock"
+DEFAULT_CROSS_REFS = ROOT / "config" / "cross_refs.yml"
+POLL_INTERVAL = 1.0
+QUERY_TIMEOUT = 30.0
+WATCH_DIRS = ("docs", "config", "schemas")
+
+Signature = Tuple[int, int, int] | None
+
+
+def stat_signature(path: str | os.PathLike) -> Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class SpecState:
+    """Cached validation state; every lookup re-checks the files it depends on."""
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.root = Path(root)
+        # (config, docs) -> (config signature, linter)
+        self._linters: Dict[Tuple[str, Tuple[str, ...]], Tuple[Signature, BlockLinter]] = {}
+        # (config, docs, path) -> (file signature, errors)
+        self._lint_results: Dict[Tuple[str, Tuple[str, ...], str], Tuple[Signature, List[str]]] = {}
+        # (cross_ref, doc_dir, doc_map) -> (config signatures, validator, doc signatures)
+        self._validators: Dict[Tuple[str, str, str], List[Any]] = {}
+        # registry path -> (signatures of registry and journal, records)
+        self._registries: Dict[str, Tuple[Tuple[Signature, Signature], List[Dict[str, Any]]]] = {}
+        self._watched: Dict[str, Signature] = {}
+        self.stats = {"lint_hits": 0, "lint_misses": 0, "refreshes": 0}
+
+    # -- lint ------------------------------------------------------------------
+
+    def _linter(self, config: str, docs: Tuple[str, ...]) -> BlockLinter:
+        key = (config, docs)
+        sig = stat_signature(config)
+        cached = self._linters.get(key)
+        if cached is None or cached[0] != sig:
+            linter = BlockLinter.from_config(Path(config), list(docs) or None)
+            cached = self._linters[key] = (sig, linter)
+            for result_key in [k for k in self._lint_results if k[:2] == key]:
+                del self._lint_results[result_key]
+        return cached[1]
+
+    def lint(
+        self,
+        paths: Sequence[str],
+        config: str | os.PathLike = DEFAULT_CONFIG,
+        docs: Iterable[str] | None = None,
+    ) -> List[LintResult]:
+        """Lint ``paths``, reusing the result of every file that did not change."""
+        config = os.path.abspath(config)
+        docs = tuple(docs or ())
+        linter = self._linter(config, docs)
+        results = []
+        for path in paths:
+            key = (config, docs, os.path.abspath(path))
+            sig = stat_signature(path)
+            cached = self._lint_results.get(key)
+            if cached is not None and sig is not None and cached[0] == sig:
+                self.stats["lint_hits"] += 1
+                errors = cached[1]
+            else:
+                self.stats["lint_misses"] += 1
+                errors = linter.lint_file(path).errors
+                self._lint_results[key] = (sig, errors)
+            results.append(LintResult(str(path), list(errors)))
+        return results
+
+    # -- cross-references ------------------------------------------------------
+
+    def cross_refs(
+        self,
+        cross_ref: str | os.PathLike = DEFAULT_CROSS_REFS,
+        doc_dir: str | os.PathLike | None = None,
+        doc_map: str | os.PathLike | None = None,
+    ) -> List[str]:
+        """Cross-reference errors; only changed documents are re-indexed."""
+        cross_ref = os.path.abspath(cross_ref)
+        doc_dir = os.path.abspath(doc_dir or self.root)
+        if doc_map is None and (Path(doc_dir) / DEFAULT_DOC_MAP_FILE).exists():
+            doc_map = Path(doc_dir) / DEFAULT_DOC_MAP_FILE
+        doc_map = os.path.abspath(doc_map) if doc_map else ""
+        key = (cross_ref, doc_dir, doc_map)
+        config_sigs = (stat_signature(cross_ref), stat_signature(doc_map) if doc_map else None)
+        cached = self._validators.get(key)
+        if cached is None or cached[0] != config_sigs:
+            mapping = load_doc_map(doc_map) if doc_map else None
+            cached = self._validators[key] = [
+                config_sigs,
+                CrossReferenceValidator(cross_ref, doc_dir, mapping),
+                {},
+            ]
+        _, validator, doc_sigs = cached
+        for docs in validator.doc_map.values():
+            for doc in docs:
+                sig = stat_signature(Path(doc_dir) / doc)
+                if doc in doc_sigs and doc_sigs[doc] != sig:
+                    validator.invalidate(doc)
+                doc_sigs[doc] = sig
+        return validator.validate_references()
+
+    # -- change requests -------------------------------------------------------
+
+    def change_requests(
+        self,
+        db: str | os.PathLike = DEFAULT_DB,
+        rules: Sequence[str] | None = None,
+        max_errors: int | None = None,
+    ) -> ValidationSummary:
+        """Validation summary of the registry, re-read only when it changed."""
+        db = os.path.abspath(db)
+        sigs = (stat_signature(db), stat_signature(journal_path(Path(db))))
+        cached = self._registries.get(db)
+        if cached is None or cached[0] != sigs:
+            cached = self._registries[db] = (sigs, load_requests(Path(db)))
+        selected = {name: RULES[name] for name in rules} if rules else RULES
+        return summarize(cached[1], selected, max_errors)
+
+    # -- watching --------------------------------------------------------------
+
+    def spec_files(self) -> List[str]:
+        """Specs listed in ``_index.yaml``; these are linted ahead of queries."""
+        if not DEFAULT_INDEX.exists():
+            return []
+        return [os.path.abspath(p) for paths in read_index(DEFAULT_INDEX).values() for p in paths]
+
+    def watched_files(self) -> List[str]:
+        files = dict.fromkeys(self.spec_files())
+        if DEFAULT_INDEX.exists():
+            files[str(DEFAULT_INDEX)] = None
+        for directory in WATCH_DIRS:
+            pattern = str(self.root / directory / "**" / "*")
+            files.update(
+                dict.fromkeys(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+            )
+        return list(files)
+
+    def refresh(self) -> List[str]:
+        """Poll the watched files and rebuild the state of the changed ones.
+
+        Failures are left for the next query to report; the daemon keeps running.
+        """
+        self.stats["refreshes"] += 1
+        current = {path: stat_signature(path) for path in self.watched_files()}
+        changed = [p for p, sig in current.items() if self._watched.get(p) != sig]
+        changed.extend(p for p in self._watched if p not in current)
+        self._watched = current
+        if not changed:
+            return []
+        warmups: List[Callable[[], Any]] = [lambda: self.lint(self.spec_files())]
+        if DEFAULT_CROSS_REFS.exists():
+            warmups.append(self.cross_refs)
+        if DEFAULT_DB.exists():
+            warmups.append(self.change_requests)
+        for warm in warmups:
+            try:
+                warm()
+            except Exception as exc:
+                print(f"spec daemon: refresh failed: {exc}", file=sys.stderr)
+        return changed
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "watched_files": len(self._watched),
+            "lint_results": len(self._lint_results),
+            "validators": len(self._validators),
+            "registries": len(self._registries),
+            **self.stats,
+        }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            reply = {"ok": True, "result": self.server.dispatch(request)}
+        except Exception as exc:  # reported to the client, which falls back
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class SpecDaemon(socketserver.UnixStreamServer):
+    """Single-threaded socket server; polls for changes between requests."""
+
+    def __init__(self, socket_path: Path, state: SpecState, interval: float = POLL_INTERVAL):
+        self.socket_path = Path(socket_path)
+        if self.socket_path.exists():
+            if query("ping", socket_path=self.socket_path) is not None:
+                raise RuntimeError(f"a daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _Handler)
+        self.state = state
+        self.interval = interval
+        self.timeout = interval
+        self.stopping = False
+        self._commands: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: {"pid": os.getpid()},
+            "status": state.status,
+            "stop": self._stop,
+            "lint": self._lint,
+            "cross-refs": state.cross_refs,
+            "change-requests": lambda **kw: state.change_requests(**kw).to_dict(),
+        }
+
+    def dispatch(self, request: Dict[str, Any]) -> Any:
+        command = self._commands.get(request.get("command"))
+        if command is None:
+            raise ValueError(f"unknown command {request.get('command')!r}")
+        return command(**request.get("params", {}))
+
+    def _lint(self, **params: Any) -> List[Dict[str, Any]]:
+        return [{"path": r.path, "errors": r.errors} for r in self.state.lint(**params)]
+
+    def _stop(self) -> Dict[str, Any]:
+        self.stopping = True
+        return {"pid": os.getpid()}
+
+    def serve(self) -> None:
+        next_poll = 0.0
+        try:
+            while not self.stopping:
+                if time.monotonic() >= next_poll:
+                    self.state.refresh()
+                    next_poll = time.monotonic() + self.interval
+                self.handle_request()
+        finally:
+            self.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+
+def query(
+    command: str,
+    socket_path: Path | str | None = None,
+    timeout: float = QUERY_TIMEOUT,
+    **params: Any,
+) -> Any:
+    """Send one request to the daemon; None when no daemon answers or it fails."""
+    path = str(socket_path or DEFAULT_SOCKET)
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps({"command": command, "params": params}).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                reply = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if not reply.get("ok"):
+        print(f"spec daemon: {reply.get('error')}; running in-process", file=sys.stderr)
+        return None
+    return reply["result"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resident spec validation daemon")
+    parser.add_argument("command", choices=["serve", "status", "stop"])
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument(
+        "--interval", type=float, default=POLL_INTERVAL, help="Seconds between change polls"
+    )
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            server = SpecDaemon(args.socket, SpecState(), args.interval)
+        except RuntimeError as exc:
+            raise SystemExit(f"error: {exc}")
+
+        def stop(signum: int, frame: Any) -> None:
+            server.stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        print(f"Serving on {args.socket} (pid {os.getpid()})", file=sys.stderr)
+        server.serve()
+        return
+    reply = query(args.command, socket_path=args.socket)
+    if reply is None:
+        raise SystemExit(f"no daemon listening on {args.socket}")
+    print(json.dumps(reply, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""Persistent SQLite index of the blocks, references and headings of all specs.
+
+One scan records, per file, every BEGIN/END block (ID, DOC/MAJOR/MINOR/PATCH,
+TYPE, ITEM, enclosing block, line and byte span, SHA-256 of its text,
+DEPS/AFFECTS values), every ``@DOC.MAJOR.MINOR`` reference and every markdown
+heading. Updates are incremental: a file whose size and mtime are unchanged
+is skipped, one whose content hash is unchanged only gets its stat refreshed,
+and files that disappeared are dropped. Only a full-corpus run (or
+``--prune``) also drops indexed files that were not passed. Changed files are parsed in a process
+pool and each file is replaced in its own transaction.
+
+Tools can query the index instead of re-parsing markdown, e.g. ``block_graph``
+via ``BlockGraph.from_index``.
+
+Usage::
+
+    python spec_index.py [--db PATH] update [--index _index.yaml] [--prune] [PATH|GLOB ...]
+    python spec_index.py [--db PATH] blocks [PREFIX]
+    python spec_index.py [--db PATH] unresolved
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Sequence, Tuple
+
+from block_lint import DEFAULT_CONFIG, DEFAULT_INDEX, ROOT, BlockLinter, expand_targets, read_index
+from build_manifest import file_sha256
+from lint_cache import META_RE, parse_meta_values
+
+DEFAULT_DB = ROOT / ".specindex.sqlite"
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+def default_targets() -> List[str]:
+    """Every file listed in ``_index.yaml`` plus the markdown under ``docs/``."""
+    targets: List[str] = []
+    if DEFAULT_INDEX.exists():
+        for files in read_index(DEFAULT_INDEX).values():
+            targets.extend(files)
+    targets.append(str(ROOT / "docs" / "**" / "*.md"))
+    return targets
+
+
+def parse_spec(f: BinaryIO, marker_re: re.Pattern, ref_re: re.Pattern) -> Dict[str, List[Any]]:
+    """Collect blocks, references and headings from a spec opened in binary mode."""
+    blocks: List[Dict[str, Any]] = []
+    refs: List[Tuple[int, str, str | None]] = []
+    headings: List[Tuple[int, int, str]] = []
+    stack: List[Dict[str, Any]] = []
+    offset = 0
+    in_fence = False
+    for n, raw in enumerate(f, 1):
+        line = raw.decode("utf-8", errors="replace")
+        stripped = line.strip()
+        for block in stack:
+            block["_hash"].update(raw)
+        m = marker_re.match(stripped) if "<!--" in line else None
+        if m and m.group(1) == "BEGIN":
+            bid = m.group(2)
+            doc, major, minor, patch, btype, item = bid.split(".", 5)
+            block = {
+                "id": bid,
+                "doc": doc,
+                "major": int(major),
+                "minor": int(minor),
+                "patch": int(patch),
+                "type": btype,
+                "item": item,
+                "parent": stack[-1]["id"] if stack else None,
+                "start_line": n,
+                "start_byte": offset,
+                "deps": [],
+                "affects": [],
+                "_hash": hashlib.sha256(raw),
+            }
+            stack.append(block)
+        elif m and stack and stack[-1]["id"] == m.group(2):
+            block = stack.pop()
+            block["end_line"] = n
+            block["end_byte"] = offset + len(raw)
+            block["sha256"] = block.pop("_hash").hexdigest()
+            blocks.append(block)
+        elif stripped.startswith("```"):
+            in_fence = not in_fence
+        elif "<!--" in line and stack:
+            meta = META_RE.match(stripped)
+            if meta:
+                key = "deps" if meta.group(1) == "DEPS" else "affects"
+                stack[-1][key].extend(parse_meta_values(meta.group(2)))
+        elif stripped.startswith("#") and not in_fence:
+            h = HEADING_RE.match(stripped)
+            if h:
+                headings.append((n, len(h.group(1)), h.group(2)))
+        if "@" in line:
+            owner = stack[-1]["id"] if stack else None
+            refs.extend((n, ref, owner) for ref in ref_re.findall(line))
+        offset += len(raw)
+    # Unclosed blocks are a lint error; index them up to the end of the file.
+    for block in stack:
+        block.update(end_line=None, end_byte=offset, sha256=block.pop("_hash").hexdigest())
+        blocks.append(block)
+    blocks.sort(key=lambda b: b["start_byte"])
+    return {"blocks": blocks, "refs": refs, "headings": headings}
+
+
+def _parse_path(path: str, marker_pattern: str, ref_pattern: str) -> Tuple[str, Dict[str, Any]]:
+    with open(path, "rb") as f:
+        parsed = parse_spec(f, re.compile(marker_pattern), re.compile(ref_pattern))
+    return file_sha256(path), parsed
+
+
+class SpecIndex:
+    """Blocks, references and headings of the spec corpus in SQLite."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            file_id  INTEGER PRIMARY KEY,
+            path     TEXT NOT NULL UNIQUE,
+            size     INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            sha256   TEXT NOT NULL,
+            linter   TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS blocks (
+            file_id    INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+            id         TEXT NOT NULL,
+            doc        TEXT NOT NULL,
+            major      INTEGER NOT NULL,
+            minor      INTEGER NOT NULL,
+            patch      INTEGER NOT NULL,
+            type       TEXT NOT NULL,
+            item       TEXT NOT NULL,
+            parent     TEXT,
+            start_line INTEGER NOT NULL,
+            end_line   INTEGER,
+            start_byte INTEGER NOT NULL,
+            end_byte   INTEGER NOT NULL,
+            sha256     TEXT NOT NULL,
+            deps       TEXT NOT NULL DEFAULT '[]',
+            affects    TEXT NOT NULL DEFAULT '[]',
+            PRIMARY KEY (file_id, start_byte)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_blocks_id ON blocks(id);
+        CREATE INDEX IF NOT EXISTS idx_blocks_section ON blocks(doc, major, minor);
+        CREATE TABLE IF NOT EXISTS refs (
+            file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+            line    INTEGER NOT NULL,
+            ref     TEXT NOT NULL,
+            doc     TEXT NOT NULL,
+            major   INTEGER NOT NULL,
+            minor   INTEGER NOT NULL,
+            block   TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_refs_file ON refs(file_id);
+        CREATE INDEX IF NOT EXISTS idx_refs_section ON refs(doc, major, minor);
+        CREATE TABLE IF NOT EXISTS headings (
+            file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+            line    INTEGER NOT NULL,
+            level   INTEGER NOT NULL,
+            text    TEXT NOT NULL,
+            PRIMARY KEY (file_id, line)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path: Path | str = DEFAULT_DB, linter: BlockLinter | None = None) -> None:
+        self.db_path = Path(db_path)
+        self.linter = linter or BlockLinter.from_config(DEFAULT_CONFIG)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def __enter__(self) -> "SpecIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # -- updating ----------------------------------------------------------
+    def update(self, paths: Sequence[str], jobs: int | None = None, prune: bool = False) -> Counter:
+        """Bring the index up to date for ``paths``; returns per-outcome counts.
+
+        Indexed files that no longer exist are removed. With ``prune``, so are
+        indexed files that are not among ``paths``.
+        """
+        stats: Counter = Counter()
+        fingerprint = self.linter.fingerprint
+        known = {
+            row["path"]: row
+            for row in self.conn.execute("SELECT path, size, mtime_ns, sha256, linter FROM files")
+        }
+        wanted = {str(Path(p).resolve()) for p in paths}
+        # Stats are taken before parsing: an edit in between leaves a stale
+        # mtime behind, so the file is parsed again on the next update.
+        to_parse: List[Tuple[str, os.stat_result]] = []
+        for path in sorted(wanted):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            row = known.get(path)
+            if row is not None and row["linter"] == fingerprint:
+                if (row["size"], row["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+                    stats["unchanged"] += 1
+                    continue
+                if file_sha256(path) == row["sha256"]:
+                    self.conn.execute(
+                        "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                        (st.st_size, st.st_mtime_ns, path),
+                    )
+                    stats["touched"] += 1
+                    continue
+            to_parse.append((path, st))
+
+        args = (self.linter.marker_re.pattern, self.linter.ref_re.pattern)
+        parsed_all = self._parse_all([path for path, _ in to_parse], args, jobs)
+        for (path, st), (digest, parsed) in zip(to_parse, parsed_all):
+            self._store(path, st, digest, fingerprint, parsed)
+            stats["indexed"] += 1
+
+        gone = [p for p in known if (prune and p not in wanted) or not os.path.exists(p)]
+        if gone:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in gone])
+            stats["removed"] += len(gone)
+        return stats
+
+    @staticmethod
+    def _parse_all(paths: List[str], args: tuple, jobs: int | None) -> Iterator[Tuple[str, Dict]]:
+        if jobs == 1 or len(paths) <= 1:
+            return (_parse_path(p, *args) for p in paths)
+        workers = min(jobs or os.cpu_count() or 1, len(paths))
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+        def results() -> Iterator[Tuple[str, Dict]]:
+            with pool:
+                yield from pool.map(_parse_path, paths, *[[a] * len(paths) for a in args])
+
+        return results()
+
+    def _store(self, path: str, st: os.stat_result, digest: str, fingerprint: str, parsed) -> None:
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            file_id = conn.execute(
+                "INSERT INTO files (path, size, mtime_ns, sha256, linter) VALUES (?, ?, ?, ?, ?)",
+                (path, st.st_size, st.st_mtime_ns, digest, fingerprint),
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR REPLACE INTO blocks VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        file_id, b["id"], b["doc"], b["major"], b["minor"], b["patch"],
+                        b["type"], b["item"], b["parent"], b["start_line"], b["end_line"],
+                        b["start_byte"], b["end_byte"], b["sha256"],
+                        json.dumps(b["deps"]), json.dumps(b["affects"]),
+                    )
+                    for b in parsed["blocks"]
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO refs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(file_id, line, ref, *_section(ref), block) for line, ref, block in parsed["refs"]],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO headings VALUES (?, ?, ?, ?)",
+                [(file_id, *h) for h in parsed["headings"]],
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # -- queries -----------------------------------------------------------
+    @staticmethod
+    def _block(row: sqlite3.Row) -> Dict[str, Any]:
+        block = {key: row[key] for key in row.keys()}
+        block["deps"] = json.loads(block["deps"])
+        block["affects"] = json.loads(block["affects"])
+        return block
+
+    def files(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT path FROM files ORDER BY path")]
+
+    def blocks(self, prefix: str = "", path: str | None = None) -> List[Dict[str, Any]]:
+        """Blocks whose ID starts with ``prefix``, optionally only from ``path``."""
+        sql = (
+            "SELECT f.path, b.* FROM blocks b JOIN files f USING (file_id) "
+            "WHERE b.id >= ? AND b.id < ?"
+        )
+        params: List[Any] = [prefix, prefix + "\uffff"]
+        if path is not None:
+            sql += " AND f.path = ?"
+            params.append(str(Path(path).resolve()))
+        sql += " ORDER BY f.path, b.start_byte"
+        return [self._block(row) for row in self.conn.execute(sql, params)]
+
+    def block_tables(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """``(path, blocks)`` per indexed file, in the shape ``scan_blocks`` returns."""
+        current, blocks = None, []
+        for block in self.blocks():
+            if block["path"] != current:
+                if current is not None:
+                    yield current, blocks
+                current, blocks = block["path"], []
+            block["start"], block["end"] = block["start_line"], block["end_line"]
+            blocks.append(block)
+        if current is not None:
+            yield current, blocks
+
+    def sections(self) -> set:
+        """``(DOC, MAJOR, MINOR)`` of every indexed block."""
+        rows = self.conn.execute("SELECT DISTINCT doc, major, minor FROM blocks")
+        return {tuple(row) for row in rows}
+
+    def unresolved_refs(self) -> List[Dict[str, Any]]:
+        """References with no block in their ``DOC.MAJOR.MINOR`` section anywhere."""
+        rows = self.conn.execute(
+            "SELECT f.path, r.line, r.ref, r.block FROM refs r JOIN files f USING (file_id) "
+            "WHERE NOT EXISTS (SELECT 1 FROM blocks b WHERE b.doc = r.doc "
+            "AND b.major = r.major AND b.minor = r.minor) ORDER BY f.path, r.line"
+        )
+        return [dict(row) for row in rows]
+
+    def headings(self, path: str) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT h.line, h.level, h.text FROM headings h JOIN files f USING (file_id) "
+            "WHERE f.path = ? ORDER BY h.line",
+            (str(Path(path).resolve()),),
+        )
+        return [dict(row) for row in rows]
+
+
+def _section(ref: str) -> Tuple[str, int, int]:
+    doc, major, minor = ref[1:].split(".")
+    return doc, int(major), int(minor)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain and query the spec block index")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Index database")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="Lint profile config")
+    sub = parser.add_subparsers(dest="command", required=True)
+    update = sub.add_parser("update", help="Re-index changed files")
+    update.add_argument("paths", nargs="*", help="Spec files or globs (default: index + docs/)")
+    update.add_argument("--index", type=Path, help="Also index every file listed here")
+    update.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    update.add_argument(
+        "--prune",
+        action="store_true",
+        help="Drop indexed files not given (implied when no paths are given)",
+    )
+    blocks = sub.add_parser("blocks", help="List indexed blocks")
+    blocks.add_argument("prefix", nargs="?", default="", help="Block ID prefix")
+    sub.add_parser("unresolved", help="List references to sections with no block")
+    args = parser.parse_args()
+
+    with SpecIndex(args.db, BlockLinter.from_config(args.config)) as index:
+        if args.command == "update":
+            targets = list(args.paths)
+            if args.index:
+                for files in read_index(args.index).values():
+                    targets.extend(files)
+            prune = args.prune or not targets
+            stats = index.update(expand_targets(targets or default_targets()), args.jobs, prune)
+            print(", ".join(f"{k}={v}" for k, v in sorted(stats.items())) or "nothing to index")
+        elif args.command == "blocks":
+            for block in index.blocks(args.prefix):
+                print(f"{block['id']}\t{block['path']}:{block['start_line']}")
+        else:
+            unresolved = index.unresolved_refs()
+            for ref in unresolved:
+                print(f"{ref['path']}:{ref['line']}: {ref['ref']}")
+            if unresolved:
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
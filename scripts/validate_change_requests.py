@@ -5,51 +5,209 @@ contain the fields needed for automation. Requests that are not yet resolved
 must include an ``impact`` description and a tracking ``branch``. Requests in
 ``in_review`` state must also list ``reviewers``.
 
+Records are streamed from the registry (JSON snapshot plus journal, a JSON
+Lines file, or a SQLite database) rather than loaded whole. Each check is a
+named rule in :data:`RULES`; register more with the :func:`rule` decorator.
+Besides the error list, a run produces a summary with counts per rule and per
+status and the oldest unresolved request.
+
 Running the module as a script prints any validation errors and exits with a
-non-zero status if problems are found.
+non-zero status if problems are found::
+
+    python validate_change_requests.py [--db PATH] [--rule NAME] [--max-errors N] [--json]
+                                       [--daemon [SOCKET]]
 """
 
 from __future__ import annotations
 
+import argparse
+import json
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
 
-import json
+from change_request_store import iter_records, open_store
 
 DEFAULT_DB = Path(__file__).resolve().parents[1] / "config" / "change_requests.json"
 
+Rule = Callable[[Dict[str, Any]], Optional[str]]
+RULES: Dict[str, Rule] = {}
+
+
+def rule(name: str) -> Callable[[Rule], Rule]:
+    """Register a check returning an error message, or ``None`` when it passes."""
+
+    def register(func: Rule) -> Rule:
+        RULES[name] = func
+        return func
+
+    return register
+
+
+@rule("impact")
+def _impact(req: Dict[str, Any]) -> Optional[str]:
+    if req.get("status") != "resolved" and not req.get("impact"):
+        return f"Request {req['id']} missing impact analysis"
+    return None
+
+
+@rule("branch")
+def _branch(req: Dict[str, Any]) -> Optional[str]:
+    if req.get("status") != "resolved" and not req.get("branch"):
+        return f"Request {req['id']} missing tracking branch"
+    return None
+
+
+@rule("reviewers")
+def _reviewers(req: Dict[str, Any]) -> Optional[str]:
+    if req.get("status") == "in_review" and not req.get("reviewers"):
+        return f"Request {req['id']} missing reviewers"
+    return None
+
+
+class ValidationSummary:
+    """Aggregated result of one validation run."""
+
+    def __init__(self) -> None:
+        self.checked = 0
+        self.errors: List[str] = []
+        self.per_rule: Counter = Counter()
+        self.per_status: Counter = Counter()
+        self.oldest_unresolved: Optional[Dict[str, Any]] = None
+        # True when max_errors stopped the run and dropped an error
+        self.truncated = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "checked": self.checked,
+            "errors": self.errors,
+            "per_rule": dict(self.per_rule),
+            "per_status": {str(k): v for k, v in self.per_status.items()},
+            "oldest_unresolved": self.oldest_unresolved,
+            "truncated": self.truncated,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ValidationSummary":
+        """Inverse of :meth:`to_dict` (statuses stay strings)."""
+        summary = cls()
+        summary.checked = data["checked"]
+        summary.errors = list(data["errors"])
+        summary.per_rule = Counter(data["per_rule"])
+        summary.per_status = Counter(data["per_status"])
+        summary.oldest_unresolved = data["oldest_unresolved"]
+        summary.truncated = data["truncated"]
+        return summary
+
 
 def load_requests(db_path: Path = DEFAULT_DB) -> List[Dict[str, Any]]:
-    if db_path.exists():
-        data = json.loads(db_path.read_text())
-        if isinstance(data, list):
-            return data
-    return []
+    # Includes mutations still in the journal that are not compacted yet.
+    with open_store(db_path) as store:
+        return store.all()
+
+
+def summarize(
+    requests: Iterable[Dict[str, Any]],
+    rules: Mapping[str, Rule] | None = None,
+    max_errors: int | None = None,
+) -> ValidationSummary:
+    """Run ``rules`` over a stream of requests, stopping after ``max_errors``.
+
+    The run stops at the first error that no longer fits, so ``truncated`` is
+    only set when an error was actually dropped.
+    """
+    rules = RULES if rules is None else rules
+    summary = ValidationSummary()
+    for req in requests:
+        summary.checked += 1
+        status = req.get("status")
+        summary.per_status[status] += 1
+        if status != "resolved":
+            oldest = summary.oldest_unresolved
+            if oldest is None or req["id"] < oldest["id"]:
+                summary.oldest_unresolved = {
+                    "id": req["id"],
+                    "title": req.get("title"),
+                    "status": status,
+                }
+        for name, check in rules.items():
+            message = check(req)
+            if not message:
+                continue
+            if max_errors is not None and len(summary.errors) >= max_errors:
+                summary.truncated = True
+                return summary
+            summary.per_rule[name] += 1
+            summary.errors.append(message)
+    return summary
 
 
 def validate(db_path: Path = DEFAULT_DB) -> List[str]:
     """Return a list of validation error messages."""
-    errors: List[str] = []
-    for req in load_requests(db_path):
-        if req.get("status") != "resolved":
-            if not req.get("impact"):
-                errors.append(f"Request {req['id']} missing impact analysis")
-            if not req.get("branch"):
-                errors.append(f"Request {req['id']} missing tracking branch")
-        if req.get("status") == "in_review" and not req.get("reviewers"):
-            errors.append(f"Request {req['id']} missing reviewers")
-    return errors
+    return summarize(iter_records(db_path)).errors
+
+
+def format_summary(summary: ValidationSummary) -> str:
+    statuses = ", ".join(f"{s}={n}" for s, n in sorted(summary.per_status.items(), key=str))
+    lines = [f"Checked {summary.checked} change requests ({statuses or 'none'})"]
+    for name, count in sorted(summary.per_rule.items()):
+        lines.append(f"  {name}: {count} errors")
+    if summary.oldest_unresolved:
+        oldest = summary.oldest_unresolved
+        lines.append(f"Oldest unresolved: #{oldest['id']} [{oldest['status']}] {oldest['title']}")
+    if summary.truncated:
+        lines.append("Stopped early after reaching --max-errors")
+    return "\n".join(lines)
 
 
 def _cli() -> None:
-    errors = validate()
-    if errors:
-        for e in errors:
+    parser = argparse.ArgumentParser(description="Validate change request metadata")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Registry to validate")
+    parser.add_argument(
+        "--rule",
+        action="append",
+        choices=sorted(RULES),
+        help="Only run the named rule (repeatable)",
+    )
+    parser.add_argument("--max-errors", type=int, default=None, help="Stop after N errors")
+    parser.add_argument("--json", action="store_true", help="Emit a JSON summary")
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const="",
+        metavar="SOCKET",
+        help="Ask a running spec_daemon.py first; validate in-process if none answers",
+    )
+    args = parser.parse_args()
+
+    summary = None
+    if args.daemon is not None:
+        from spec_daemon import query
+
+        reply = query(
+            "change-requests",
+            socket_path=args.daemon or None,
+            db=str(args.db.resolve()),
+            rules=args.rule,
+            max_errors=args.max_errors,
+        )
+        if reply is not None:
+            summary = ValidationSummary.from_dict(reply)
+    if summary is None:
+        rules = {name: RULES[name] for name in args.rule} if args.rule else RULES
+        summary = summarize(iter_records(args.db), rules, args.max_errors)
+    if args.json:
+        print(json.dumps(summary.to_dict(), indent=2, sort_keys=True))
+    else:
+        for e in summary.errors:
             print(e)
+        print(format_summary(summary))
+        if not summary.errors and not summary.truncated:
+            print("All change requests valid.")
+    # A truncated run dropped at least one error, even with --max-errors 0
+    if summary.errors or summary.truncated:
         raise SystemExit(1)
-    print("All change requests valid.")
 
 
 if __name__ == "__main__":
     _cli()
-
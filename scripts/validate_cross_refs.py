@@ -3,48 +3,188 @@
 from __future__ import annotations
 
 import argparse
-import re
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Mapping, Sequence
 import json
 
+DOC_MAP = {
+    "huey_p_section": "docs/huey_p_unified_gui_signals_spec.md",
+    "backend_section": "docs/integrated_economic_calendar_matrix_re_entry_system_spec.md",
+}
+DEFAULT_DOC_MAP_FILE = Path("config/doc_map.json")
+# Longer sections are matched against the cached heading texts instead of
+# the anchor set, which keeps the set small for long headings.
+MAX_ANCHOR_LEN = 64
+
+
+def _normalize(text: str) -> str:
+    """Drop the ``§`` marker so ``§3.2`` and ``3.2`` name the same section."""
+    text = text.strip()
+    return text[1:].lstrip() if text.startswith("§") else text
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _ends_at_boundary(text: str, end: int) -> bool:
+    """Whether a regex ``\\b`` holds right after ``text[:end]``."""
+    after = _is_word(text[end]) if end < len(text) else False
+    return _is_word(text[end - 1]) != after
+
+
+class HeadingIndex:
+    """Section anchors of one markdown document, built in a single pass.
+
+    A section matches a heading when the heading text starts with it and the
+    match ends at a word boundary, so ``§3`` matches ``## §3.2 Hybrid ID``
+    but ``§3.2`` does not match ``## §3.21``.
+    """
+
+    def __init__(self, headings: list[str]) -> None:
+        self.headings = headings
+        self.anchors: set[str] = set()
+        for text in headings:
+            for end in range(1, min(len(text), MAX_ANCHOR_LEN) + 1):
+                if _ends_at_boundary(text, end):
+                    self.anchors.add(text[:end])
+
+    @classmethod
+    def from_file(cls, path: Path) -> "HeadingIndex":
+        headings = []
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#"):
+                    text = _normalize(line.lstrip("#"))
+                    if text:
+                        headings.append(text)
+        return cls(headings)
+
+    def __contains__(self, section: str) -> bool:
+        section = _normalize(section)
+        if not section:
+            return False
+        if len(section) <= MAX_ANCHOR_LEN:
+            return section in self.anchors
+        return any(
+            text.startswith(section) and _ends_at_boundary(text, len(section))
+            for text in self.headings
+        )
+
+
+def load_doc_map(path: Path | str) -> dict[str, list[str]]:
+    """Read a ``{doc_type: path | [path, ...]}`` JSON document map."""
+    return _as_lists(json.loads(Path(path).read_text()))
+
+
+def _as_lists(doc_map: Mapping[str, str | Sequence[str]]) -> dict[str, list[str]]:
+    return {
+        doc_type: [docs] if isinstance(docs, str) else list(docs)
+        for doc_type, docs in doc_map.items()
+    }
+
 
 class CrossReferenceValidator:
-    """Check that referenced sections and shared definitions exist."""
+    """Check that referenced sections and shared definitions exist.
 
-    def __init__(self, cross_ref_file: Path | str, doc_directory: Path | str) -> None:
+    ``doc_map`` maps each section key used in the cross-ref file (such as
+    ``huey_p_section``) to one or more documents; a section must exist in every
+    document listed for its key. All heading indexes are built concurrently
+    before validation, and every section lookup is then a set membership test.
+    """
+
+    def __init__(
+        self,
+        cross_ref_file: Path | str,
+        doc_directory: Path | str,
+        doc_map: Mapping[str, str | Sequence[str]] | None = None,
+        jobs: int | None = None,
+    ) -> None:
         self.cross_refs = json.loads(Path(cross_ref_file).read_text())
         self.doc_dir = Path(doc_directory)
+        self.doc_map = _as_lists(DOC_MAP if doc_map is None else doc_map)
+        self.jobs = jobs
+        self._indexes: dict[str, HeadingIndex | None] = {}
 
     def validate_references(self) -> list[str]:
         errors: list[str] = []
+        shared_files = {
+            refs["shared_definition"]
+            for items in self.cross_refs.values()
+            for refs in items.values()
+            if "shared_definition" in refs
+        }
+        existing = self.existing_files(shared_files)
+        self.build_indexes()
         for category, items in self.cross_refs.items():
             for item_name, refs in items.items():
-                for doc_type in ["huey_p_section", "backend_section"]:
+                for doc_type in self.doc_map:
                     if doc_type in refs:
                         section = refs[doc_type]
-                        if not self.section_exists(doc_type, section):
+                        for doc in self.missing_in(doc_type, section):
                             errors.append(
-                                f"Missing section {section} in {doc_type} for {item_name}"
+                                f"Missing section {section} in {doc_type} ({doc}) for {item_name}"
                             )
                 if "shared_definition" in refs:
-                    shared_file = self.doc_dir / refs["shared_definition"]
-                    if not shared_file.exists():
+                    if refs["shared_definition"] not in existing:
+                        shared_file = self.doc_dir / refs["shared_definition"]
                         errors.append(
                             f"Missing shared definition: {shared_file} for {item_name}"
                         )
         return errors
 
+    def existing_files(self, names: set[str]) -> set[str]:
+        """Return the subset of ``names`` that exist, listing each directory once."""
+        listings: dict[Path, set[str]] = {}
+        found = set()
+        for name in names:
+            path = self.doc_dir / name
+            if path.parent not in listings:
+                try:
+                    listings[path.parent] = set(os.listdir(path.parent))
+                except OSError:
+                    listings[path.parent] = set()
+            if path.name in listings[path.parent]:
+                found.add(name)
+        return found
+
+    def build_indexes(self) -> None:
+        """Index every mapped document that is not cached yet, in a thread pool."""
+        docs = list(
+            dict.fromkeys(d for ds in self.doc_map.values() for d in ds if d not in self._indexes)
+        )
+        if not docs:
+            return
+        with ThreadPoolExecutor(max_workers=self.jobs or min(32, len(docs))) as pool:
+            self._indexes.update(zip(docs, pool.map(self._load_index, docs)))
+
+    def _load_index(self, doc: str) -> HeadingIndex | None:
+        doc_file = self.doc_dir / doc
+        return HeadingIndex.from_file(doc_file) if doc_file.exists() else None
+
+    def heading_index(self, doc: str) -> HeadingIndex | None:
+        """Return the cached heading index for one document, loading it once."""
+        if doc not in self._indexes:
+            self._indexes[doc] = self._load_index(doc)
+        return self._indexes[doc]
+
+    def invalidate(self, doc: str) -> None:
+        """Forget the cached index of ``doc`` so the next lookup re-reads it."""
+        self._indexes.pop(doc, None)
+
+    def missing_in(self, doc_type: str, section: str) -> list[str]:
+        """Documents mapped to ``doc_type`` that lack ``section``."""
+        missing = []
+        for doc in self.doc_map[doc_type]:
+            index = self.heading_index(doc)
+            if index is None or section not in index:
+                missing.append(doc)
+        return missing
+
     def section_exists(self, doc_type: str, section: str) -> bool:
-        doc_map = {
-            "huey_p_section": "docs/huey_p_unified_gui_signals_spec.md",
-            "backend_section": "docs/integrated_economic_calendar_matrix_re_entry_system_spec.md",
-        }
-        doc_file = self.doc_dir / doc_map[doc_type]
-        if not doc_file.exists():
-            return False
-        content = doc_file.read_text()
-        pattern = rf"^#+\s*{re.escape(section)}\b"
-        return re.search(pattern, content, re.MULTILINE) is not None
+        return not self.missing_in(doc_type, section)
 
 
 def main() -> None:
@@ -57,10 +197,35 @@ def main() -> None:
     parser.add_argument(
         "--doc-dir", default=".", help="Directory containing documentation files"
     )
+    parser.add_argument(
+        "--doc-map",
+        type=Path,
+        default=None,
+        help=f"JSON map of section keys to documents (default: {DEFAULT_DOC_MAP_FILE} if present)",
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="Indexing threads")
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const="",
+        metavar="SOCKET",
+        help="Ask a running spec_daemon.py first; validate in-process if none answers",
+    )
     args = parser.parse_args()
 
-    validator = CrossReferenceValidator(args.cross_ref, args.doc_dir)
-    errors = validator.validate_references()
+    errors = None
+    if args.daemon is not None:
+        from spec_daemon import query
+
+        errors = query(
+            "cross-refs",
+            socket_path=args.daemon or None,
+            cross_ref=os.path.abspath(args.cross_ref),
+            doc_dir=os.path.abspath(args.doc_dir),
+            doc_map=os.path.abspath(args.doc_map) if args.doc_map else None,
+        )
+    if errors is None:
+        errors = _validate(args)
     if errors:
         for err in errors:
             print(err)
@@ -68,5 +233,14 @@ def main() -> None:
     print("All cross-references valid")
 
 
+def _validate(args: argparse.Namespace) -> list[str]:
+    doc_map_file = args.doc_map
+    if doc_map_file is None and (Path(args.doc_dir) / DEFAULT_DOC_MAP_FILE).exists():
+        doc_map_file = Path(args.doc_dir) / DEFAULT_DOC_MAP_FILE
+    doc_map = load_doc_map(doc_map_file) if doc_map_file else None
+    validator = CrossReferenceValidator(args.cross_ref, args.doc_dir, doc_map, args.jobs)
+    return validator.validate_references()
+
+
 if __name__ == "__main__":
     main()
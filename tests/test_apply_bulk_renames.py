@@ -0,0 +1,97 @@
+import importlib.util
+import json
+import sys
+import textwrap
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "apply_bulk_renames.py"
+_spec = importlib.util.spec_from_file_location("abr", MODULE_PATH)
+abr = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = abr
+_spec.loader.exec_module(abr)
+
+SPEC = textwrap.dedent(
+    """\
+    See @ECON.007.004 and @ECON.007.0041; a checksum outside scope.
+    <!-- BEGIN:ECON.002.002.001.TABLE.csv_artifacts -->
+    - `a.csv`: `file_seq, checksum`
+    <!-- END:ECON.002.002.001.TABLE.csv_artifacts -->
+    ```csv
+    file_seq,checksum
+    ```
+    <!-- BEGIN:ECON.005.001.001.CTRL.controls_panel -->
+    Controls
+    <!-- END:ECON.005.001.001.CTRL.controls_panel -->
+    <!-- BEGIN:ECON.005.002.001.CTRL.controls_grid -->
+    <!-- DEPS: ECON.001.001 -->
+    <!-- END:ECON.005.002.001.CTRL.controls_grid -->
+    """
+)
+
+
+def _configs(tmp_path):
+    renames = tmp_path / "renames.json"
+    renames.write_text(
+        json.dumps(
+            {
+                "edits": [
+                    {"kind": "crossref-fix", "search": "@ECON.007.004", "replace": "@ECON.007.003"},
+                    {
+                        "kind": "field-rename",
+                        "search_regex": r"\bchecksum\b",
+                        "replace": "checksum_sha256",
+                        "scope_hint": "Within TABLE.*csv_artifacts and CSV examples",
+                    },
+                ]
+            }
+        )
+    )
+    ops = tmp_path / "ops.json"
+    ops.write_text(
+        json.dumps(
+            {"operations": [{"type": "add_missing_deps", "pattern": "CTRL.*controls", "add_dep": "X.020.001"}]}
+        )
+    )
+    return [renames, ops]
+
+
+def test_single_pass_scoped_renames_and_deps(tmp_path):
+    applier = abr.BulkApplier.from_configs(_configs(tmp_path))
+    lines, counts = applier.apply_lines(SPEC.splitlines(keepends=True))
+    text = "".join(lines)
+    assert "See @ECON.007.003 and @ECON.007.0041; a checksum outside scope." in text
+    assert "`file_seq, checksum_sha256`" in text
+    assert "file_seq,checksum_sha256\n" in text
+    assert "Controls\n<!-- DEPS: X.020.001 -->\n<!-- END:ECON.005.001.001.CTRL.controls_panel" in text
+    assert "<!-- DEPS: ECON.001.001, X.020.001 -->" in text
+    assert sum(counts.values()) == 5
+    # Applying again is a no-op.
+    assert applier.apply_lines(lines)[0] == lines
+
+
+def test_dry_run_and_parallel_apply(tmp_path):
+    applier = abr.BulkApplier.from_configs(_configs(tmp_path))
+    paths = []
+    for name in ("a.md", "b.md"):
+        spec = tmp_path / name
+        spec.write_text(SPEC)
+        paths.append(str(spec))
+    dry = applier.apply_paths(paths, jobs=1, dry_run=True)
+    assert all(r.changed for r in dry)
+    assert "+See @ECON.007.003" in dry[0].diff
+    assert (tmp_path / "a.md").read_text() == SPEC
+
+    applied = applier.apply_paths(paths, jobs=2)
+    assert [r.path for r in applied] == paths
+    assert "checksum_sha256" in (tmp_path / "b.md").read_text()
+
+
+def test_unrecognised_scope_hint_is_rejected(tmp_path):
+    import pytest
+
+    config = tmp_path / "c.json"
+    config.write_text(
+        json.dumps({"edits": [{"search": "a", "replace": "b", "scope_hint": "somewhere nice"}]})
+    )
+    with pytest.raises(ValueError):
+        abr.load_rules([config])
@@ -0,0 +1,53 @@
+import importlib.util
+import json
+from pathlib import Path
+import sys
+
+from block_lint import BlockLinter
+from validate_cross_refs import CrossReferenceValidator, load_doc_map
+
+BENCH_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+sys.path.insert(0, str(BENCH_DIR))
+_spec = importlib.util.spec_from_file_location("run_benchmarks", BENCH_DIR / "run_benchmarks.py")
+run_benchmarks = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = run_benchmarks
+_spec.loader.exec_module(run_benchmarks)
+generators = run_benchmarks.generators
+
+
+def test_generated_spec_is_deterministic_and_lints_clean(tmp_path):
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    generators.write_spec(a, 1500, refs=4000)
+    generators.write_spec(b, 1500, refs=4000)
+
+    assert a.read_bytes() == b.read_bytes()
+    assert a.read_text().count("@ECON.") + a.read_text().count("@HUEY.") == 4000
+    assert BlockLinter.from_config(docs=["ECON"]).lint_file(a).ok
+
+
+def test_generated_cross_refs_report_only_the_planted_misses(tmp_path):
+    paths = generators.write_cross_refs(tmp_path, 500)
+    refs = json.loads(paths["cross_ref"].read_text())
+    validator = CrossReferenceValidator(
+        paths["cross_ref"], paths["doc_dir"], load_doc_map(paths["doc_map"])
+    )
+    errors = validator.validate_references()
+
+    assert sum(len(items) for items in refs.values()) == 500
+    assert errors and len(errors) < 50
+    assert all("backend_section" in e or "shared definition" in e for e in errors)
+
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    baseline = {"lint": {"1000": {"seconds": 1.0, "peak_rss_kb": 10_000}}}
+    results = {
+        "lint": {"1000": {"seconds": 1.6, "peak_rss_kb": 13_000}},
+        "new_case": {"10": {"seconds": 9.0, "peak_rss_kb": 1}},
+    }
+
+    regressions = run_benchmarks.compare(results, baseline, time_tolerance=0.5, rss_tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("lint [1000]: 1.600s vs baseline 1.000s")
+    assert "peak RSS" in regressions[1]
+    assert run_benchmarks.compare(results, baseline, time_tolerance=1.0, rss_tolerance=0.5) == []
@@ -0,0 +1,47 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "block_graph.py"
+_spec = importlib.util.spec_from_file_location("block_graph", MODULE_PATH)
+block_graph = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = block_graph
+_spec.loader.exec_module(block_graph)
+
+
+def block(bid, deps="None", affects="None"):
+    return (
+        f"<!-- BEGIN:{bid} -->\nbody\n<!-- DEPS: {deps} -->\n"
+        f"<!-- AFFECTS: {affects} -->\n<!-- END:{bid} -->\n"
+    )
+
+
+def test_prefix_wildcard_impact_and_cycles(tmp_path):
+    spec = tmp_path / "spec.md"
+    spec.write_text(
+        block("ECON.001.001.001.DEF.root", affects="ECON.003.***")
+        + block("ECON.002.001.001.REQ.a", deps="ECON.001.001.001.DEF.root")
+        + block("ECON.002.002.001.TABLE.b", deps="ECON.2.1")
+        + block("ECON.003.001.001.FLOW.c")
+        + block("ECON.004.001.001.FLOW.d", deps="ECON.004.002", affects="ECON.009")
+        + block("ECON.004.002.001.FLOW.e", deps="ECON.004.001")
+    )
+    graph = block_graph.BlockGraph.from_paths([str(spec)])
+    assert len(graph.nodes) == 6
+    assert graph.resolve("ECON.002") == ["ECON.002.001.001.REQ.a", "ECON.002.002.001.TABLE.b"]
+
+    result = graph.impact(["ECON.001.001.001.DEF.root"])
+    assert result["affected"] == [
+        "ECON.002.001.001.REQ.a",
+        "ECON.002.002.001.TABLE.b",
+        "ECON.003.001.001.FLOW.c",
+    ]
+    assert graph.impact(["ECON.004.001"])["affected"] == ["ECON.004.002.001.FLOW.e"]
+    assert graph.impact(["ECON.404"])["unknown"] == ["ECON.404"]
+
+    assert graph.cycles() == [["ECON.004.001.001.FLOW.d", "ECON.004.002.001.FLOW.e"]]
+    exported = graph.to_dict()
+    assert exported["unresolved"] == [
+        {"block": "ECON.004.001.001.FLOW.d", "kind": "AFFECTS", "ref": "ECON.009"}
+    ]
+    assert exported["affects"]["ECON.002.001.001.REQ.a"] == ["ECON.002.002.001.TABLE.b"]
@@ -0,0 +1,79 @@
+import importlib.util
+from pathlib import Path
+import sys
+import textwrap
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "block_lint.py"
+_spec = importlib.util.spec_from_file_location("block_lint", MODULE_PATH)
+block_lint = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = block_lint
+_spec.loader.exec_module(block_lint)
+
+META = "file_seq created_at_utc checksum_sha256\n"
+
+
+def _spec_file(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(META + textwrap.dedent(body))
+    return str(path)
+
+
+def test_lint_paths_in_pool_with_custom_prefix(tmp_path):
+    good = _spec_file(
+        tmp_path,
+        "good.md",
+        """
+        <!-- BEGIN:FOO.001.002.001.NOTE.item -->
+        see @FOO.1.2
+        <!-- END:FOO.001.002.001.NOTE.item -->
+        """,
+    )
+    bad = _spec_file(
+        tmp_path,
+        "bad.md",
+        """
+        <!-- BEGIN:FOO.001.002.001.NOTE.item -->
+        see @FOO.9.9
+        """,
+    )
+    linter = block_lint.BlockLinter({"FOO": ["NOTE"]})
+    results = linter.lint_paths([good, bad], jobs=2)
+    assert [r.path for r in results] == [good, bad]
+    assert results[0].exit_status == 0
+    assert results[1].errors == [
+        "3: Unclosed BEGIN: FOO.001.002.001.NOTE.item",
+        "Cross-ref @FOO.9.9 has no matching section prefix among block IDs",
+    ]
+
+
+def test_read_index_and_expand_targets(tmp_path):
+    index = tmp_path / "_index.yaml"
+    index.write_text("econ:\n- a.md\n- b.md\nhuey:\n- c.md\n")
+    sections = block_lint.read_index(index)
+    assert sections["econ"] == [str(tmp_path / "a.md"), str(tmp_path / "b.md")]
+    for name in ("a.md", "b.md"):
+        (tmp_path / name).write_text("")
+    targets = block_lint.expand_targets([str(tmp_path / "*.md"), str(tmp_path / "a.md")])
+    assert targets == [str(tmp_path / "a.md"), str(tmp_path / "b.md")]
+
+
+def test_lint_lines_streams_in_bounded_memory():
+    import tracemalloc
+
+    def spec_lines(filler):
+        yield "see @FOO.1.2 before its section\n"
+        for _ in range(filler):
+            yield "padding line without markers or references\n"
+        yield "<!-- BEGIN:FOO.001.002.001.NOTE.item -->\n"
+        yield "file_seq created_at_utc checksum_sha256\n"
+        yield "<!-- END:FOO.001.002.001.NOTE.item -->\n"
+
+    linter = block_lint.BlockLinter({"FOO": ["NOTE"]})
+    tracemalloc.start()
+    try:
+        errors = linter.lint_lines(spec_lines(50_000))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert errors == []
+    assert peak < 256 * 1024
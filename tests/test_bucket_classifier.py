@@ -0,0 +1,49 @@
+import importlib.util
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "bucket_classifier.py"
+_spec = importlib.util.spec_from_file_location("bcl", MODULE_PATH)
+bcl = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = bcl
+_spec.loader.exec_module(bcl)
+
+
+def test_registry_buckets_gaps_and_shared_bounds():
+    proximity = bcl.load_classifier("proximity_buckets")
+    result = proximity.classify([0, 20, 20.5, 21, 90, 91, -1, math.nan])
+    assert result.labels() == ["IM", "IM", None, "SH", "SH", None, None, None]
+    assert list(result.flags) == [0, 0, bcl.GAP, 0, 0, bcl.GAP, bcl.GAP, bcl.INVALID]
+
+    outcome = bcl.load_classifier("outcome_buckets")
+    # -1.0 ends O1 and starts O2: it belongs to O1 and is not an overlap
+    assert outcome.classify([-5, -1.0, -0.5, 0.0]).labels() == ["O1", "O1", "O2", None]
+    assert ("gap", "(-0.25, inf)") in outcome.gaps_and_overlaps()
+
+
+def test_overlaps_and_recompile_on_change(tmp_path):
+    enums = tmp_path / "enums.json"
+    buckets = [
+        {"name": "A", "min_minutes": 0, "max_minutes": 30},
+        {"name": "B", "min_minutes": 20, "max_minutes": 60},
+    ]
+    enums.write_text(json.dumps({"proximity_buckets": buckets}))
+    first = bcl.load_classifier("proximity_buckets", enums)
+    result = first.classify([10, 25, 30, 45])
+    assert result.labels() == ["A", "A", "A", "B"]
+    assert list(result.flags) == [0, bcl.OVERLAP, bcl.OVERLAP, 0]
+    assert result.counts() == {"A": 3, "B": 1, "overlap": 2}
+    assert bcl.load_classifier("proximity_buckets", enums) is first
+
+    # Same content, new mtime: the compiled form is kept
+    os.utime(enums, ns=(1, 1))
+    assert bcl.load_classifier("proximity_buckets", enums) is first
+
+    buckets[1]["min_minutes"] = 31
+    enums.write_text(json.dumps({"proximity_buckets": buckets}))
+    second = bcl.load_classifier("proximity_buckets", enums)
+    assert second is not first
+    assert list(second.classify([25, 30.5]).flags) == [0, bcl.GAP]
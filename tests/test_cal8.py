@@ -0,0 +1,125 @@
+import importlib.util
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+
+def load(name, alias):
+    spec = importlib.util.spec_from_file_location(alias, SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+cal8 = load("cal8", "cal8_mod")
+cstore = load("calendar_store", "cstore")
+
+NOW = datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc)
+
+
+def event(title, ccy="USD", impact="High", time="2025-01-06T12:15:00Z"):
+    return {"title": title, "ccy": ccy, "impact": impact, "event_time_utc": time}
+
+
+def test_codec_matches_spec_examples():
+    codec = cal8.Cal8Codec.from_config()
+    assert codec.encode(event("Non-Farm Employment Change")) == "AUSHNF10"
+    assert codec.encode(event("CPI y/y", ccy="GBP", impact="Medium")) == "EGBMCP10"
+    assert codec.encode(event("Retail Sales"), revision_seq=12) == "AUSHOT19"
+    decoded = cal8.decode("EGBMCP13")
+    assert decoded.country == "GB" and decoded.revision == 3 and decoded.cal5 == "EGBMC"
+    assert str(decoded.with_revision(4)) == "EGBMCP14"
+    with pytest.raises(ValueError):
+        cal8.decode("AUSXNF10")
+
+    cal8s, errors = codec.encode_batch([event("GDP q/q"), event("GDP q/q", ccy="XXX")])
+    assert cal8s == ["AUSHGD10", None]
+    assert errors == [(1, "unknown currency 'XXX'")]
+    cal8s, errors = codec.encode_batch([{**event("GDP q/q"), "title": ["GDP"]}, event("GDP q/q")])
+    assert cal8s == [None, "AUSHGD10"]
+    assert errors[0][0] == 0 and errors[0][1].startswith("malformed event")
+
+
+def test_import_upserts_only_new_and_revised(tmp_path):
+    with cstore.CalendarStore(tmp_path / "cal.sqlite") as store:
+        batch = [
+            event("Non-Farm Employment Change"),
+            event("Interest Rate Decision", ccy="EUR", time="2025-01-06T13:00:00Z"),
+            event("Unknown", ccy="XXX"),
+        ]
+        result = store.import_events(batch, now=NOW)
+        assert (result.inserted, result.unchanged, [i for i, _ in result.errors]) == (2, 0, [2])
+        rows = {r["title"]: r for r in store.events()}
+        assert rows["Non-Farm Employment Change"]["proximity"] == "IM"
+        assert rows["Interest Rate Decision"]["proximity"] == "SH"
+
+        # Re-import: NFP rescheduled, rate decision unchanged
+        batch[0] = event("Non-Farm Employment Change", time="2025-01-06T14:00:00Z")
+        result = store.import_events(batch[:2], now=NOW)
+        assert (result.inserted, result.unchanged) == (0, 1)
+        assert result.revised == [("AUSHNF10", "AUSHNF11")]
+        nfp = store.events("USD")[0]
+        assert (nfp["revision_seq"], nfp["proximity"]) == (1, None)
+
+        assert store.bump_revisions([("EUR", "Interest Rate Decision", "2025-01-06")]) == 1
+        assert store.events("EUR")[0]["cal8"] == "EEUHRD11"
+
+        later = datetime(2025, 1, 6, 12, 50, tzinfo=timezone.utc)
+        assert store.refresh_proximity(later) == 2
+        assert store.events("EUR")[0]["proximity"] == "IM"
+        assert store.events("USD")[0]["proximity"] == "SH"
+        assert store.refresh_proximity(later) == 0
+
+
+def test_reschedule_across_midnight_revises_in_place(tmp_path):
+    with cstore.CalendarStore(tmp_path / "cal.sqlite") as store:
+        other = event("Retail Sales", time="2025-01-06T15:00:00Z")
+        store.import_events([event("GDP q/q", time="2025-01-06T13:30:00Z"), other], now=NOW)
+        result = store.import_events(
+            [event("GDP q/q", time="2025-01-07T00:30:00Z"), other], now=NOW
+        )
+        assert (result.inserted, result.unchanged) == (0, 1)
+        assert result.revised == [("AUSHGD10", "AUSHGD11")]
+        rows = [r for r in store.events("USD") if r["title"] == "GDP q/q"]
+        assert len(rows) == 1
+        assert (rows[0]["event_date"], rows[0]["event_time_utc"], rows[0]["revision_seq"]) == (
+            "2025-01-07", "2025-01-07T00:30:00Z", 1
+        )
+
+        # A released occurrence is history, not a candidate for a reschedule
+        later = datetime(2025, 1, 7, 1, 0, tzinfo=timezone.utc)
+        result = store.import_events(
+            [event("GDP q/q", time="2025-01-08T00:15:00Z"),
+             event("Retail Sales", time="2025-01-07T15:00:00Z")],
+            now=later,
+        )
+        assert (result.inserted, result.revised) == (2, [])
+
+
+def test_delta_batch_does_not_move_rows_of_uncovered_days(tmp_path):
+    speech = "ECB President Lagarde Speaks"
+    with cstore.CalendarStore(tmp_path / "cal.sqlite") as store:
+        store.import_events([event(speech, ccy="EUR", time="2025-01-06T14:00:00Z")], now=NOW)
+        result = store.import_events(
+            [event(speech, ccy="EUR", time="2025-01-07T09:00:00Z")], now=NOW
+        )
+        assert (result.inserted, result.revised) == (1, [])
+        rows = store.events("EUR")
+        assert [(r["event_date"], r["revision_seq"]) for r in rows] == [
+            ("2025-01-06", 0), ("2025-01-07", 0)
+        ]
+
+        # An explicit previous slot moves the row, however far it moved
+        moved = event(speech, ccy="EUR", time="2025-01-09T09:00:00Z")
+        moved["previous_event_time_utc"] = "2025-01-07T09:00:00Z"
+        result = store.import_events([moved], now=NOW)
+        assert (result.inserted, len(result.revised)) == (0, 1)
+        rows = store.events("EUR")
+        assert [(r["event_date"], r["revision_seq"]) for r in rows] == [
+            ("2025-01-06", 0), ("2025-01-09", 1)
+        ]
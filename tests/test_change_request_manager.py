@@ -16,3 +16,37 @@ def test_full_workflow(tmp_path):
     assert in_review["reviewers"] == ["alice", "bob"]
     assert crm.resolve_request(req["id"], db_path=db)
     assert crm.list_requests(status="resolved", db_path=db)[0]["id"] == req["id"]
+
+
+def test_sqlite_backend_and_json_round_trip(tmp_path):
+    db = tmp_path / "cr.db"
+    first = crm.add_request("CR1", branch="feature", db_path=db)
+    second = crm.add_request("CR2", branch="other", db_path=db)
+    crm.start_review(first["id"], ["alice", "bob"], db_path=db)
+    crm.start_review(second["id"], ["bob"], db_path=db)
+    assert [r["id"] for r in crm.find_by_branch("feature", db_path=db)] == [first["id"]]
+    assert [r["id"] for r in crm.requests_for_reviewer("bob", db_path=db)] == [1, 2]
+    assert crm.list_requests(status="in_review", branch="other", db_path=db)[0]["title"] == "CR2"
+
+    exported = tmp_path / "cr.json"
+    assert crm.export_requests(exported, db_path=db) == 2
+    assert crm.load_requests(exported) == crm.load_requests(db)
+    copy = tmp_path / "copy.sqlite"
+    assert crm.import_requests(exported, db_path=copy) == 2
+    assert crm.get_request(1, db_path=copy)["reviewers"] == ["alice", "bob"]
+
+
+def test_apply_operations_batch(tmp_path):
+    import pytest
+
+    db = tmp_path / "cr.json"
+    ops = [{"op": "add", "title": f"CR{i}", "branch": "b"} for i in range(1, 4)]
+    ops += [{"op": "start-review", "id": 2, "reviewers": ["alice"]}, {"op": "resolve", "id": 9}]
+    results = crm.apply_operations(ops, db_path=db)
+    assert [r["id"] for r in results[:3]] == [1, 2, 3]
+    assert results[3:] == [True, False]
+    assert crm.requests_for_reviewer("alice", db_path=db)[0]["id"] == 2
+
+    with pytest.raises(ValueError):
+        crm.apply_operations([{"op": "add", "title": "x"}, {"op": "bogus"}], db_path=db)
+    assert len(crm.load_requests(db)) == 3
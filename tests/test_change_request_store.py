@@ -0,0 +1,64 @@
+import importlib.util
+from pathlib import Path
+import json
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "change_request_store.py"
+_spec = importlib.util.spec_from_file_location("crs", MODULE_PATH)
+crs = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(crs)
+
+
+def _record(req_id, status="open"):
+    return {"id": req_id, "title": f"CR{req_id}", "status": status, "reviewers": []}
+
+
+def test_journal_replay_and_compaction(tmp_path):
+    db = tmp_path / "cr.json"
+    db.write_text(json.dumps([_record(1), _record(2, "resolved")], indent=2))
+    store = crs.JsonStore(db, compact_threshold=3)
+    assert store.get(2)["status"] == "resolved"
+
+    store.add(_record(3))
+    store.update(1, status="in_review", reviewers=["alice"])
+    assert crs.journal_path(db).exists()
+    assert json.loads(db.read_text())[0]["status"] == "open"
+
+    reopened = crs.JsonStore(db)
+    assert [r["id"] for r in reopened.with_status("open")] == [3]
+    assert reopened.get(1)["reviewers"] == ["alice"]
+    assert reopened.next_id == 4
+
+    store.update(3, status="resolved")
+    assert not crs.journal_path(db).exists()
+    assert [r["status"] for r in json.loads(db.read_text())] == ["in_review", "resolved", "resolved"]
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    db = tmp_path / "cr.json"
+    store = crs.JsonStore(db)
+    store.add(_record(1))
+    with crs.journal_path(db).open("a") as f:
+        f.write('{"op": "add", "record": {"id": 2')
+    assert [r["id"] for r in crs.JsonStore(db).all()] == [1]
+
+
+def test_concurrent_writers_never_reuse_ids(tmp_path):
+    import multiprocessing
+
+    db = tmp_path / "cr.json"
+
+    def writer(n):
+        store = crs.JsonStore(db, compact_threshold=7)
+        for i in range(20):
+            with store.transaction():
+                store.add(_record(store.next_id) | {"title": f"w{n}-{i}"})
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=writer, args=(n,)) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    records = crs.JsonStore(db).all()
+    assert sorted(r["id"] for r in records) == list(range(1, 81))
+    assert len({r["title"] for r in records}) == 80
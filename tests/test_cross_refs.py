@@ -22,3 +22,29 @@ def test_cross_refs_missing_shared(tmp_path):
     validator = validator_module.CrossReferenceValidator(temp, Path(__file__).resolve().parents[1])
     errors = validator.validate_references()
     assert any("Missing shared definition" in e for e in errors)
+
+
+def test_heading_index_matches_section_prefixes(tmp_path):
+    doc = tmp_path / "spec.md"
+    doc.write_text("# Title\n## §3.2 Identifiers\n### 13.4 CSV Contracts\ntext §9.9\n")
+    index = validator_module.HeadingIndex.from_file(doc)
+    assert "§3.2" in index and "§3" in index
+    assert "§13.4" in index and "13.4" in index
+    assert "§3.21" not in index and "§1" not in index and "§9.9" not in index
+
+
+def test_cross_refs_checked_in_every_mapped_document(tmp_path):
+    (tmp_path / "a.md").write_text("## §3.2 Identifiers\n## §3.4 Hybrid ID\n## §5 Signals\n")
+    (tmp_path / "b.md").write_text("## 3.2 Identifiers\n## 5) Signals\n")
+    validator = validator_module.CrossReferenceValidator(
+        "config/cross_refs.yml",
+        tmp_path,
+        doc_map={"huey_p_section": ["a.md", "b.md"]},
+        jobs=2,
+    )
+    errors = [e for e in validator.validate_references() if e.startswith("Missing section")]
+    assert errors == [
+        "Missing section §3.4 in huey_p_section (b.md) for hybrid_id",
+        "Missing section §13.4 in huey_p_section (a.md) for csv_contracts",
+        "Missing section §13.4 in huey_p_section (b.md) for csv_contracts",
+    ]
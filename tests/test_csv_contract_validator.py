@@ -0,0 +1,119 @@
+import csv
+import importlib.util
+import sys
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "csv_contract_validator.py"
+_spec = importlib.util.spec_from_file_location("ccv", MODULE_PATH)
+ccv = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = ccv
+_spec.loader.exec_module(ccv)
+
+COLUMNS = [
+    "symbol", "cal8", "cal5", "signal_type", "proximity", "event_time_utc",
+    "state", "priority_weight", "file_seq", "created_at_utc", "checksum",
+]
+
+
+def signal_row(seq, **overrides):
+    row = {
+        "symbol": "EURUSD",
+        "cal8": "AB12CD34",
+        "cal5": "AB12C",
+        "signal_type": "ECO_HIGH_USD",
+        "proximity": "IM",
+        "event_time_utc": "2025-01-01T12:30:00Z",
+        "state": "ACTIVE, pending",
+        "priority_weight": "0.75",
+        "file_seq": str(seq),
+        "created_at_utc": "2025-01-01T12:00:00Z",
+    }
+    row.update(overrides)
+    fields = [row[c] for c in COLUMNS[:-1]]
+    return fields + [row.pop("checksum", None) or ccv.row_checksum(fields)]
+
+
+def write_csv(path, rows, header=COLUMNS):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_valid_file_and_row_errors(tmp_path):
+    contracts = ccv.load_contracts()
+    good = write_csv(tmp_path / "active_calendar_signals.csv", [signal_row(i) for i in range(1, 50)])
+    report = ccv.validate_file(good, contracts, chunk_rows=7)
+    assert report.ok, report.errors
+    assert (report.rows, report.first_seq, report.last_seq) == (49, 1, 49)
+
+    tampered = signal_row(3)
+    tampered[6] = "EXPIRED"
+    rows = [
+        signal_row(1),
+        signal_row(2, signal_type="NOT_AN_ENUM"),
+        tampered,
+        signal_row(1, event_time_utc="2025-01-01 12:30"),
+    ]
+    bad = write_csv(tmp_path / "active_calendar_signals_x.csv", rows)
+    report = ccv.validate_file(bad, contracts, contract_name="active_calendar_signals", chunk_rows=2)
+    assert any(e.startswith("line 3: signal_type='NOT_AN_ENUM'") for e in report.errors)
+    assert "line 4: checksum mismatch" in report.errors
+    assert any(e.startswith("line 5: event_time_utc=") for e in report.errors)
+    assert "line 5: file_seq 1 decreases from 3" in report.errors
+
+
+def test_multiline_field_is_not_split_into_valid_values(tmp_path):
+    contracts = ccv.load_contracts()
+    symbol = contracts["active_calendar_signals"].columns["symbol"]
+    assert symbol.bad_rows(["ABC\nDEF", "XYZ"]) == [0]
+
+    # csv.writer quotes the embedded newline, so it is one field of one row
+    rows = [signal_row(1, symbol="EUR\nUSD"), signal_row(2)]
+    path = write_csv(tmp_path / "active_calendar_signals.csv", rows)
+    report = ccv.validate_file(path, contracts)
+    assert [e.split(":")[0] for e in report.errors] == ["line 2"]
+    assert "symbol=" in report.errors[0]
+
+
+def test_header_alias_and_missing_columns(tmp_path):
+    contracts = ccv.load_contracts()
+    aliased = COLUMNS[:-1] + ["checksum_sha256"]
+    path = write_csv(tmp_path / "active_calendar_signals.csv", [signal_row(1)], header=aliased)
+    assert ccv.validate_file(path, contracts).ok
+
+    path = write_csv(tmp_path / "reentry_decisions.csv", [], header=["hybrid_id", "checksum"])
+    report = ccv.validate_file(path, contracts)
+    assert report.errors[0].startswith("missing columns: parameter_set_id")
+
+
+def test_file_seq_must_increase_across_rotated_files(tmp_path):
+    contracts = ccv.load_contracts()
+    base = "active_calendar_signals"
+    write_csv(tmp_path / f"{base}_20250101T000000Z_000001.csv", [signal_row(1), signal_row(2)])
+    write_csv(tmp_path / f"{base}_20250101T000000Z_000002.csv", [signal_row(3)])
+    write_csv(tmp_path / f"{base}_20250101T010000Z_000001.csv", [signal_row(3)])
+    reports, sequence_errors = ccv.validate_paths([str(tmp_path)], contracts, jobs=2)
+    assert all(r.ok for r in reports)
+    assert len(sequence_errors) == 1
+    assert "20250101T010000Z_000001.csv: file_seq 3 does not follow 3" in sequence_errors[0]
+
+
+def test_hybrid_id_column_uses_the_registry_codec(tmp_path):
+    contracts = ccv.load_contracts()
+    header = list(contracts["reentry_decisions"].columns)
+
+    def decision(seq, hybrid_id):
+        fields = [hybrid_id, "PS1", "0.1", "20", "40", "0", "", str(seq), "2025-01-01T12:00:00Z"]
+        return fields + [ccv.row_checksum(fields)]
+
+    rows = [
+        decision(1, "AUSHNF10-O-ECO_HIGH_USD-FL-O1-IM-EURUSD"),
+        decision(2, "AUSHNF10-O-ECO_HIGH_USD-FL-O4-LG-EURUSD"),
+        decision(3, "AUSHNF10-O-NOT_A_SIGNAL-FL-O1-IM-EURUSD"),
+    ]
+    path = write_csv(tmp_path / "reentry_decisions.csv", rows, header=header)
+    report = ccv.validate_file(path, contracts)
+    assert [e.split(":")[0] for e in report.errors] == ["line 3", "line 4"]
+    assert all("valid hybrid ID" in e for e in report.errors)
@@ -0,0 +1,67 @@
+import hashlib
+import importlib.util
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+_spec = importlib.util.spec_from_file_location("csvw", SCRIPTS / "csv_writer.py")
+csvw = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = csvw
+_spec.loader.exec_module(csvw)
+
+import csv_contract_validator as ccv
+
+BASE = "active_calendar_signals"
+
+
+def clock():
+    return datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def signal(i):
+    return {
+        "symbol": "EURUSD",
+        "cal8": "AB12CD34",
+        "cal5": "AB12C",
+        "signal_type": "ECO_HIGH_USD",
+        "proximity": "IM",
+        "event_time_utc": "2025-01-01T12:30:00Z",
+        "state": f"ACTIVE, {i}",
+        "priority_weight": 0.5,
+    }
+
+
+def test_rotation_and_sequences_validate(tmp_path):
+    with csvw.CsvWriter(tmp_path, BASE, max_rows=10, batch_rows=4, clock=clock) as writer:
+        assert writer.write_rows(signal(i) for i in range(25)) == 25
+    assert [w.rows for w in writer.written] == [10, 10, 5]
+    assert writer.written[0].path.name == f"{BASE}_20250102T030405Z_000001.csv"
+    assert [(w.first_seq, w.last_seq) for w in writer.written][-1] == (21, 25)
+
+    # A second run continues file_seq and the file sequence number.
+    columns = {c: [v] * 3 for c, v in signal(0).items()}
+    with csvw.CsvWriter(tmp_path, BASE, max_bytes=500, clock=clock) as writer:
+        writer.write_columns(columns)
+    assert writer.written[0].path.name.endswith("_000004.csv")
+    assert all(w.bytes <= 500 for w in writer.written)
+    assert len(writer.written) > 1
+    assert writer.written[-1].last_seq == 28
+    assert not list(tmp_path.glob("*.tmp")) and not list(tmp_path.glob(".*.tmp"))
+
+    reports, sequence_errors = ccv.validate_paths([str(tmp_path)], ccv.load_contracts(), jobs=1)
+    assert sequence_errors == []
+    assert all(r.ok for r in reports), [r.errors for r in reports]
+    assert sum(r.rows for r in reports) == 28
+    data = writer.written[0].path.read_bytes()
+    assert hashlib.sha256(data).hexdigest() == writer.written[0].sha256
+
+
+def test_failed_write_leaves_no_partial_file(tmp_path):
+    with pytest.raises(KeyError):
+        with csvw.CsvWriter(tmp_path, BASE, clock=clock) as writer:
+            writer.write_rows([signal(0), {"symbol": "X"}])
+    assert list(tmp_path.glob("*.csv")) == []
+    assert list(tmp_path.glob(".*.tmp")) == []
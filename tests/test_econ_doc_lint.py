@@ -62,3 +62,23 @@ def test_invalid_spec_fails(invalid_spec, monkeypatch, capsys):
     captured = capsys.readouterr()
     assert "END id mismatch" in captured.out
     assert "Missing required CSV meta field in doc: checksum_sha256" in captured.out
+
+
+def test_unresolved_cross_ref_reported(tmp_path, monkeypatch, capsys):
+    content = textwrap.dedent(
+        """
+        file_seq created_at_utc checksum_sha256
+
+        <!-- BEGIN:ECON.001.002.003.DEF.sample -->
+        see @ECON.1.2 and @ECON.001.003
+        <!-- END:ECON.001.002.003.DEF.sample -->
+        """
+    ).strip()
+    path = tmp_path / "refs.md"
+    path.write_text(content)
+    monkeypatch.setattr(sys, "argv", ["prog", str(path)])
+    with pytest.raises(SystemExit):
+        lint_module.main()
+    captured = capsys.readouterr()
+    assert "@ECON.1.2" not in captured.out
+    assert "Cross-ref @ECON.001.003 has no matching section prefix" in captured.out
@@ -1,10 +1,13 @@
 import importlib.util
+import sys
 from pathlib import Path
 import json
 
 MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "generate_docs.py"
 _spec = importlib.util.spec_from_file_location("gen", MODULE_PATH)
 gen = importlib.util.module_from_spec(_spec)
+# Registered so the process pool can pickle references to its functions.
+sys.modules[_spec.name] = gen
 _spec.loader.exec_module(gen)
 
 
@@ -16,3 +19,66 @@ def test_render_template(tmp_path):
     output = tmp_path / "out.md"
     gen.render_template(template, data, output)
     assert output.read_text() == "Hello, World!"
+
+
+def test_render_batch_dataset_and_manifest(tmp_path):
+    template = tmp_path / "t.tpl"
+    template.write_text("$SYMBOL: $RATE")
+    rows = tmp_path / "rows.jsonl"
+    rows.write_text("".join(json.dumps({"SYMBOL": f"S{i}", "RATE": i}) + "\n" for i in range(7)))
+    out = tmp_path / "out"
+    jobs = [(template, rows, str(out / "{SYMBOL}.md"))]
+    assert gen.render_batch(jobs, jobs=2, chunk_size=3) == 7
+    assert (out / "S6.md").read_text() == "S6: 6"
+
+    (tmp_path / "rows.csv").write_text("SYMBOL,RATE\nEUR,1.1\nGBP,1.3\n")
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(
+        json.dumps({"template": "t.tpl", "data": "rows.csv", "output": "csv/{_index}.md"}) + "\n"
+    )
+    assert gen.render_batch(gen.read_manifest(manifest), jobs=1) == 2
+    assert (tmp_path / "csv" / "1.md").read_text() == "GBP: 1.3"
+
+
+def test_build_manifest_skips_unchanged_outputs(tmp_path):
+    from build_manifest import BuildManifest
+
+    template = tmp_path / "t.tpl"
+    template.write_text("$SYMBOL")
+    rows = tmp_path / "rows.jsonl"
+    rows.write_text('{"SYMBOL": "EUR"}\n{"SYMBOL": "GBP"}\n')
+    jobs = [(template, rows, str(tmp_path / "out" / "{SYMBOL}.md"))]
+    manifest = BuildManifest(tmp_path / "build.json")
+    assert gen.render_batch(jobs, jobs=1, manifest=manifest) == 2
+    eur = tmp_path / "out" / "EUR.md"
+    mtime = eur.stat().st_mtime_ns
+
+    rows.write_text('{"SYMBOL": "EUR"}\n{"SYMBOL": "GBP", "X": 1}\n')
+    manifest = BuildManifest(tmp_path / "build.json")
+    # GBP's record changed but renders the same text, so nothing is rewritten.
+    assert gen.render_batch(jobs, jobs=1, manifest=manifest) == 0
+    assert eur.stat().st_mtime_ns == mtime
+
+    eur.write_text("edited")
+    assert gen.render_batch(jobs, jobs=2, manifest=BuildManifest(tmp_path / "build.json")) == 1
+    assert eur.read_text() == "EUR"
+
+
+def test_force_rerenders_and_still_records_outputs(tmp_path):
+    from build_manifest import BuildManifest
+
+    template = tmp_path / "t.tpl"
+    template.write_text("$SYMBOL")
+    rows = tmp_path / "rows.jsonl"
+    rows.write_text('{"SYMBOL": "EUR"}\n{"SYMBOL": "GBP"}\n')
+    jobs = [(template, rows, str(tmp_path / "out" / "{SYMBOL}.md"))]
+    assert gen.render_batch(jobs, jobs=1, manifest=BuildManifest(tmp_path / "build.json"), force=True) == 2
+    assert gen.render_batch(jobs, jobs=1, manifest=BuildManifest(tmp_path / "build.json")) == 0
+
+    data = tmp_path / "data.json"
+    data.write_text('{"SYMBOL": "JPY"}')
+    output = tmp_path / "one.md"
+    manifest = BuildManifest(tmp_path / "one.json")
+    assert gen.render_template(template, data, output, manifest, force=True)
+    assert not gen.render_template(template, data, output, manifest)
+    assert output.read_text() == "JPY"
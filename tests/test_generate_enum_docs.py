@@ -23,3 +23,44 @@ def test_enum_doc_generation(tmp_path):
     assert "# Colors" in text
     assert "RED" in text and "BLUE" in text
 
+
+def test_enum_doc_generation_is_incremental(tmp_path):
+    from build_manifest import BuildManifest
+
+    schema = tmp_path / "enums.json"
+    schema.write_text(json.dumps({"colors": [{"name": "RED"}]}))
+    out = tmp_path / "out.md"
+    with BuildManifest(tmp_path / "build.json") as manifest:
+        assert ged.generate(schema, out, manifest)
+    with BuildManifest(tmp_path / "build.json") as manifest:
+        assert not ged.generate(schema, out, manifest)
+    schema.write_text(json.dumps({"colors": [{"name": "BLUE"}]}))
+    with BuildManifest(tmp_path / "build.json") as manifest:
+        assert ged.generate(schema, out, manifest)
+    assert "BLUE" in out.read_text()
+    with BuildManifest(tmp_path / "build.json") as manifest:
+        assert ged.generate(schema, out, manifest, force=True)
+    with BuildManifest(tmp_path / "build.json") as manifest:
+        assert not ged.generate(schema, out, manifest)
+
+
+def test_partial_regeneration_splices_changed_sections(tmp_path):
+    schema = tmp_path / "enums.json"
+    data = {
+        "colors": [{"name": "RED"}, {"name": "BLUE", "hex": "#00f"}],
+        "sizes": [{"name": "S"}],
+    }
+    schema.write_text(json.dumps(data))
+    out = tmp_path / "out.md"
+    assert ged.generate(schema, out) == ["colors", "sizes"]
+    assert "| Name | Hex |" in out.read_text()
+
+    # A hand edit inside an unchanged section survives a partial run.
+    out.write_text(out.read_text().replace("| S |", "| S (small) |"))
+    data["colors"].append({"name": "GREEN"})
+    schema.write_text(json.dumps(data))
+    assert ged.generate(schema, out, partial=True) == ["colors"]
+    text = out.read_text()
+    assert "GREEN" in text and "| S (small) |" in text
+    assert ged.generate(schema, out) == ["colors", "sizes"]
+    assert "| S |" in out.read_text()
@@ -0,0 +1,47 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "hybrid_id.py"
+_spec = importlib.util.spec_from_file_location("hid", MODULE_PATH)
+hid = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = hid
+_spec.loader.exec_module(hid)
+
+
+def test_parse_and_errors():
+    codec = hid.HybridIdCodec.from_enums()
+    parsed = codec.parse("AUSHNF10-O-ECO_HIGH_USD-FL-O1-IM-EURUSD")
+    assert parsed.sig == "ECO_HIGH_USD" and parsed.is_calendar
+    assert str(parsed) == "AUSHNF10-O-ECO_HIGH_USD-FL-O1-IM-EURUSD"
+    assert not codec.parse("00000000-R1-VOLATILITY_SPIKE-QK-O2-SH-GBPUSD").is_calendar
+
+    assert codec.errors("00000000-R3-NOT_A_SIGNAL-QK-O2-SH-GBPUSD") == (
+        hid.ERR_COMPONENT["gen"] | hid.ERR_COMPONENT["sig"]
+    )
+    assert codec.errors("AUSHNF10-O-FL") == hid.ERR_FORMAT
+    too_long = "AUSHNF10-O-ECO_HIGH_USD-FL-O1-IM-" + "X" * 40
+    assert codec.errors(too_long) & hid.ERR_LENGTH
+    with pytest.raises(ValueError, match="invalid dur"):
+        codec.parse("AUSHNF10-O-ECO_HIGH_USD-XX-O1-IM-EURUSD")
+
+
+def test_encode_column_and_closed_symbols():
+    codec = hid.HybridIdCodec.from_enums(symbols=["EURUSD"])
+    ids = [
+        "AUSHNF10-O-ECO_HIGH_USD-FL-O1-IM-EURUSD",
+        "00000000-R1-VOLATILITY_SPIKE-QK-O2-SH-GBPUSD",
+        "AUSHNF10-O-ECO_HIGH_USD-FL-O1-IM-EURUSD",
+        "garbage",
+    ]
+    encoded = codec.encode_column(ids)
+    assert len(encoded) == 4 and encoded.invalid == 2
+    assert list(encoded.errors) == [0, hid.ERR_COMPONENT["symbol"], 0, hid.ERR_FORMAT]
+    assert encoded.codes["cal8"][0] == encoded.codes["cal8"][2] == 1
+    assert encoded.codes["symbol"][1] == -1
+    assert codec.row(encoded, 2) == codec.parse(ids[0])
+    assert codec.row(encoded, 3) is None
+    # Decoded components are the interned vocabulary strings
+    assert codec.row(encoded, 0).sig is codec.vocabularies["sig"].values[0]
@@ -0,0 +1,49 @@
+import importlib.util
+from pathlib import Path
+import sys
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "lint_cache.py"
+_spec = importlib.util.spec_from_file_location("lint_cache", MODULE_PATH)
+lint_cache = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = lint_cache
+_spec.loader.exec_module(lint_cache)
+
+DOCS = Path(__file__).resolve().parents[1] / "docs"
+
+
+def test_cached_results_match_full_lint(tmp_path):
+    linter = lint_cache.BlockLinter.from_config()
+    cache = lint_cache.LintCache(linter, tmp_path / "cache")
+    for spec in sorted(DOCS.glob("*.md")):
+        assert cache.lint_file(spec).errors == linter.lint_file(spec).errors
+        assert cache.lint_file(spec).errors == linter.lint_file(spec).errors
+    assert cache.stats["skipped"] == len(list(DOCS.glob("*.md")))
+
+
+def test_only_edited_block_is_rescanned(tmp_path):
+    blocks = []
+    for n in range(1, 4):
+        bid = f"ECON.001.00{n}.001.DEF.item_{n}"
+        blocks.append(
+            f"<!-- BEGIN:{bid} -->\nsee @ECON.001.00{n}\n"
+            f"<!-- DEPS: ECON.002.001 -->\n<!-- END:{bid} -->\n"
+        )
+    spec = tmp_path / "spec.md"
+    spec.write_text("file_seq created_at_utc checksum_sha256\n" + "".join(blocks))
+    linter = lint_cache.BlockLinter.from_config()
+    cache = lint_cache.LintCache(linter, tmp_path / "cache")
+    assert cache.lint_file(spec).ok
+
+    blocks[1] = blocks[1].replace("@ECON.001.002", "@ECON.009.009")
+    spec.write_text("file_seq created_at_utc checksum_sha256\n" + "".join(blocks))
+    cache.stats.clear()
+    result = cache.lint_file(spec)
+    assert result.errors == [
+        "Cross-ref @ECON.009.009 has no matching section prefix among block IDs"
+    ]
+    assert cache.stats["segments_scanned"] == 1
+    assert cache.stats["segments_reused"] == 3
+
+    entry = cache.load_entry(spec)
+    assert [b["start"] for b in entry["blocks"]] == [2, 6, 10]
+    assert all(b["deps"] == ["ECON.002.001"] for b in entry["blocks"])
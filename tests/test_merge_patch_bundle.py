@@ -0,0 +1,69 @@
+import importlib.util
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "merge_patch_bundle.py"
+_spec = importlib.util.spec_from_file_location("mpb", MODULE_PATH)
+mpb = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = mpb
+_spec.loader.exec_module(mpb)
+
+
+def block(bid, body):
+    return f"<!-- BEGIN:{bid} -->\n{body}\n<!-- END:{bid} -->\n"
+
+
+def test_merge_replaces_and_inserts_next_to_siblings(tmp_path):
+    spec = tmp_path / "spec.md"
+    spec.write_text(
+        "# Spec\n\n"
+        + block("ECON.002.001.001.REQ.a", "old a")
+        + "\n"
+        + block("ECON.004.001.001.DEF.c", "c")
+        + "\nTrailer\n"
+    )
+    bundle = tmp_path / "bundle.md"
+    bundle.write_text(
+        "> bundle notes\n"
+        + block("ECON.004.001.002.DEF.d", "d")
+        + block("ECON.002.001.001.REQ.a", "new a")
+        + block("ECON.001.001.001.DEF.first", "first")
+        + block("HUEY.001.001.001.DEF.other", "other")
+    )
+    plan = mpb.merge(bundle, spec)
+    assert plan.replaced == ["ECON.002.001.001.REQ.a"]
+    assert len(plan.inserted) == 3
+    assert spec.read_text() == (
+        "# Spec\n\n"
+        + block("ECON.001.001.001.DEF.first", "first")
+        + "\n"
+        + block("ECON.002.001.001.REQ.a", "new a")
+        + "\n"
+        + block("ECON.004.001.001.DEF.c", "c")
+        + "\n"
+        + block("ECON.004.001.002.DEF.d", "d")
+        + "\nTrailer\n"
+        + "\n"
+        + block("HUEY.001.001.001.DEF.other", "other")
+    )
+    merged = spec.read_text()
+    # Merging the same bundle again only replaces blocks.
+    again = mpb.merge(bundle, spec)
+    assert not again.inserted and spec.read_text() == merged
+
+
+def test_supersede_and_duplicate_ids(tmp_path):
+    spec = tmp_path / "spec.md"
+    spec.write_text(block("ECON.002.001.001.REQ.a", "v1"))
+    bundle = tmp_path / "bundle.md"
+    bundle.write_text(block("ECON.002.001.002.REQ.a", "v2"))
+    assert mpb.merge(bundle, spec, supersede=True).replaced == ["ECON.002.001.002.REQ.a"]
+    assert spec.read_text() == block("ECON.002.001.002.REQ.a", "v2")
+
+    bundle.write_text(block("ECON.002.001.002.REQ.a", "x") * 2)
+    with pytest.raises(ValueError, match="duplicate"):
+        mpb.merge(bundle, spec)
+    assert spec.read_text() == block("ECON.002.001.002.REQ.a", "v2")
@@ -0,0 +1,114 @@
+import csv
+import importlib.util
+import json
+import sys
+import uuid
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "signal_validator.py"
+_spec = importlib.util.spec_from_file_location("sigv", MODULE_PATH)
+sigv = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = sigv
+_spec.loader.exec_module(sigv)
+
+
+def signal(**overrides):
+    record = {
+        "id": str(uuid.uuid4()),
+        "ts": "2025-01-01T12:00:00Z",
+        "source": "breakout_scanner",
+        "symbol": "EURUSD",
+        "kind": "breakout",
+        "direction": "long",
+        "strength": 72,
+        "confidence": "HIGH",
+        "tags": ["london"],
+    }
+    record.update(overrides)
+    return record
+
+
+def test_batch_checks_columns_and_keeps_no_dicts():
+    records = [
+        signal(p=0.6, n=120, notes="x"),
+        signal(strength=140),
+        signal(ts="2025-13-01T00:00:00Z", confidence="SURE"),
+        signal(p=1.5, n=2.5, tags="not-a-list-but-ok"),
+    ]
+    records.append(dict(records[0]))
+    batch = sigv.SignalBatch.from_records(records)
+    errors = batch.validate()
+    assert not hasattr(batch, "__dict__")
+    by_row = {}
+    for row, field, _ in errors:
+        by_row.setdefault(row, set()).add(field)
+    assert by_row == {1: {"strength"}, 2: {"ts", "confidence"}, 3: {"p", "n"}, 4: {"id"}}
+    assert list(batch.valid) == [1, 0, 0, 0, 0]
+    assert batch.record(0)["p"] == 0.6 and batch.record(0)["notes"] == "x"
+    assert batch.record(3)["tags"] == ["not-a-list-but-ok"]
+    assert "p" not in batch.record(1)
+
+
+def test_streams_jsonl_and_csv(tmp_path):
+    jsonl = tmp_path / "signals.jsonl"
+    jsonl.write_text("\n".join(json.dumps(signal()) for _ in range(10)) + "\n")
+    assert sigv.validate_file(jsonl, batch_size=3) == (10, 0, [])
+
+    path = tmp_path / "signals.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, ["id", "ts", "source", "symbol", "kind", "direction",
+                                    "strength", "confidence", "tags", "p"])
+        writer.writeheader()
+        writer.writerow({**signal(), "tags": "a;b", "p": ""})
+        writer.writerow({**signal(direction="up"), "tags": "", "p": "0.4"})
+    total, invalid, messages = sigv.validate_file(path)
+    assert (total, invalid) == (2, 1)
+    assert messages == ["signal 2: direction: 'up' not in long/short/neutral"]
+
+
+def test_empty_text_cells_are_missing(tmp_path):
+    path = tmp_path / "signals.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, ["id", "ts", "source", "symbol", "kind", "direction",
+                                    "strength", "confidence", "tags"])
+        writer.writeheader()
+        writer.writerow({**signal(), "tags": "a", "id": "", "ts": "", "source": "", "symbol": ""})
+    total, invalid, messages = sigv.validate_file(path)
+    assert (total, invalid) == (1, 1)
+    assert sorted(messages) == [
+        f"signal 1: {name}: missing" for name in ("id", "source", "symbol", "ts")
+    ]
+
+
+def test_nan_strength_is_rejected():
+    batch = sigv.SignalBatch.from_records([signal(), signal(strength=float("nan"))])
+    errors = batch.validate()
+    assert [(row, name) for row, name, _ in errors] == [(1, "strength")]
+
+
+def test_malformed_values_are_row_errors(tmp_path):
+    path = tmp_path / "signals.jsonl"
+    path.write_text(
+        "\n".join(
+            json.dumps(record)
+            for record in (
+                signal(),
+                signal(kind=["breakout"]),
+                signal(confidence={}),
+                signal(n=1e20),
+                signal(strength=10**400),
+                signal(id=f"{uuid.uuid4()}\n{uuid.uuid4()}"),
+            )
+        )
+        + "\n"
+    )
+    total, invalid, messages = sigv.validate_file(path)
+    assert (total, invalid) == (6, 5)
+    assert [m.split(":")[:2] for m in messages] == [
+        ["signal 2", " kind"],
+        ["signal 3", " confidence"],
+        ["signal 4", " n"],
+        ["signal 5", " strength"],
+        ["signal 6", " id"],
+    ]
+    assert messages[2] == "signal 4: n: 1e+20 is out of range"
@@ -0,0 +1,70 @@
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import threading
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "spec_daemon.py"
+_spec = importlib.util.spec_from_file_location("spec_daemon", MODULE_PATH)
+spec_daemon = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = spec_daemon
+_spec.loader.exec_module(spec_daemon)
+
+META = "file_seq created_at_utc checksum_sha256\n"
+GOOD = META + "<!-- BEGIN:FOO.001.002.001.NOTE.item -->\n<!-- END:FOO.001.002.001.NOTE.item -->\n"
+
+
+def _config(tmp_path):
+    config = tmp_path / "lint.json"
+    config.write_text(json.dumps({"docs": {"FOO": {"types": ["NOTE"]}}}))
+    return str(config)
+
+
+def test_state_relints_only_changed_files(tmp_path):
+    state = spec_daemon.SpecState()
+    config = _config(tmp_path)
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text(GOOD)
+    b.write_text(GOOD)
+
+    assert all(r.ok for r in state.lint([str(a), str(b)], config))
+    b.write_text(GOOD + "<!-- BEGIN:FOO.001.002.002.NOTE.open -->\n")
+    results = state.lint([str(a), str(b)], config)
+
+    assert results[0].ok
+    assert results[1].errors == ["4: Unclosed BEGIN: FOO.001.002.002.NOTE.open"]
+    assert state.stats["lint_hits"] == 1
+    assert state.stats["lint_misses"] == 3
+
+
+def test_cross_refs_pick_up_edited_document(tmp_path):
+    (tmp_path / "doc.md").write_text("# §1 Intro\n")
+    refs = tmp_path / "refs.json"
+    refs.write_text(json.dumps({"ids": {"cal8": {"spec": "§2"}}}))
+    state = spec_daemon.SpecState()
+    doc_map = tmp_path / "map.json"
+    doc_map.write_text(json.dumps({"spec": "doc.md"}))
+    assert state.cross_refs(refs, tmp_path, doc_map) == [
+        "Missing section §2 in spec (doc.md) for cal8"
+    ]
+    (tmp_path / "doc.md").write_text("# §1 Intro\n## §2 Identifiers\n")
+    assert state.cross_refs(refs, tmp_path, doc_map) == []
+
+
+def test_daemon_serves_queries_until_stopped(tmp_path):
+    sock = tmp_path / "d.sock"
+    server = spec_daemon.SpecDaemon(sock, spec_daemon.SpecState(), interval=60)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    try:
+        spec = tmp_path / "spec.md"
+        spec.write_text(GOOD)
+        reply = spec_daemon.query("lint", socket_path=sock, paths=[str(spec)], config=_config(tmp_path))
+        assert reply == [{"path": str(spec), "errors": []}]
+        assert spec_daemon.query("nope", socket_path=sock) is None
+    finally:
+        assert spec_daemon.query("stop", socket_path=sock) is not None
+        thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert not sock.exists()
+    assert spec_daemon.query("ping", socket_path=sock) is None
@@ -0,0 +1,97 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "spec_index.py"
+_spec = importlib.util.spec_from_file_location("spec_index", MODULE_PATH)
+spec_index = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = spec_index
+_spec.loader.exec_module(spec_index)
+
+SPEC_A = """# Title
+<!-- BEGIN:ECON.002.001.001.REQ.a -->
+## 2.1 Contracts
+See @ECON.002.002 and @ECON.009.001.
+<!-- DEPS: ECON.001 -->
+<!-- AFFECTS: ECON.002.002 -->
+<!-- END:ECON.002.001.001.REQ.a -->
+"""
+SPEC_B = """<!-- BEGIN:ECON.002.002.001.TABLE.b -->
+```
+# not a heading
+```
+<!-- DEPS: ECON.002.001 -->
+<!-- END:ECON.002.002.001.TABLE.b -->
+"""
+
+
+def test_incremental_index_and_queries(tmp_path):
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text(SPEC_A)
+    b.write_text(SPEC_B)
+    db = tmp_path / "index.sqlite"
+    with spec_index.SpecIndex(db) as index:
+        assert index.update([str(a), str(b)], jobs=2) == {"indexed": 2}
+        assert index.update([str(a), str(b)]) == {"unchanged": 2}
+
+        block = index.blocks("ECON.002.001")[0]
+        assert (block["type"], block["start_line"], block["end_line"]) == ("REQ", 2, 7)
+        assert block["deps"] == ["ECON.001"] and block["affects"] == ["ECON.002.002"]
+        assert SPEC_A.encode()[block["start_byte"]:block["end_byte"]].startswith(b"<!-- BEGIN")
+        assert [h["text"] for h in index.headings(str(a))] == ["Title", "2.1 Contracts"]
+        assert index.headings(str(b)) == []
+        assert [r["ref"] for r in index.unresolved_refs()] == ["@ECON.009.001"]
+        assert index.sections() == {("ECON", 2, 1), ("ECON", 2, 2)}
+        assert ("ECON", 2, 1) in index.sections()
+
+        os.utime(b, ns=(1, 1))
+        assert index.update([str(a), str(b)]) == {"touched": 1, "unchanged": 1}
+        b.write_text(SPEC_B.replace("ECON.002.002.001.TABLE.b", "ECON.009.001.001.TABLE.b"))
+        assert index.update([str(a), str(b)]) == {"indexed": 1, "unchanged": 1}
+        assert index.unresolved_refs() == [
+            {"path": str(a.resolve()), "line": 4, "ref": "@ECON.002.002", "block": "ECON.002.001.001.REQ.a"}
+        ]
+        # Updating one file leaves the rest of the index alone.
+        assert index.update([str(a)]) == {"unchanged": 1}
+        assert index.files() == [str(a.resolve()), str(b.resolve())]
+        assert index.update([str(a)], prune=True) == {"unchanged": 1, "removed": 1}
+        assert index.files() == [str(a.resolve())]
+
+        index.update([str(a), str(b)])
+        b.unlink()
+        assert index.update([str(a)]) == {"unchanged": 1, "removed": 1}
+        assert index.files() == [str(a.resolve())]
+
+
+def test_block_graph_reads_the_index(tmp_path):
+    import block_graph
+
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text(SPEC_A)
+    b.write_text(SPEC_B)
+    db = tmp_path / "index.sqlite"
+    with spec_index.SpecIndex(db) as index:
+        index.update([str(a), str(b)], jobs=1)
+    graph = block_graph.BlockGraph.from_index(db)
+    assert graph.impact(["ECON.002.001"])["affected"] == ["ECON.002.002.001.TABLE.b"]
+    assert graph.unresolved == [{"block": "ECON.002.001.001.REQ.a", "kind": "DEPS", "ref": "ECON.001"}]
+
+
+def test_edit_during_parse_is_picked_up_next_update(tmp_path, monkeypatch):
+    a = tmp_path / "a.md"
+    a.write_text(SPEC_A)
+    parse = spec_index._parse_path
+
+    def parse_then_edit(path, *args):
+        result = parse(path, *args)
+        a.write_text(SPEC_B)
+        os.utime(a, ns=(2, 2))
+        return result
+
+    with spec_index.SpecIndex(tmp_path / "index.sqlite") as index:
+        monkeypatch.setattr(spec_index, "_parse_path", parse_then_edit)
+        assert index.update([str(a)], jobs=1) == {"indexed": 1}
+        monkeypatch.setattr(spec_index, "_parse_path", parse)
+        assert index.update([str(a)], jobs=1) == {"indexed": 1}
+        assert [b["id"] for b in index.blocks()] == ["ECON.002.002.001.TABLE.b"]
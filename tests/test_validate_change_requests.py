@@ -1,6 +1,9 @@
 import importlib.util
 from pathlib import Path
 import json
+import sys
+
+import pytest
 
 MODULE_PATH = Path(__file__).resolve().parents[1] / "scripts" / "validate_change_requests.py"
 _spec = importlib.util.spec_from_file_location("vcr", MODULE_PATH)
@@ -32,3 +35,54 @@ def test_validate_change_requests(tmp_path):
     errors = vcr.validate(db2)
     assert errors and "missing impact" in errors[0]
 
+
+def test_streamed_summary_rules_and_max_errors(tmp_path):
+    db = tmp_path / "cr.json"
+    db.write_text(
+        json.dumps(
+            [
+                {"id": 1, "title": "a", "status": "resolved"},
+                {"id": 2, "title": "b", "status": "open", "branch": "x"},
+                {"id": 3, "title": "c", "status": "in_review", "branch": "y", "impact": "i"},
+            ]
+        )
+    )
+    # Journaled mutations that were not compacted yet must be validated too.
+    (tmp_path / "cr.json.journal").write_text(
+        json.dumps({"op": "update", "id": 2, "fields": {"impact": "docs"}})
+        + "\n"
+        + json.dumps({"op": "add", "record": {"id": 4, "title": "d", "status": "open"}})
+        + "\n"
+    )
+    records = list(vcr.iter_records(db))
+    assert [r["id"] for r in records] == [1, 2, 3, 4]
+
+    summary = vcr.summarize(records)
+    assert summary.checked == 4
+    assert summary.per_status == {"resolved": 1, "open": 2, "in_review": 1}
+    assert summary.per_rule == {"reviewers": 1, "impact": 1, "branch": 1}
+    assert summary.oldest_unresolved["id"] == 2
+
+    limited = vcr.summarize(records, max_errors=1)
+    assert limited.truncated and limited.errors == ["Request 3 missing reviewers"]
+    assert limited.per_rule == {"reviewers": 1}
+    # Reaching the limit on the last error, or a zero limit with nothing wrong,
+    # skips nothing.
+    exact = vcr.summarize(records, max_errors=3)
+    assert not exact.truncated and exact.checked == 4 and len(exact.errors) == 3
+    clean = vcr.summarize(records[:1], max_errors=0)
+    assert not clean.truncated and clean.checked == 1
+
+    rules = {"title": lambda req: None if len(req["title"]) > 1 else f"Request {req['id']} short title"}
+    assert len(vcr.summarize(records, rules).errors) == 4
+
+
+def test_cli_fails_when_max_errors_drops_errors(tmp_path, monkeypatch, capsys):
+    db = tmp_path / "cr.json"
+    db.write_text(json.dumps([{"id": 1, "title": "", "status": "bogus"}]))
+    monkeypatch.setattr(sys, "argv", ["prog", "--db", str(db), "--max-errors", "0"])
+    with pytest.raises(SystemExit) as excinfo:
+        vcr._cli()
+    assert excinfo.value.code == 1
+    out = capsys.readouterr().out
+    assert "Stopped early" in out and "All change requests valid." not in out